@@ -0,0 +1,261 @@
+# controlador/agregados.py
+"""
+Agregados de matrículas precalculados: matrículas por curso, créditos por
+estudiante y período, y estudiantes por carrera y período.
+
+Se calculan una vez a partir de las tablas del repositorio y después se
+actualizan con cada alta, modificación o baja hecha sobre esas tablas (como
+observadores de repositorio.Tabla), así que leerlos no recorre las matrículas.
+Si el repositorio recarga alguna tabla (otro proceso cambió el archivo) los
+agregados se vuelven a calcular. Con el backend SQLite se recalculan cuando
+cambia la base de datos.
+
+reconstruir() los recalcula desde cero y verificar() compara los valores
+actuales con un recálculo completo leído directamente de los archivos.
+"""
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from modelo.entidades import Estudiante, Curso, Matricula
+from controlador import common, repositorio, almacen_sqlite
+
+
+class Agregados:
+    """Contadores que se mantienen al día registro por registro."""
+
+    def __init__(self):
+        # id_curso -> cantidad de matrículas que lo incluyen
+        self.matriculas_por_curso: Dict[str, int] = {}
+        # período -> id_estudiante -> créditos matriculados (suma de todas sus matrículas del
+        # período); está presente mientras el estudiante tenga matrículas en el período
+        self.creditos: Dict[str, Dict[str, int]] = {}
+        # id_estudiante -> créditos matriculados en todos los períodos
+        self.creditos_totales: Dict[str, int] = {}
+        # período -> carrera -> estudiantes distintos con al menos una matrícula en el período
+        self.estudiantes_por_carrera: Dict[str, Dict[str, int]] = {}
+
+        # Estado anterior de cada registro: los controladores modifican los
+        # objetos en el lugar, así que los valores viejos hay que guardarlos aquí
+        self._carreras: Dict[str, str] = {}
+        self._creditos_curso: Dict[str, int] = {}
+        self._matriculas: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {}
+        # id_curso -> matrículas que lo incluyen (para propagar cambios de créditos)
+        self._matriculas_de_curso: Dict[str, Dict[str, None]] = {}
+        # id_estudiante -> período -> cantidad de matrículas
+        self._periodos: Dict[str, Dict[str, int]] = {}
+
+    def valores(self) -> Dict[str, Dict]:
+        """Copia de los agregados públicos, por nombre, con claves planas para compararlos."""
+        return {
+            "matriculas_por_curso": dict(self.matriculas_por_curso),
+            "creditos": {(id_estudiante, periodo): creditos for periodo, del_periodo in self.creditos.items()
+                         for id_estudiante, creditos in del_periodo.items()},
+            "creditos_totales": dict(self.creditos_totales),
+            "estudiantes_por_carrera": {(periodo, carrera): cantidad
+                                        for periodo, del_periodo in self.estudiantes_por_carrera.items()
+                                        for carrera, cantidad in del_periodo.items()},
+        }
+
+    # --- Cambios ---
+
+    def cambiar_estudiante(self, id_estudiante: str, estudiante: Optional[Estudiante]):
+        carrera = estudiante.carrera if estudiante else None
+        anterior = self._carreras.get(id_estudiante)
+        if carrera == anterior:
+            return
+        for periodo in self._periodos.get(id_estudiante, {}):
+            if anterior is not None:
+                self._sumar_en(self.estudiantes_por_carrera, periodo, anterior, -1)
+            if carrera is not None:
+                self._sumar_en(self.estudiantes_por_carrera, periodo, carrera, 1)
+        if carrera is None:
+            del self._carreras[id_estudiante]
+        else:
+            self._carreras[id_estudiante] = carrera
+
+    def cambiar_curso(self, id_curso: str, curso: Optional[Curso]):
+        creditos = curso.creditos if curso else 0
+        diferencia = creditos - self._creditos_curso.get(id_curso, 0)
+        if diferencia:
+            for id_matricula in self._matriculas_de_curso.get(id_curso, {}):
+                id_estudiante, periodo, cursos = self._matriculas[id_matricula]
+                cambio = diferencia * cursos.count(id_curso)
+                self.creditos[periodo][id_estudiante] += cambio
+                self.creditos_totales[id_estudiante] += cambio
+        if curso is None:
+            self._creditos_curso.pop(id_curso, None)
+        else:
+            self._creditos_curso[id_curso] = creditos
+
+    def cambiar_matricula(self, id_matricula: str, matricula: Optional[Matricula]):
+        anterior = self._matriculas.pop(id_matricula, None)
+        if anterior is not None:
+            self._aplicar(id_matricula, *anterior, signo=-1)
+        if matricula is not None:
+            nueva = (matricula.id_estudiante, matricula.periodo_academico, tuple(matricula.id_cursos))
+            self._matriculas[id_matricula] = nueva
+            self._aplicar(id_matricula, *nueva, signo=1)
+
+    def _aplicar(self, id_matricula: str, id_estudiante: str, periodo: str, cursos: Tuple[str, ...], signo: int):
+        for id_curso in cursos:
+            self._sumar(self.matriculas_por_curso, id_curso, signo)
+            de_curso = self._matriculas_de_curso.setdefault(id_curso, {})
+            if signo > 0:
+                de_curso[id_matricula] = None
+            else:
+                de_curso.pop(id_matricula, None)
+                if not de_curso:
+                    del self._matriculas_de_curso[id_curso]
+        creditos = signo * sum(self._creditos_curso.get(id_curso, 0) for id_curso in cursos)
+        del_periodo = self.creditos.setdefault(periodo, {})
+        del_periodo[id_estudiante] = del_periodo.get(id_estudiante, 0) + creditos
+        self.creditos_totales[id_estudiante] = self.creditos_totales.get(id_estudiante, 0) + creditos
+
+        periodos = self._periodos.setdefault(id_estudiante, {})
+        antes = periodos.get(periodo, 0)
+        periodos[periodo] = antes + signo
+        if not periodos[periodo]:
+            del periodos[periodo]
+            del del_periodo[id_estudiante]
+            if not del_periodo:
+                del self.creditos[periodo]
+            if not periodos:
+                del self._periodos[id_estudiante]
+                del self.creditos_totales[id_estudiante]
+        # El estudiante entra o sale del período: cambia el conteo de su carrera
+        carrera = self._carreras.get(id_estudiante)
+        if carrera is not None and (antes == 0 or antes + signo == 0):
+            self._sumar_en(self.estudiantes_por_carrera, periodo, carrera, signo)
+
+    @staticmethod
+    def _sumar(contadores: Dict[Any, int], clave: Any, cantidad: int):
+        valor = contadores.get(clave, 0) + cantidad
+        if valor:
+            contadores[clave] = valor
+        else:
+            contadores.pop(clave, None)
+
+    @classmethod
+    def _sumar_en(cls, contadores: Dict[str, Dict[Any, int]], grupo: str, clave: Any, cantidad: int):
+        del_grupo = contadores.setdefault(grupo, {})
+        cls._sumar(del_grupo, clave, cantidad)
+        if not del_grupo:
+            del contadores[grupo]
+
+
+def calcular(estudiantes, cursos, matriculas) -> Agregados:
+    """Calcula los agregados desde cero recorriendo los registros una vez."""
+    agregados = Agregados()
+    for est in estudiantes:
+        agregados.cambiar_estudiante(est.id_estudiante, est)
+    for curso in cursos:
+        agregados.cambiar_curso(curso.id_curso, curso)
+    for m in matriculas:
+        agregados.cambiar_matricula(m.id_matricula, m)
+    return agregados
+
+
+# --- Agregados vigentes ---
+# Con el backend de archivos se identifican por las tablas de las que salieron:
+# mientras el repositorio retorne esas mismas tablas, siguen al día. Con SQLite,
+# por la versión de la base de datos.
+
+class _Vigentes:
+    def __init__(self, firma: Any, agregados: Agregados, tablas: Tuple = ()):
+        self.firma = firma
+        self.agregados = agregados
+        # Tablas en las que los agregados están registrados como observadores
+        self.tablas = tablas
+
+
+_vigentes: Optional[_Vigentes] = None
+# Para que dos hilos que leen a la vez no calculen y registren dos juegos de agregados
+_bloqueo = threading.Lock()
+
+
+def _observadores(agregados: Agregados):
+    return agregados.cambiar_estudiante, agregados.cambiar_curso, agregados.cambiar_matricula
+
+
+def _descartar():
+    global _vigentes
+    if _vigentes is not None:
+        for tabla, funcion in zip(_vigentes.tablas, _observadores(_vigentes.agregados)):
+            tabla.quitar_observador(funcion)
+    _vigentes = None
+
+
+def obtener() -> Agregados:
+    """Retorna los agregados al día, calculándolos solo si las tablas cambiaron por fuera."""
+    global _vigentes
+    if repositorio.usa_sqlite():
+        firma = (common.SQLITE_FILE, almacen_sqlite.conexion(), almacen_sqlite.version())
+        vigentes = _vigentes
+        if vigentes is not None and vigentes.firma == firma:
+            return vigentes.agregados
+        with _bloqueo:
+            if _vigentes is None or _vigentes.firma != firma:
+                _descartar()
+                _vigentes = _Vigentes(firma, calcular(repositorio.estudiantes(), repositorio.cursos(),
+                                                      repositorio.matriculas()))
+            return _vigentes.agregados
+
+    tablas = (repositorio.estudiantes(), repositorio.cursos(), repositorio.matriculas())
+    vigentes = _vigentes
+    if vigentes is not None and _al_dia(vigentes, tablas):
+        return vigentes.agregados
+    with _bloqueo:
+        if _vigentes is None or not _al_dia(_vigentes, tablas):
+            _descartar()
+            agregados = calcular(*tablas)
+            for tabla, funcion in zip(tablas, _observadores(agregados)):
+                tabla.agregar_observador(funcion)
+            _vigentes = _Vigentes(None, agregados, tablas)
+        return _vigentes.agregados
+
+
+def _al_dia(vigentes: _Vigentes, tablas: Tuple) -> bool:
+    return len(vigentes.tablas) == 3 and all(a is b for a, b in zip(vigentes.tablas, tablas))
+
+
+def reconstruir() -> Agregados:
+    """Descarta los agregados actuales y los vuelve a calcular."""
+    _descartar()
+    return obtener()
+
+
+def verificar() -> List[str]:
+    """
+    Compara los agregados actuales con un recálculo completo leído en flujo desde
+    el almacenamiento. Retorna las diferencias encontradas (vacío si coinciden).
+    """
+    actuales = obtener().valores()
+    recalculados = calcular(repositorio.iterar_estudiantes(), repositorio.iterar_cursos(),
+                            repositorio.iterar_matriculas()).valores()
+    diferencias = []
+    for nombre, esperado in recalculados.items():
+        obtenido = actuales[nombre]
+        for clave in sorted(set(esperado) | set(obtenido), key=str):
+            if esperado.get(clave, 0) != obtenido.get(clave, 0):
+                diferencias.append(f"{nombre}{list(clave) if isinstance(clave, tuple) else [clave]}: "
+                                   f"{obtenido.get(clave, 0)} en lugar de {esperado.get(clave, 0)}")
+    return diferencias
+
+
+# --- Consultas ---
+
+def matriculas_por_curso() -> Dict[str, int]:
+    """Cantidad de matrículas que incluyen cada curso."""
+    return dict(obtener().matriculas_por_curso)
+
+
+def creditos_por_estudiante(periodo: Optional[str] = None) -> Dict[str, int]:
+    """Créditos por estudiante en un período, o en todos. Solo incluye estudiantes con matrículas."""
+    agregados = obtener()
+    if periodo is None:
+        return dict(agregados.creditos_totales)
+    return dict(agregados.creditos.get(periodo, {}))
+
+
+def estudiantes_por_carrera(periodo: str) -> Dict[str, int]:
+    """Estudiantes distintos matriculados en el período, por carrera."""
+    return dict(obtener().estudiantes_por_carrera.get(periodo, {}))
@@ -0,0 +1,241 @@
+# controlador/almacen_binario.py
+"""
+Instantáneas binarias de los archivos de datos, para cargas en frío rápidas.
+
+Se activan con common.USAR_BINARIO (o la variable de entorno MATRICULAS_BINARIO=1).
+Junto a cada archivo (estudiantes.csv, cursos.csv, matriculas.json) se guarda
+'<archivo>.bin' con los mismos registros en un formato que se lee con mmap,
+sin parsearlo:
+
+  cabecera   MAGIA, versión, tipo de entidad, cantidad de registros, posición
+             de cada sección y la firma (mtime_ns, tamaño, inodo) del archivo
+             del que salió
+  registros  de ancho fijo: un int64 por campo. Un entero va tal cual; un
+             texto, como posición | largo << 32 en la tabla de textos; una
+             lista de textos, como un texto con los elementos separados por
+             SEPARADOR
+  índice     los números de registro ordenados por el ID (bytes UTF-8)
+  textos     los textos en UTF-8, cada texto distinto una sola vez
+
+Los registros se convierten en entidades recién al accederlos, y buscar uno
+por ID es una búsqueda binaria sobre el índice. El archivo CSV/JSON sigue
+siendo la fuente de verdad: la instantánea solo se usa si su firma coincide
+con la del archivo y no hay diario pendiente.
+"""
+import mmap
+import os
+import struct
+import tempfile
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from modelo.entidades import Estudiante, Curso, Matricula
+
+MAGIA = b"MATB"
+VERSION = 1
+SEPARADOR = "\x1f"
+# Registros que se materializan juntos al recorrer la instantánea
+TAMANO_BLOQUE = 4096
+
+# Campos de cada entidad, en orden: 't' texto, 'e' entero, 'l' lista de textos
+CAMPOS: Dict[type, Tuple[Tuple[str, str], ...]] = {
+    Estudiante: (('id_estudiante', 't'), ('nombre', 't'), ('carrera', 't')),
+    Curso: (('id_curso', 't'), ('nombre_curso', 't'), ('creditos', 'e')),
+    Matricula: (('id_matricula', 't'), ('id_estudiante', 't'), ('periodo_academico', 't'), ('id_cursos', 'l')),
+}
+_TIPOS = {Estudiante: 1, Curso: 2, Matricula: 3}
+
+# magia, versión, tipo, cantidad, posición de registros, índice y textos, firma del origen
+_CABECERA = struct.Struct('<4sHHIQQQqqq')
+_CAMPO = struct.Struct('<q')
+_INDICE = struct.Struct('<I')
+
+
+def ruta_binaria(archivo: str) -> str:
+    return archivo + ".bin"
+
+
+def _firma_archivo(archivo: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(archivo)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+# --- Escritura ---
+
+def guardar(archivo: str, registros: Iterable[Any], modelo: type) -> bool:
+    """
+    Escribe la instantánea binaria de `archivo` con sus registros, que deben
+    ser los que tiene el archivo ahora (quien llama tiene su bloqueo). Se
+    escribe aparte y se renombra. Retorna True si se pudo escribir.
+    """
+    firma = _firma_archivo(archivo)
+    if firma is None:
+        return False
+    registros = list(registros)
+    campos = CAMPOS[modelo]
+    # Se arma por columnas: cada texto distinto se codifica una sola vez
+    referencias: Dict[str, int] = {}
+    partes: List[bytes] = []
+    tamano_textos = 0
+    columnas = []
+    for nombre, tipo in campos:
+        columna = [getattr(registro, nombre) for registro in registros]
+        if tipo == 'e':
+            columnas.append(columna)
+            continue
+        if tipo == 'l':
+            columna = [SEPARADOR.join(valor) for valor in columna]
+        for texto in dict.fromkeys(columna):
+            if texto not in referencias:
+                datos = texto.encode('utf-8')
+                referencias[texto] = tamano_textos | len(datos) << 32
+                partes.append(datos)
+                tamano_textos += len(datos)
+        columnas.append([referencias[texto] for texto in columna])
+    if tamano_textos >= 1 << 32:
+        print(f"Error al escribir en {ruta_binaria(archivo)}: los textos superan los 4 GB.")
+        return False
+    ids = [getattr(registro, campos[0][0]) for registro in registros]
+    # El orden de los str coincide con el de sus bytes UTF-8, que es como se busca
+    orden = sorted(range(len(registros)), key=ids.__getitem__)
+    filas = struct.pack(f'<{len(registros) * len(campos)}q', *chain.from_iterable(zip(*columnas)))
+    indice = struct.pack(f'<{len(orden)}I', *orden)
+
+    pos_registros = _CABECERA.size
+    pos_indice = pos_registros + len(filas)
+    pos_textos = pos_indice + len(indice)
+    cabecera = _CABECERA.pack(MAGIA, VERSION, _TIPOS[modelo], len(registros), pos_registros, pos_indice,
+                              pos_textos, *firma)
+    directorio = os.path.dirname(os.path.abspath(archivo))
+    try:
+        descriptor, temporal = tempfile.mkstemp(prefix=os.path.basename(archivo) + ".", suffix=".tmp",
+                                                dir=directorio)
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                f.write(cabecera)
+                f.write(filas)
+                f.write(indice)
+                f.writelines(partes)
+            os.replace(temporal, ruta_binaria(archivo))
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+    except OSError as e:
+        print(f"Error al escribir en {ruta_binaria(archivo)}: {e}")
+        return False
+    return True
+
+
+# --- Lectura ---
+
+class InstantaneaBinaria:
+    """Registros de una instantánea binaria, leídos con mmap a medida que se piden."""
+
+    def __init__(self, ruta: str, modelo: type):
+        self.modelo = modelo
+        self._campos = CAMPOS[modelo]
+        self._ancho = len(self._campos) * _CAMPO.size
+        with open(ruta, 'rb') as f:
+            self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magia, version, tipo, self._cantidad, self._pos_registros, self._pos_indice, self._pos_textos,
+             *firma) = _CABECERA.unpack_from(self._mapa, 0)
+        except struct.error as e:
+            self.cerrar()
+            raise ValueError(f"Instantánea binaria {ruta} incompleta.") from e
+        if magia != MAGIA or version != VERSION or tipo != _TIPOS[modelo]:
+            self.cerrar()
+            raise ValueError(f"{ruta} no es una instantánea binaria de {modelo.__name__}.")
+        self.firma = tuple(firma)
+
+    def cerrar(self):
+        self._mapa.close()
+
+    def __enter__(self) -> "InstantaneaBinaria":
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def __len__(self) -> int:
+        return self._cantidad
+
+    def _texto(self, referencia: int) -> str:
+        inicio = self._pos_textos + (referencia & 0xFFFFFFFF)
+        return self._mapa[inicio:inicio + (referencia >> 32)].decode('utf-8')
+
+    def _bloque(self, inicio: int, fin: int, textos: Dict[int, str]) -> List[Any]:
+        """
+        Materializa los registros [inicio, fin) por columnas. `textos` guarda los
+        ya decodificados, para no repetir los que se comparten (carreras, períodos).
+        """
+        ancho = len(self._campos)
+        valores = struct.unpack_from(f'<{(fin - inicio) * ancho}q', self._mapa,
+                                     self._pos_registros + inicio * self._ancho)
+        columnas = []
+        for j, (_, tipo) in enumerate(self._campos):
+            columna = valores[j::ancho]
+            if tipo != 'e':
+                for referencia in set(columna).difference(textos):
+                    textos[referencia] = self._texto(referencia)
+                columna = [textos[referencia] for referencia in columna]
+                if tipo == 'l':
+                    # Una lista nueva por registro: no se comparten entre matrículas
+                    columna = [texto.split(SEPARADOR) if texto else [] for texto in columna]
+            columnas.append(columna)
+        return list(map(self.modelo, *columnas))
+
+    def registro(self, numero: int) -> Any:
+        """El registro número `numero` (en el orden del archivo de origen)."""
+        if not 0 <= numero < self._cantidad:
+            raise IndexError(numero)
+        return self._bloque(numero, numero + 1, {})[0]
+
+    def __iter__(self) -> Iterator[Any]:
+        textos: Dict[int, str] = {}
+        for inicio in range(0, self._cantidad, TAMANO_BLOQUE):
+            yield from self._bloque(inicio, min(inicio + TAMANO_BLOQUE, self._cantidad), textos)
+
+    def _id(self, numero: int) -> bytes:
+        referencia, = _CAMPO.unpack_from(self._mapa, self._pos_registros + numero * self._ancho)
+        inicio = self._pos_textos + (referencia & 0xFFFFFFFF)
+        return self._mapa[inicio:inicio + (referencia >> 32)]
+
+    def obtener(self, id_registro: str) -> Optional[Any]:
+        """Busca un registro por ID con una búsqueda binaria sobre el índice, sin leer los demás."""
+        buscado = id_registro.encode('utf-8')
+        bajo, alto = 0, self._cantidad
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            numero, = _INDICE.unpack_from(self._mapa, self._pos_indice + medio * _INDICE.size)
+            if self._id(numero) < buscado:
+                bajo = medio + 1
+            else:
+                alto = medio
+        if bajo < self._cantidad:
+            numero, = _INDICE.unpack_from(self._mapa, self._pos_indice + bajo * _INDICE.size)
+            if self._id(numero) == buscado:
+                return self.registro(numero)
+        return None
+
+
+def abrir(archivo: str, modelo: type) -> Optional[InstantaneaBinaria]:
+    """
+    La instantánea binaria de `archivo` si existe y corresponde a su contenido
+    actual; si no, None. Quien la recibe debe cerrarla (sirve como context manager).
+    """
+    from controlador import common
+    firma = _firma_archivo(archivo)
+    if firma is None or os.path.exists(common.ruta_diario(archivo)):
+        return None
+    try:
+        instantanea = InstantaneaBinaria(ruta_binaria(archivo), modelo)
+    except (OSError, ValueError):
+        return None
+    if instantanea.firma != firma:
+        instantanea.cerrar()
+        return None
+    return instantanea
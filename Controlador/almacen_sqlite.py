@@ -0,0 +1,340 @@
+# controlador/almacen_sqlite.py
+"""
+Almacenamiento opcional en SQLite.
+
+Se activa con common.BACKEND = "sqlite" (o la variable de entorno
+MATRICULAS_BACKEND=sqlite). Expone las mismas operaciones que las funciones de
+carga y guardado de common.py y, a través de TablaSQLite, la misma interfaz que
+repositorio.Tabla, así que los controladores no cambian: las búsquedas por clave
+y por índice inverso (tabla.buscar) se resuelven con consultas indexadas en lugar
+de cargar todos los registros.
+"""
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from modelo.entidades import Estudiante, Curso, Matricula
+from controlador import common, busqueda
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS estudiantes (
+    id_estudiante TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    carrera TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cursos (
+    id_curso TEXT PRIMARY KEY,
+    nombre_curso TEXT NOT NULL,
+    creditos INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS matriculas (
+    id_matricula TEXT PRIMARY KEY,
+    id_estudiante TEXT NOT NULL,
+    periodo_academico TEXT NOT NULL
+);
+-- Tabla puente para Matricula.id_cursos; 'posicion' conserva el orden de la lista
+CREATE TABLE IF NOT EXISTS matricula_cursos (
+    id_matricula TEXT NOT NULL REFERENCES matriculas(id_matricula) ON DELETE CASCADE,
+    posicion INTEGER NOT NULL,
+    id_curso TEXT NOT NULL,
+    PRIMARY KEY (id_matricula, posicion)
+);
+CREATE INDEX IF NOT EXISTS idx_matriculas_estudiante ON matriculas(id_estudiante, periodo_academico);
+CREATE INDEX IF NOT EXISTS idx_matriculas_periodo ON matriculas(periodo_academico);
+CREATE INDEX IF NOT EXISTS idx_matricula_cursos_curso ON matricula_cursos(id_curso);
+"""
+
+# Límite de parámetros de una consulta IN antes de recorrer la tabla puente completa
+_MAX_PARAMETROS_IN = 500
+
+# Las conexiones de sqlite3 no se comparten entre hilos: una por hilo y por archivo
+_local = threading.local()
+
+
+def conexion() -> sqlite3.Connection:
+    """Retorna la conexión del hilo actual a common.SQLITE_FILE, creando el esquema si hace falta."""
+    conexiones: Dict[str, sqlite3.Connection] = _local.__dict__.setdefault("conexiones", {})
+    archivo = common.SQLITE_FILE
+    con = conexiones.get(archivo)
+    if con is None:
+        con = sqlite3.connect(archivo)
+        con.execute("PRAGMA foreign_keys = ON")
+        con.executescript(ESQUEMA)
+        conexiones[archivo] = con
+    return con
+
+
+def cerrar():
+    """Cierra las conexiones abiertas por el hilo actual."""
+    for con in _local.__dict__.pop("conexiones", {}).values():
+        con.close()
+    _local.__dict__.pop("indices_texto", None)
+
+
+def version():
+    """Cambia cada vez que la base de datos se modifica, desde esta conexión o desde otra."""
+    con = conexion()
+    return con.execute("PRAGMA data_version").fetchone()[0], con.total_changes
+
+
+# --- Conversión entre filas y modelos ---
+
+def _estudiante(fila) -> Estudiante:
+    return Estudiante(id_estudiante=fila[0], nombre=fila[1], carrera=fila[2])
+
+
+def _curso(fila) -> Curso:
+    return Curso(id_curso=fila[0], nombre_curso=fila[1], creditos=fila[2])
+
+
+def _matriculas(con: sqlite3.Connection, filas: List[Any]) -> List[Matricula]:
+    """Arma las matrículas a partir de sus filas, consultando sus cursos en una sola consulta."""
+    if not filas:
+        return []
+    cursos: Dict[str, List[str]] = {f[0]: [] for f in filas}
+    if len(cursos) <= _MAX_PARAMETROS_IN:
+        marcas = ', '.join('?' * len(cursos))
+        consulta = (f"SELECT id_matricula, id_curso FROM matricula_cursos "
+                    f"WHERE id_matricula IN ({marcas}) ORDER BY id_matricula, posicion")
+        parametros = list(cursos)
+    else:
+        # Para muchas matrículas, recorrer la tabla puente completa es más barato
+        # que una consulta IN con miles de parámetros
+        consulta = "SELECT id_matricula, id_curso FROM matricula_cursos ORDER BY id_matricula, posicion"
+        parametros = []
+    for id_matricula, id_curso in con.execute(consulta, parametros):
+        lista = cursos.get(id_matricula)
+        if lista is not None:
+            lista.append(id_curso)
+    return [Matricula(id_matricula=f[0], id_estudiante=f[1], periodo_academico=f[2], id_cursos=cursos[f[0]])
+            for f in filas]
+
+
+# --- Tabla respaldada por SQLite ---
+
+class TablaSQLite:
+    """
+    Misma interfaz que repositorio.Tabla, pero cada operación consulta o modifica
+    la base de datos directamente: los cambios quedan guardados al retornar.
+    """
+
+    def __init__(self, modelo: type):
+        self.modelo = modelo
+        self.campos_texto: Sequence[str] = ()
+        if modelo is Estudiante:
+            self.clave, self._tabla, self._columnas = 'id_estudiante', 'estudiantes', common.ENCABEZADOS_ESTUDIANTES
+            self.campos_texto = ('nombre', 'carrera')
+        elif modelo is Curso:
+            self.clave, self._tabla, self._columnas = 'id_curso', 'cursos', common.ENCABEZADOS_CURSOS
+            self.campos_texto = ('nombre_curso',)
+        else:
+            self.clave, self._tabla, self._columnas = 'id_matricula', 'matriculas', \
+                ['id_matricula', 'id_estudiante', 'periodo_academico']
+
+    def _seleccionar(self, condicion: str = "", parametros=(), orden: str = "ORDER BY rowid") -> List[Any]:
+        con = conexion()
+        filas = con.execute(
+            f"SELECT {', '.join(self._columnas)} FROM {self._tabla} {condicion} {orden}", parametros
+        ).fetchall()
+        if self.modelo is Estudiante:
+            return [_estudiante(f) for f in filas]
+        if self.modelo is Curso:
+            return [_curso(f) for f in filas]
+        return _matriculas(con, filas)
+
+    def __len__(self) -> int:
+        return conexion().execute(f"SELECT COUNT(*) FROM {self._tabla}").fetchone()[0]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.lista())
+
+    def __contains__(self, id_registro: str) -> bool:
+        fila = conexion().execute(f"SELECT 1 FROM {self._tabla} WHERE {self.clave} = ?", (id_registro,)).fetchone()
+        return fila is not None
+
+    def obtener(self, id_registro: str) -> Optional[Any]:
+        registros = self._seleccionar(f"WHERE {self.clave} = ?", (id_registro,))
+        return registros[0] if registros else None
+
+    def lista(self) -> List[Any]:
+        return self._seleccionar()
+
+    def pagina(self, inicio: int, cantidad: int, orden: Optional[str] = None,
+               descendente: bool = False) -> List[Any]:
+        """Equivalente a Tabla.pagina: la base de datos ordena y solo retorna las filas de la página."""
+        if orden is not None and orden not in self._columnas:
+            raise KeyError(orden)
+        sentido = "DESC" if descendente else "ASC"
+        criterio = f"{orden} COLLATE NOCASE {sentido}, rowid" if orden else f"rowid {sentido}"
+        return self._seleccionar("", (cantidad, inicio), f"ORDER BY {criterio} LIMIT ? OFFSET ?")
+
+    def buscar(self, indice: str, valor: str, periodo: Optional[str] = None) -> List[Any]:
+        """
+        Equivalente a Tabla.buscar, resuelto con los índices de la base de datos.
+        Con `periodo`, la consulta misma filtra las matrículas de ese período.
+        """
+        if self.modelo is not Matricula:
+            raise KeyError(indice)
+        if indice == 'id_curso':
+            condicion = "WHERE id_matricula IN (SELECT id_matricula FROM matricula_cursos WHERE id_curso = ?)"
+        elif indice in ('id_estudiante', 'periodo_academico'):
+            condicion = f"WHERE {indice} = ?"
+        else:
+            raise KeyError(indice)
+        if periodo is None:
+            return self._seleccionar(condicion, (valor,))
+        return self._seleccionar(condicion + " AND periodo_academico = ?", (valor, periodo))
+
+    def buscar_texto(self, consulta: str, campo: Optional[str] = None,
+                     solo_prefijo: bool = False) -> List[Any]:
+        """
+        Equivalente a Tabla.buscar_texto. El índice se construye en memoria con una
+        sola consulta y se reutiliza mientras la base de datos no cambie (ni por
+        esta conexión ni por otra).
+        """
+        campos = self.campos_texto if campo is None else (campo,)
+        if not campos or not set(campos) <= set(self.campos_texto):
+            raise KeyError(campo)
+        candidatos = self._indice_texto().candidatos(consulta, solo_prefijo)
+        if not candidatos:
+            return []
+        candidatos = list(candidatos)
+        registros = []
+        for i in range(0, len(candidatos), _MAX_PARAMETROS_IN):
+            bloque = candidatos[i:i + _MAX_PARAMETROS_IN]
+            registros += self._seleccionar(f"WHERE {self.clave} IN ({', '.join('?' * len(bloque))})", bloque)
+        return busqueda.filtrar(registros, campos, consulta, solo_prefijo, self.clave, campo is None)
+
+    def _indice_texto(self) -> busqueda.IndiceTexto:
+        con = conexion()
+        firma = version()
+        indices = _local.__dict__.setdefault("indices_texto", {})
+        entrada = indices.get((common.SQLITE_FILE, self._tabla))
+        if entrada is None or entrada[0] != firma:
+            indice = busqueda.IndiceTexto()
+            columnas = ', '.join((self.clave, *self.campos_texto))
+            for id_registro, *textos in con.execute(f"SELECT {columnas} FROM {self._tabla}"):
+                indice.agregar(id_registro, textos)
+            entrada = indices[(common.SQLITE_FILE, self._tabla)] = (firma, indice)
+        return entrada[1]
+
+    def agregar(self, registro: Any):
+        try:
+            with conexion() as con:
+                _insertar(con, registro)
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"El {self.clave} '{getattr(registro, self.clave)}' ya existe.") from e
+
+    def agregar_varios(self, registros: List[Any]):
+        """Agrega varios registros en una sola transacción; si alguno ya existe no agrega ninguno."""
+        try:
+            with conexion() as con:
+                for registro in registros:
+                    _insertar(con, registro)
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"Algún {self.clave} de los registros a agregar ya existe.") from e
+
+    def actualizar(self, registro: Any):
+        id_registro = getattr(registro, self.clave)
+        with conexion() as con:
+            asignaciones = ', '.join(f"{c} = ?" for c in self._columnas[1:])
+            valores = [getattr(registro, c) for c in self._columnas[1:]]
+            cursor = con.execute(f"UPDATE {self._tabla} SET {asignaciones} WHERE {self.clave} = ?",
+                                 (*valores, id_registro))
+            if cursor.rowcount == 0:
+                # Como Tabla.actualizar: no se actualiza un registro que no existe
+                raise KeyError(id_registro)
+            if self.modelo is Matricula:
+                con.execute("DELETE FROM matricula_cursos WHERE id_matricula = ?", (id_registro,))
+                _insertar_cursos_de_matricula(con, registro)
+
+    def quitar(self, id_registro: str) -> Any:
+        registro = self.obtener(id_registro)
+        if registro is None:
+            raise KeyError(id_registro)
+        with conexion() as con:
+            con.execute(f"DELETE FROM {self._tabla} WHERE {self.clave} = ?", (id_registro,))
+        return registro
+
+
+def _insertar(con: sqlite3.Connection, registro: Any):
+    if isinstance(registro, Estudiante):
+        con.execute("INSERT INTO estudiantes VALUES (?, ?, ?)",
+                    (registro.id_estudiante, registro.nombre, registro.carrera))
+    elif isinstance(registro, Curso):
+        con.execute("INSERT INTO cursos VALUES (?, ?, ?)",
+                    (registro.id_curso, registro.nombre_curso, registro.creditos))
+    else:
+        con.execute("INSERT INTO matriculas VALUES (?, ?, ?)",
+                    (registro.id_matricula, registro.id_estudiante, registro.periodo_academico))
+        _insertar_cursos_de_matricula(con, registro)
+
+
+def _insertar_cursos_de_matricula(con: sqlite3.Connection, matricula: Matricula):
+    con.executemany("INSERT INTO matricula_cursos VALUES (?, ?, ?)",
+                    [(matricula.id_matricula, i, id_c) for i, id_c in enumerate(matricula.id_cursos)])
+
+
+# --- Carga y guardado completos ---
+# Equivalentes a cargar_datos_* / guardar_datos_* de common.py.
+
+def cargar_datos_sqlite(modelo: type) -> List[Any]:
+    """Carga todos los registros de un modelo."""
+    return TablaSQLite(modelo).lista()
+
+
+def iterar_datos_sqlite(modelo: type) -> Iterator[Any]:
+    """Recorre los registros de un modelo con un cursor, sin cargarlos todos en memoria."""
+    # Conexión propia: mientras el generador está abierto la del hilo puede seguir usándose
+    con = sqlite3.connect(common.SQLITE_FILE)
+    try:
+        if modelo is Estudiante:
+            for fila in con.execute("SELECT id_estudiante, nombre, carrera FROM estudiantes ORDER BY rowid"):
+                yield _estudiante(fila)
+        elif modelo is Curso:
+            for fila in con.execute("SELECT id_curso, nombre_curso, creditos FROM cursos ORDER BY rowid"):
+                yield _curso(fila)
+        else:
+            # Una fila por curso de cada matrícula; se agrupan las filas consecutivas
+            actual = None
+            cursos: List[str] = []
+            for id_m, id_est, periodo, id_curso in con.execute(
+                    "SELECT m.id_matricula, m.id_estudiante, m.periodo_academico, mc.id_curso "
+                    "FROM matriculas m LEFT JOIN matricula_cursos mc USING (id_matricula) "
+                    "ORDER BY m.rowid, mc.posicion"):
+                if actual is None or actual[0] != id_m:
+                    if actual is not None:
+                        yield Matricula(*actual, id_cursos=cursos)
+                    actual, cursos = (id_m, id_est, periodo), []
+                if id_curso is not None:
+                    cursos.append(id_curso)
+            if actual is not None:
+                yield Matricula(*actual, id_cursos=cursos)
+    finally:
+        con.close()
+
+
+def guardar_datos_sqlite(modelo: type, datos: List[Any]) -> bool:
+    """Reemplaza todos los registros de un modelo en una sola transacción. Retorna True si se pudo escribir."""
+    tabla = TablaSQLite(modelo)._tabla
+    try:
+        with conexion() as con:
+            con.execute(f"DELETE FROM {tabla}")
+            for registro in datos:
+                _insertar(con, registro)
+    except sqlite3.Error as e:
+        print(f"Error al escribir en {common.SQLITE_FILE}: {e}")
+        return False
+    return True
+
+
+def migrar_desde_archivos() -> Dict[str, int]:
+    """Importa los archivos CSV/JSON actuales a la base de datos. Retorna cuántos registros se importaron."""
+    resultado = {}
+    for nombre, modelo, datos in (
+            ("estudiantes", Estudiante, common.cargar_datos_csv(common.ESTUDIANTES_FILE, Estudiante)),
+            ("cursos", Curso, common.cargar_datos_csv(common.CURSOS_FILE, Curso)),
+            ("matriculas", Matricula, common.cargar_datos_json(common.MATRICULAS_FILE))):
+        if not guardar_datos_sqlite(modelo, datos):
+            raise ValueError(f"No se pudieron importar los {nombre}.")
+        resultado[nombre] = len(datos)
+    return resultado
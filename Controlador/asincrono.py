@@ -0,0 +1,140 @@
+# controlador/asincrono.py
+"""
+Versiones async de las funciones de estudiantes_ctrl, cursos_ctrl y matriculas_ctrl.
+
+Cada función ejecuta la del controlador con asyncio.to_thread, así que la
+lectura y escritura de archivos de common no bloquea el ciclo de eventos. Los
+argumentos y el resultado son los mismos que en el controlador.
+
+Varias corrutinas que leen a la vez el mismo archivo no lo parsean varias
+veces: el repositorio carga cada archivo en un solo hilo y los demás reutilizan
+esa carga. Las lecturas corren en paralelo; las escrituras se ejecutan de a una
+(bloqueo.LectoresEscritor), porque las tablas en memoria no admiten cambios
+concurrentes.
+"""
+import asyncio
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+from modelo.entidades import Estudiante, Curso, Matricula
+from controlador import estudiantes_ctrl, cursos_ctrl, matriculas_ctrl, repositorio
+from controlador.bloqueo import LectoresEscritor
+
+_bloqueo = LectoresEscritor()
+
+
+def _leyendo(funcion: Callable, *args) -> Any:
+    with _bloqueo.leyendo():
+        return funcion(*args)
+
+
+def _escribiendo(funcion: Callable, *args) -> Any:
+    with _bloqueo.escribiendo():
+        return funcion(*args)
+
+
+async def _leer(funcion: Callable, *args) -> Any:
+    return await asyncio.to_thread(_leyendo, funcion, *args)
+
+
+async def _escribir(funcion: Callable, *args) -> Any:
+    return await asyncio.to_thread(_escribiendo, funcion, *args)
+
+
+async def precargar():
+    """Carga estudiantes, cursos y matrículas en paralelo, antes de atender solicitudes."""
+    await asyncio.gather(_leer(repositorio.estudiantes), _leer(repositorio.cursos), _leer(repositorio.matriculas))
+
+
+# --- Estudiantes ---
+
+async def obtener_estudiantes() -> List[Estudiante]:
+    return await _leer(estudiantes_ctrl.obtener_estudiantes)
+
+
+async def obtener_pagina_estudiantes(numero: int = 1, tamano: int = 20, orden: Optional[str] = None,
+                                     descendente: bool = False) -> repositorio.Pagina:
+    return await _leer(estudiantes_ctrl.obtener_pagina_estudiantes, numero, tamano, orden, descendente)
+
+
+async def buscar_estudiantes(texto: str, campo: Optional[str] = None, solo_prefijo: bool = False) -> List[Estudiante]:
+    return await _leer(estudiantes_ctrl.buscar_estudiantes, texto, campo, solo_prefijo)
+
+
+async def obtener_estudiante_por_id(id_estudiante: str) -> Optional[Estudiante]:
+    return await _leer(estudiantes_ctrl.obtener_estudiante_por_id, id_estudiante)
+
+
+async def crear_estudiante(id_estudiante: str, nombre: str, carrera: str) -> Estudiante:
+    return await _escribir(estudiantes_ctrl.crear_estudiante, id_estudiante, nombre, carrera)
+
+
+async def actualizar_estudiante(id_original: str, nombre: str, carrera: str) -> Optional[Estudiante]:
+    return await _escribir(estudiantes_ctrl.actualizar_estudiante, id_original, nombre, carrera)
+
+
+async def eliminar_estudiante(id_estudiante: str) -> bool:
+    return await _escribir(estudiantes_ctrl.eliminar_estudiante, id_estudiante)
+
+
+# --- Cursos ---
+
+async def obtener_cursos() -> List[Curso]:
+    return await _leer(cursos_ctrl.obtener_cursos)
+
+
+async def obtener_pagina_cursos(numero: int = 1, tamano: int = 20, orden: Optional[str] = None,
+                                descendente: bool = False) -> repositorio.Pagina:
+    return await _leer(cursos_ctrl.obtener_pagina_cursos, numero, tamano, orden, descendente)
+
+
+async def buscar_cursos(texto: str, solo_prefijo: bool = False) -> List[Curso]:
+    return await _leer(cursos_ctrl.buscar_cursos, texto, solo_prefijo)
+
+
+async def obtener_curso_por_id(id_curso: str) -> Optional[Curso]:
+    return await _leer(cursos_ctrl.obtener_curso_por_id, id_curso)
+
+
+async def crear_curso(id_curso: str, nombre_curso: str, creditos: int) -> Curso:
+    return await _escribir(cursos_ctrl.crear_curso, id_curso, nombre_curso, creditos)
+
+
+async def actualizar_curso(id_original: str, nombre_curso: str, creditos: int) -> Optional[Curso]:
+    return await _escribir(cursos_ctrl.actualizar_curso, id_original, nombre_curso, creditos)
+
+
+async def eliminar_curso(id_curso: str) -> bool:
+    return await _escribir(cursos_ctrl.eliminar_curso, id_curso)
+
+
+# --- Matrículas ---
+
+async def matricular_estudiante(id_estudiante: str, id_cursos: List[str], periodo: str) -> Matricula:
+    return await _escribir(matriculas_ctrl.matricular_estudiante, id_estudiante, id_cursos, periodo)
+
+
+async def matricular_estudiantes_lote(solicitudes: Iterable[Tuple[str, List[str], str]],
+                                      guardar: bool = True) -> List[dict]:
+    # Se materializan aquí: un generador no debe consumirse desde otro hilo
+    solicitudes = list(solicitudes)
+    if guardar:
+        return await _escribir(matriculas_ctrl.matricular_estudiantes_lote, solicitudes, True)
+    return await _leer(matriculas_ctrl.matricular_estudiantes_lote, solicitudes, False)
+
+
+async def obtener_matriculas_por_estudiante(id_estudiante: str, periodo: Optional[str] = None) -> List[Matricula]:
+    return await _leer(matriculas_ctrl.obtener_matriculas_por_estudiante, id_estudiante, periodo)
+
+
+async def obtener_estudiantes_por_curso(id_curso: str, periodo: Optional[str] = None) -> List[Estudiante]:
+    return await _leer(matriculas_ctrl.obtener_estudiantes_por_curso, id_curso, periodo)
+
+
+async def obtener_pagina_estudiantes_por_curso(id_curso: str, numero: int = 1, tamano: int = 20,
+                                               orden: Optional[str] = None, descendente: bool = False,
+                                               periodo: Optional[str] = None) -> repositorio.Pagina:
+    return await _leer(matriculas_ctrl.obtener_pagina_estudiantes_por_curso, id_curso, numero, tamano, orden,
+                       descendente, periodo)
+
+
+async def calcular_creditos_estudiante(id_estudiante: str, periodo: str) -> int:
+    return await _leer(matriculas_ctrl.calcular_creditos_estudiante, id_estudiante, periodo)
@@ -0,0 +1,183 @@
+# controlador/bloqueo.py
+"""
+Bloqueos de archivo entre procesos (fcntl en Linux/macOS, msvcrt en Windows) y
+un bloqueo de lectores y escritor entre hilos del mismo proceso.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# Segundos que se espera un bloqueo en Windows antes de desistir con TimeoutError
+ESPERA_MAXIMA = 60.0
+
+
+def ruta_bloqueo(ruta: str) -> str:
+    """Archivo auxiliar sobre el que se toma el bloqueo de `ruta`."""
+    return ruta + ".lock"
+
+
+# Bloqueos de archivo que tiene tomados cada hilo: ruta del bloqueo -> _Retenido.
+# Permiten anidar bloquear() sobre la misma ruta en un mismo hilo (por ejemplo,
+# guardar un archivo mientras se recorre o compactar un diario) sin bloquearse a
+# sí mismo: entre distintos hilos y procesos los bloqueos se siguen excluyendo
+# porque cada uno abre su propio descriptor.
+_local = threading.local()
+
+
+class ConflictoConcurrente(ValueError):
+    """Otro proceso cambió el archivo entre que se leyó y que se lo iba a escribir."""
+
+
+def _firma(ruta: str):
+    """Estado en disco de `ruta` y de su diario ('<ruta>.log'), que se escribe con el mismo bloqueo."""
+    firmas = []
+    for archivo in (ruta, ruta + ".log"):
+        try:
+            st = os.stat(archivo)
+        except OSError:
+            firmas.append(None)
+            continue
+        firmas.append((st.st_mtime_ns, st.st_size, st.st_ino))
+    return tuple(firmas)
+
+
+class _Retenido:
+    def __init__(self, archivo, compartido: bool):
+        self.archivo = archivo
+        self.compartido = compartido
+
+
+def _tomar(f, compartido: bool):
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_SH if compartido else fcntl.LOCK_EX)
+        return
+    # msvcrt no tiene bloqueos compartidos: en Windows todos son exclusivos
+    f.seek(0)
+    limite = time.monotonic() + ESPERA_MAXIMA
+    pausa = 0.01
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return
+        except OSError as e:
+            if time.monotonic() >= limite:
+                raise TimeoutError(f"No se pudo tomar el bloqueo {f.name} en {ESPERA_MAXIMA:g} segundos.") from e
+            time.sleep(pausa)
+            pausa = min(pausa * 2, 0.5)
+
+
+def _soltar(f):
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def bloquear(ruta: str, compartido: bool = False):
+    """
+    Toma un bloqueo sobre `ruta` mientras dura el bloque `with`: exclusivo para
+    escribir o, con compartido=True, compartido para leer (varios lectores a la
+    vez, pero ninguno mientras alguien escribe).
+
+    Si el mismo hilo ya tiene el bloqueo, no se vuelve a tomar; si lo tiene
+    compartido y pide uno exclusivo, se convierte mientras dura el bloque. flock
+    no hace esa conversión en forma atómica: si otro proceso escribió el
+    archivo en el medio, lo leído con el bloqueo compartido ya no vale y se
+    lanza ConflictoConcurrente.
+    Un lector que no puede crear el archivo de bloqueo (la carpeta no existe o
+    no tiene permisos) lee sin bloqueo.
+    """
+    clave = os.path.abspath(ruta_bloqueo(ruta))
+    retenidos = getattr(_local, "retenidos", None)
+    if retenidos is None:
+        retenidos = _local.retenidos = {}
+    retenido = retenidos.get(clave)
+    if retenido is not None:
+        if compartido or not retenido.compartido or not fcntl:
+            yield
+            return
+        previa = _firma(ruta)
+        fcntl.flock(retenido.archivo.fileno(), fcntl.LOCK_EX)
+        retenido.compartido = False
+        try:
+            if _firma(ruta) != previa:
+                raise ConflictoConcurrente(
+                    f"El archivo {os.path.basename(ruta)} fue modificado por otro proceso. "
+                    f"Vuelva a intentar la operación.")
+            yield
+        finally:
+            fcntl.flock(retenido.archivo.fileno(), fcntl.LOCK_SH)
+            retenido.compartido = True
+        return
+
+    try:
+        f = open(clave, mode='a+b')
+    except OSError:
+        if not compartido:
+            raise
+        yield
+        return
+    with f:
+        _tomar(f, compartido)
+        retenidos[clave] = _Retenido(f, compartido)
+        try:
+            yield
+        finally:
+            retenidos.pop(clave, None)
+            _soltar(f)
+
+
+class LectoresEscritor:
+    """
+    Bloqueo entre hilos: varios lectores a la vez o un solo escritor.
+
+    Un escritor que espera tiene prioridad sobre los lectores que llegan después,
+    para que un flujo continuo de lecturas no lo deje esperando indefinidamente.
+    """
+
+    def __init__(self):
+        self._condicion = threading.Condition()
+        self._lectores = 0
+        self._escribiendo = False
+        self._escritores_esperando = 0
+
+    @contextmanager
+    def leyendo(self):
+        with self._condicion:
+            while self._escribiendo or self._escritores_esperando:
+                self._condicion.wait()
+            self._lectores += 1
+        try:
+            yield
+        finally:
+            with self._condicion:
+                self._lectores -= 1
+                if not self._lectores:
+                    self._condicion.notify_all()
+
+    @contextmanager
+    def escribiendo(self):
+        with self._condicion:
+            self._escritores_esperando += 1
+            try:
+                while self._escribiendo or self._lectores:
+                    self._condicion.wait()
+            finally:
+                self._escritores_esperando -= 1
+            self._escribiendo = True
+        try:
+            yield
+        finally:
+            with self._condicion:
+                self._escribiendo = False
+                self._condicion.notify_all()
@@ -0,0 +1,133 @@
+# controlador/busqueda.py
+"""
+Búsqueda por texto (nombre, carrera, nombre del curso) sin distinguir mayúsculas
+ni tildes.
+
+El índice tiene dos niveles: cada palabra distinta apunta a los registros que la
+contienen, y cada trigrama apunta a las palabras del vocabulario que lo contienen.
+Así el índice crece con el vocabulario (pocos miles de palabras) y no con el
+texto de cada registro. Las palabras se indexan con dos espacios delante, de modo
+que los trigramas del inicio de palabra también resuelven consultas de una o dos
+letras, que se buscan como inicio de palabra.
+"""
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+_SEPARADORES = re.compile(r"[^\w]+")
+
+
+def normalizar(texto: str) -> str:
+    """Quita tildes y diacríticos y pasa a minúsculas: 'Pérez' -> 'perez'."""
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in descompuesto if not unicodedata.combining(c)).casefold()
+
+
+def palabras(texto: str) -> List[str]:
+    """Palabras normalizadas de un texto."""
+    return [p for p in _SEPARADORES.split(normalizar(texto)) if p]
+
+
+def _trigramas(palabra: str) -> Set[str]:
+    marcada = "  " + palabra
+    return {marcada[i:i + 3] for i in range(len(marcada) - 2)}
+
+
+def coincide(textos: Iterable[str], consulta: str, solo_prefijo: bool = False) -> bool:
+    """Indica si la consulta aparece en alguno de los textos (o al inicio de alguna de sus palabras)."""
+    consulta = " ".join(palabras(consulta))
+    for texto in textos:
+        normalizado = " ".join(palabras(texto))
+        if solo_prefijo:
+            if normalizado.startswith(consulta) or (" " + consulta) in normalizado:
+                return True
+        elif consulta in normalizado:
+            return True
+    return False
+
+
+def filtrar(registros: Iterable[Any], campos: Sequence[str], consulta: str,
+            solo_prefijo: bool, clave: str, todos_los_campos: bool) -> List[Any]:
+    """Confirma los candidatos del índice y los ordena por el primer campo (y su clave)."""
+    if todos_los_campos and len(palabras(consulta)) == 1:
+        # Con una sola palabra, los candidatos del índice ya son exactamente los resultados
+        encontrados = list(registros)
+    else:
+        encontrados = [r for r in registros if coincide((getattr(r, c) for c in campos), consulta, solo_prefijo)]
+    return sorted(encontrados, key=lambda r: (normalizar(getattr(r, campos[0])), getattr(r, clave)))
+
+
+class IndiceTexto:
+    """Índice de palabras y trigramas de los textos de una tabla, actualizable registro por registro."""
+
+    def __init__(self):
+        # palabra -> IDs de los registros que la contienen (dict como conjunto ordenado)
+        self._ids_por_palabra: Dict[str, Dict[str, None]] = {}
+        # trigrama -> palabras del vocabulario que lo contienen
+        self._palabras_por_trigrama: Dict[str, Set[str]] = {}
+        # id -> palabras con las que se indexó el registro
+        self._palabras_por_id: Dict[str, Sequence[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._palabras_por_id)
+
+    def agregar(self, id_registro: str, textos: Iterable[str]):
+        self.quitar(id_registro)
+        propias = tuple(dict.fromkeys(p for texto in textos for p in palabras(texto)))
+        self._palabras_por_id[id_registro] = propias
+        for palabra in propias:
+            ids = self._ids_por_palabra.get(palabra)
+            if ids is None:
+                ids = self._ids_por_palabra[palabra] = {}
+                for trigrama in _trigramas(palabra):
+                    self._palabras_por_trigrama.setdefault(trigrama, set()).add(palabra)
+            ids[id_registro] = None
+
+    def quitar(self, id_registro: str):
+        for palabra in self._palabras_por_id.pop(id_registro, ()):
+            ids = self._ids_por_palabra[palabra]
+            del ids[id_registro]
+            if not ids:
+                # La palabra ya no está en ningún registro: sale del vocabulario
+                del self._ids_por_palabra[palabra]
+                for trigrama in _trigramas(palabra):
+                    con_trigrama = self._palabras_por_trigrama[trigrama]
+                    con_trigrama.discard(palabra)
+                    if not con_trigrama:
+                        del self._palabras_por_trigrama[trigrama]
+
+    def _palabras_con(self, fragmento: str, al_inicio: bool) -> Set[str]:
+        """Palabras del vocabulario que contienen el fragmento (o empiezan con él)."""
+        if al_inicio or len(fragmento) < 3:
+            trigramas = _trigramas(fragmento)
+            al_inicio = True
+        else:
+            trigramas = {fragmento[i:i + 3] for i in range(len(fragmento) - 2)}
+        conjuntos = sorted((self._palabras_por_trigrama.get(t, set()) for t in trigramas), key=len)
+        candidatas = set(conjuntos[0]).intersection(*conjuntos[1:])
+        if al_inicio:
+            return {p for p in candidatas if p.startswith(fragmento)}
+        return {p for p in candidatas if fragmento in p}
+
+    def candidatos(self, consulta: str, solo_prefijo: bool = False) -> Optional[Set[str]]:
+        """
+        IDs de los registros que pueden coincidir con la consulta; hay que
+        confirmarlos con coincide(). Retorna None si la consulta no tiene palabras.
+        En una consulta de varias palabras, las del medio deben estar completas.
+        """
+        fragmentos = palabras(consulta)
+        if not fragmentos:
+            return None
+        resultado: Optional[Set[str]] = None
+        ultimo = len(fragmentos) - 1
+        for i, fragmento in enumerate(fragmentos):
+            if 0 < i < ultimo:
+                encontradas = {fragmento} if fragmento in self._ids_por_palabra else set()
+            else:
+                # La primera palabra puede ser el final de una palabra, salvo si se busca por prefijo
+                encontradas = self._palabras_con(fragmento, al_inicio=solo_prefijo or i > 0)
+            ids = {id_r for p in encontradas for id_r in self._ids_por_palabra[p]}
+            resultado = ids if resultado is None else resultado & ids
+            if not resultado:
+                return set()
+        return resultado
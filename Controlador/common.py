@@ -2,25 +2,88 @@
 import csv
 import json
 import os
-from typing import List, Any
-from modelo.entidades import Curso, Matricula
+import textwrap
+from contextlib import contextmanager
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional
+from modelo.entidades import Curso, Matricula, a_dict
+from controlador.bloqueo import bloquear
 
 # --- Constantes de Archivos ---
 # Esto encuentra la raíz del proyecto (un nivel arriba de 'controlador')
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DATA_DIR = os.path.join(BASE_DIR, "data")
+# MATRICULAS_DATOS apunta a otro directorio de datos (lo usan las pruebas que lanzan procesos)
+DATA_DIR = os.environ.get("MATRICULAS_DATOS") or os.path.join(BASE_DIR, "data")
 ESTUDIANTES_FILE = os.path.join(DATA_DIR, "estudiantes.csv")
 CURSOS_FILE = os.path.join(DATA_DIR, "cursos.csv")
+# Con extensión .jsonl las matrículas se guardan en formato JSON Lines (una por línea)
 MATRICULAS_FILE = os.path.join(DATA_DIR, "matriculas.json")
+SQLITE_FILE = os.path.join(DATA_DIR, "matriculas.db")
+
+# --- Backend de Almacenamiento ---
+# "archivos" usa los CSV/JSON de arriba; "sqlite" usa SQLITE_FILE (ver almacen_sqlite.py)
+BACKEND = os.environ.get("MATRICULAS_BACKEND", "archivos")
+
+# --- Diario de Matrículas ---
+# En modo diario, cada cambio de matrículas se agrega como una línea JSON al
+# archivo '<matriculas>.log' en lugar de tocar matriculas.json. Al cargar, el
+# diario se aplica sobre el JSON, y cuando supera el umbral se compacta.
+MODO_DIARIO_MATRICULAS = os.environ.get("MATRICULAS_DIARIO") == "1"
+UMBRAL_COMPACTACION_DIARIO = 1024 * 1024  # bytes
+
+# --- Matrículas por Período ---
+# Con MATRICULAS_POR_PERIODO las matrículas no van en MATRICULAS_FILE sino en
+# un archivo JSON Lines por período ('<MATRICULAS_DIR>/<período>.jsonl'), más
+# un manifiesto con los períodos, cuántas matrículas tiene cada uno y si está
+# cerrado (solo lectura). Así una operación sobre un período solo lee y
+# escribe el archivo de ese período. En este modo no se usa el diario.
+MATRICULAS_POR_PERIODO = os.environ.get("MATRICULAS_POR_PERIODO") == "1"
+MATRICULAS_DIR = os.path.join(DATA_DIR, "matriculas")
+
+# --- Instantáneas Binarias ---
+# Con USAR_BINARIO, junto a cada archivo de datos se guarda '<archivo>.bin', una
+# copia binaria que se lee con mmap sin parsear (ver almacen_binario.py). Se
+# regenera al guardar y se ignora si no coincide con el archivo, que sigue
+# siendo la fuente de verdad. No se usa con las matrículas por período.
+USAR_BINARIO = os.environ.get("MATRICULAS_BINARIO") == "1"
+
+# --- Encabezados de los archivos CSV ---
+ENCABEZADOS_ESTUDIANTES = ['id_estudiante', 'nombre', 'carrera']
+ENCABEZADOS_CURSOS = ['id_curso', 'nombre_curso', 'creditos']
 
 
 # --- Funciones de Carga y Guardado ---
+# Las lecturas toman un bloqueo compartido sobre el archivo (varios procesos
+# leen a la vez) y las escrituras uno exclusivo, así nadie lee un archivo a
+# medio escribir. Guardar un archivo completo escribe un temporal y lo renombra.
+
+@contextmanager
+def _reemplazar(archivo: str, **opciones) -> Iterator[IO]:
+    """
+    Abre un temporal para escribir el contenido nuevo del archivo; al salir del
+    bloque sin errores lo fuerza a disco y lo renombra sobre el archivo, en un
+    solo paso. Si algo falla, el archivo original queda intacto.
+    """
+    temporal = archivo + ".tmp"
+    try:
+        with open(temporal, mode='w', encoding='utf-8', **opciones) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, archivo)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
 
 def cargar_datos_csv(archivo: str, modelo: type) -> List[Any]:
     """Carga datos desde un archivo CSV y los convierte a una lista de modelos."""
-    datos = []
+    return list(iterar_datos_csv(archivo, modelo))
+
+def iterar_datos_csv(archivo: str, modelo: type) -> Iterator[Any]:
+    """Recorre un archivo CSV entregando un modelo por fila, sin cargarlo completo."""
     try:
-        with open(archivo, mode='r', encoding='utf-8') as f:
+        with bloquear(archivo, compartido=True), open(archivo, mode='r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
             for fila in reader:
                 # Convertir créditos a int si el modelo es Curso
@@ -30,26 +93,77 @@ def cargar_datos_csv(archivo: str, modelo: type) -> List[Any]:
                     except ValueError:
                         print(f"Advertencia: Crédito no válido para {fila.get('nombre_curso')}")
                         continue
-                datos.append(modelo(**fila))
+                yield modelo(**fila)
     except FileNotFoundError:
         print(f"Advertencia: Archivo no encontrado {archivo}. Se creará uno nuevo al guardar.")
     except Exception as e:
         print(f"Error inesperado al cargar {archivo}: {e}")
-    return datos
 
-def guardar_datos_csv(archivo: str, datos: List[Any], encabezados: List[str]):
-    """Guarda una lista de modelos en un archivo CSV."""
+def guardar_datos_csv(archivo: str, datos: List[Any], encabezados: List[str]) -> bool:
+    """Guarda una lista de modelos en un archivo CSV. Retorna True si se pudo escribir."""
     try:
-        with open(archivo, mode='w', newline='', encoding='utf-8') as f:
+        with bloquear(archivo), _reemplazar(archivo, newline='') as f:
             writer = csv.DictWriter(f, fieldnames=encabezados)
             writer.writeheader()
             for item in datos:
-                writer.writerow(item.__dict__)
+                writer.writerow(a_dict(item))
     except IOError as e:
         print(f"Error al escribir en {archivo}: {e}")
+        return False
+    return True
+
+def _termina_en_salto_de_linea(archivo: str) -> bool:
+    """Indica si el último byte del archivo es un salto de línea."""
+    with open(archivo, mode='rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) in (b'\n', b'\r')
+
+
+def agregar_datos_csv(archivo: str, datos: List[Any], encabezados: List[str]) -> bool:
+    """Agrega una lista de modelos al final de un archivo CSV sin reescribirlo. Retorna True si se pudo escribir."""
+    try:
+        with bloquear(archivo):
+            _agregar_filas_csv(archivo, datos, encabezados)
+    except IOError as e:
+        print(f"Error al escribir en {archivo}: {e}")
+        return False
+    return True
+
+
+def _agregar_filas_csv(archivo: str, datos: List[Any], encabezados: List[str]):
+    vacio = not os.path.exists(archivo) or os.path.getsize(archivo) == 0
+    # Los archivos editados a mano pueden no terminar en salto de línea
+    falta_salto = not vacio and not _termina_en_salto_de_linea(archivo)
+    with open(archivo, mode='a', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=encabezados)
+        if vacio:
+            writer.writeheader()
+        elif falta_salto:
+            f.write(writer.writer.dialect.lineterminator)
+        for item in datos:
+            writer.writerow(a_dict(item))
+
+
+def _es_jsonl(archivo: str) -> bool:
+    return archivo.endswith(".jsonl")
+
+
+def _formatear_elemento(item: Matricula) -> str:
+    """Un elemento del arreglo tal como lo escribe json.dump(..., indent=2)."""
+    return textwrap.indent(json.dumps(a_dict(item), indent=2), '  ')
+
 
 def cargar_datos_json(archivo: str) -> List[Matricula]:
-    """Carga datos desde un archivo JSON y los convierte a una lista de Matricula."""
+    """
+    Carga datos desde un archivo JSON (o JSON Lines) y los convierte a una lista de Matricula.
+    Si existe un diario de cambios pendientes, lo aplica sobre lo cargado.
+    """
+    if _es_jsonl(archivo):
+        return list(iterar_datos_json(archivo))
+    with bloquear(archivo, compartido=True):
+        return list(_aplicar_diario(archivo, _leer_arreglo_json(archivo)))
+
+def _leer_arreglo_json(archivo: str) -> List[Matricula]:
     datos = []
     try:
         with open(archivo, mode='r', encoding='utf-8') as f:
@@ -57,18 +171,350 @@ def cargar_datos_json(archivo: str) -> List[Matricula]:
             for item in lista_json:
                 datos.append(Matricula(**item))
     except FileNotFoundError:
-        print(f"Advertencia: Archivo no encontrado {archivo}. Se creará uno nuevo al guardar.")
+        if not os.path.exists(ruta_diario(archivo)):
+            print(f"Advertencia: Archivo no encontrado {archivo}. Se creará uno nuevo al guardar.")
     except json.JSONDecodeError:
         print(f"Advertencia: Archivo JSON {archivo} está vacío o corrupto.")
     except Exception as e:
         print(f"Error inesperado al cargar {archivo}: {e}")
     return datos
 
-def guardar_datos_json(archivo: str, datos: List[Matricula]):
-    """Guarda una lista de modelos Matricula en un archivo JSON."""
+def iterar_datos_json(archivo: str) -> Iterator[Matricula]:
+    """
+    Recorre las matrículas de un archivo JSON o JSON Lines sin cargarlo completo
+    (memoria constante salvo por el diario, que se mantiene pequeño). El bloqueo
+    compartido se mantiene hasta terminar de recorrerlas.
+    """
+    with bloquear(archivo, compartido=True):
+        yield from _aplicar_diario(archivo, _iterar_archivo_json(archivo))
+
+def _iterar_archivo_json(archivo: str, tamano_bloque: int = 64 * 1024) -> Iterator[Matricula]:
+    """Recorre el arreglo JSON (o las líneas JSON) del archivo, un elemento a la vez."""
+    try:
+        with open(archivo, mode='r', encoding='utf-8') as f:
+            if _es_jsonl(archivo):
+                for linea in f:
+                    if linea.strip():
+                        yield Matricula(**json.loads(linea))
+                return
+
+            decoder = json.JSONDecoder()
+            buffer = f.read(tamano_bloque).lstrip()
+            if not buffer.startswith('['):
+                raise json.JSONDecodeError("Se esperaba un arreglo", buffer, 0)
+            pos = 1
+            fin_de_archivo = False
+            while True:
+                # Saltar espacios y comas entre elementos
+                while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                    pos += 1
+                if pos < len(buffer) and buffer[pos] == ']':
+                    return
+                try:
+                    if pos == len(buffer):
+                        raise json.JSONDecodeError("Faltan datos", buffer, pos)
+                    item, pos = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # El elemento quedó partido entre bloques: leer el siguiente
+                    if fin_de_archivo:
+                        raise
+                    bloque = f.read(tamano_bloque)
+                    fin_de_archivo = not bloque
+                    buffer = buffer[pos:] + bloque
+                    pos = 0
+                    continue
+                yield Matricula(**item)
+    except FileNotFoundError:
+        if not os.path.exists(ruta_diario(archivo)):
+            print(f"Advertencia: Archivo no encontrado {archivo}. Se creará uno nuevo al guardar.")
+    except json.JSONDecodeError:
+        print(f"Advertencia: Archivo JSON {archivo} está vacío o corrupto.")
+    except Exception as e:
+        print(f"Error inesperado al cargar {archivo}: {e}")
+
+def guardar_datos_json(archivo: str, datos: Iterable[Matricula]) -> bool:
+    """
+    Guarda las Matricula en un archivo JSON (o JSON Lines). Retorna True si se pudo escribir.
+    Acepta cualquier iterable y escribe un elemento a la vez. Escribe en un archivo
+    temporal y lo renombra, así un fallo a mitad de camino no deja el JSON a medias.
+    Como el archivo queda completo, descarta el diario.
+    """
+    try:
+        with bloquear(archivo):
+            with _reemplazar(archivo) as f:
+                if _es_jsonl(archivo):
+                    for item in datos:
+                        f.write(json.dumps(a_dict(item)) + "\n")
+                else:
+                    # Mismo formato que json.dump(lista, f, indent=2), sin armar la lista
+                    separador = "[\n"
+                    for item in datos:
+                        f.write(separador + _formatear_elemento(item))
+                        separador = ",\n"
+                    f.write("[]" if separador == "[\n" else "\n]")
+            # Todavía bajo el bloqueo, para que nadie agregue al diario antes de borrarlo
+            if os.path.exists(ruta_diario(archivo)):
+                os.remove(ruta_diario(archivo))
+    except IOError as e:
+        print(f"Error al escribir en {archivo}: {e}")
+        return False
+    return True
+
+
+def agregar_datos_json(archivo: str, datos: List[Matricula]) -> bool:
+    """
+    Agrega una lista de Matricula al final del archivo sin reescribirlo.
+    En JSON Lines basta con agregar líneas. En un arreglo JSON se sobrescribe el ']'
+    final con los nuevos elementos y se vuelve a cerrar el arreglo.
+    Retorna False si el archivo no existe o no termina en un arreglo, en cuyo caso
+    quien llama debe guardar el archivo completo.
+    """
+    if not datos:
+        return True
+    if _es_jsonl(archivo):
+        return _agregar_lineas_json(archivo, datos)
+    elementos = ',\n'.join(_formatear_elemento(item) for item in datos)
+    try:
+        with bloquear(archivo), open(archivo, mode='r+b') as f:
+            tamano = f.seek(0, os.SEEK_END)
+            inicio_cola = max(0, tamano - 4096)
+            f.seek(inicio_cola)
+            cola = f.read().rstrip()
+            if not cola.endswith(b']'):
+                return False
+            antes_del_cierre = cola[:-1].rstrip()
+            if not antes_del_cierre:
+                return False
+            # Si lo anterior al ']' es el '[' el arreglo está vacío y no lleva coma
+            separador = b'\n' if antes_del_cierre.endswith(b'[') else b',\n'
+            f.seek(inicio_cola + len(antes_del_cierre))
+            f.write(separador + elementos.encode('utf-8') + b'\n]')
+            f.truncate()
+    except FileNotFoundError:
+        return False
+    except IOError as e:
+        print(f"Error al escribir en {archivo}: {e}")
+        return False
+    return True
+
+
+def _agregar_lineas_json(archivo: str, datos: List[Matricula]) -> bool:
+    try:
+        with bloquear(archivo):
+            falta_salto = os.path.exists(archivo) and os.path.getsize(archivo) > 0 \
+                and not _termina_en_salto_de_linea(archivo)
+            with open(archivo, mode='a', encoding='utf-8') as f:
+                if falta_salto:
+                    f.write("\n")
+                for item in datos:
+                    f.write(json.dumps(a_dict(item)) + "\n")
+    except IOError as e:
+        print(f"Error al escribir en {archivo}: {e}")
+        return False
+    return True
+
+
+def convertir_matriculas(origen: str, destino: str) -> bool:
+    """Copia las matrículas de un formato a otro (.json o .jsonl) sin cargarlas en memoria."""
+    return guardar_datos_json(destino, iterar_datos_json(origen))
+
+
+# --- Diario de Matrículas ---
+
+def ruta_diario(archivo: str) -> str:
+    """Ruta del diario de cambios pendientes de un archivo JSON."""
+    return archivo + ".log"
+
+
+def registrar_en_diario(archivo: str, operaciones: List[dict]) -> bool:
+    """
+    Agrega operaciones al diario del archivo, una por línea. Cada operación es un
+    dict con "op" ('alta', 'modificacion' o 'baja') y "matricula" o "id_matricula".
+    Se fuerza a disco antes de retornar, así las operaciones sobreviven a una caída.
+    Retorna True si se pudo escribir.
+    """
+    lineas = ''.join(json.dumps(operacion) + "\n" for operacion in operaciones)
+    ruta = ruta_diario(archivo)
+    try:
+        # El diario se bloquea junto con su archivo: se leen y se compactan juntos
+        with bloquear(archivo):
+            if os.path.exists(ruta) and os.path.getsize(ruta) > 0 and not _termina_en_salto_de_linea(ruta):
+                _descartar_linea_incompleta(ruta)
+            with open(ruta, mode='a', encoding='utf-8') as f:
+                f.write(lineas)
+                f.flush()
+                os.fsync(f.fileno())
+    except IOError as e:
+        print(f"Error al escribir en {ruta}: {e}")
+        return False
+    return True
+
+
+def _descartar_linea_incompleta(ruta: str):
+    """
+    Recorta la última línea del diario si no termina en salto de línea: es una
+    escritura interrumpida, nunca confirmada, y la siguiente se pegaría a ella.
+    """
+    with open(ruta, mode='r+b') as f:
+        posicion = f.seek(0, os.SEEK_END)
+        while posicion > 0:
+            inicio = max(0, posicion - 4096)
+            f.seek(inicio)
+            salto = f.read(posicion - inicio).rfind(b'\n')
+            if salto >= 0:
+                f.truncate(inicio + salto + 1)
+                return
+            posicion = inicio
+        f.truncate(0)
+
+
+def _leer_diario(archivo: str) -> Dict[str, Optional[Matricula]]:
+    """
+    Estado final de cada matrícula tocada por el diario: la última versión
+    registrada, o None si la última operación fue una baja.
+    """
+    pendientes: Dict[str, Optional[Matricula]] = {}
+    try:
+        f = open(ruta_diario(archivo), mode='r', encoding='utf-8')
+    except FileNotFoundError:
+        return pendientes
+
+    incompleta = None
+    with f:
+        for numero, linea in enumerate(f, start=1):
+            if not linea.strip():
+                continue
+            if incompleta is not None:
+                raise ValueError(f"La línea {incompleta} del diario {ruta_diario(archivo)} está dañada.")
+            try:
+                registro = json.loads(linea)
+            except json.JSONDecodeError:
+                # Solo se admite como última línea: es una escritura interrumpida
+                incompleta = numero
+                continue
+            if registro["op"] == "baja":
+                pendientes[registro["id_matricula"]] = None
+            else:
+                matricula = Matricula(**registro["matricula"])
+                pendientes[matricula.id_matricula] = matricula
+    if incompleta is not None:
+        print(f"Advertencia: Línea {incompleta} del diario {ruta_diario(archivo)} incompleta. Se ignora.")
+    return pendientes
+
+
+def _aplicar_diario(archivo: str, datos: Iterable[Matricula]) -> Iterator[Matricula]:
+    """
+    Aplica el diario sobre las matrículas a medida que se recorren: las modificadas
+    se reemplazan en su lugar, las dadas de baja se omiten y las nuevas van al final.
+    Volver a aplicar un diario ya compactado no duplica registros.
+    """
+    pendientes = _leer_diario(archivo)
+    if not pendientes:
+        yield from datos
+        return
+    for m in datos:
+        if m.id_matricula in pendientes:
+            reemplazo = pendientes.pop(m.id_matricula)
+            if reemplazo is not None:
+                yield reemplazo
+        else:
+            yield m
+    for m in pendientes.values():
+        if m is not None:
+            yield m
+
+
+def diario_supera_umbral(archivo: str) -> bool:
+    """Indica si el diario del archivo ya debería compactarse."""
+    try:
+        return os.path.getsize(ruta_diario(archivo)) >= UMBRAL_COMPACTACION_DIARIO
+    except OSError:
+        return False
+
+
+def compactar_diario(archivo: str) -> bool:
+    """Integra el diario en el archivo JSON y lo elimina. Retorna True si se compactó."""
+    with bloquear(archivo):
+        if not os.path.exists(ruta_diario(archivo)):
+            return False
+        return guardar_datos_json(archivo, cargar_datos_json(archivo))
+
+
+# --- Matrículas por Período ---
+
+def ruta_periodo(periodo: str) -> str:
+    """Ruta del archivo de matrículas de un período."""
+    if not periodo or periodo.strip('.') == '' or any(c in periodo for c in '/\\:'):
+        raise ValueError(f"El período '{periodo}' no es válido como nombre de archivo.")
+    return os.path.join(MATRICULAS_DIR, periodo + ".jsonl")
+
+
+def ruta_manifiesto() -> str:
+    return os.path.join(MATRICULAS_DIR, "manifiesto.json")
+
+
+def leer_manifiesto() -> Dict[str, Dict[str, Any]]:
+    """
+    Períodos del manifiesto, en orden, cada uno con "archivo", "matriculas"
+    (cantidad) y "cerrado". Sin manifiesto retorna un dict vacío.
+    """
+    archivo = ruta_manifiesto()
+    try:
+        with bloquear(archivo, compartido=True), open(archivo, mode='r', encoding='utf-8') as f:
+            return json.load(f)["periodos"]
+    except FileNotFoundError:
+        return {}
+    except (json.JSONDecodeError, KeyError):
+        print(f"Advertencia: Manifiesto {archivo} corrupto. Se ignoran sus períodos.")
+        return {}
+
+
+def guardar_manifiesto(periodos: Dict[str, Dict[str, Any]]) -> bool:
+    """Guarda el manifiesto con los períodos ordenados. Retorna True si se pudo escribir."""
+    archivo = ruta_manifiesto()
+    try:
+        os.makedirs(MATRICULAS_DIR, exist_ok=True)
+        with bloquear(archivo), _reemplazar(archivo) as f:
+            json.dump({"periodos": dict(sorted(periodos.items()))}, f, indent=2, ensure_ascii=False)
+    except IOError as e:
+        print(f"Error al escribir en {archivo}: {e}")
+        return False
+    return True
+
+
+def particionar_matriculas(origen: str) -> bool:
+    """
+    Reparte las matrículas de un archivo JSON o JSON Lines en los archivos por
+    período de MATRICULAS_DIR y escribe el manifiesto, sin cargarlas en memoria.
+    Reemplaza los períodos que ya existieran. Retorna True si se pudo escribir.
+    """
+    os.makedirs(MATRICULAS_DIR, exist_ok=True)
+    archivos: Dict[str, IO] = {}
+    cantidades: Dict[str, int] = {}
     try:
-        with open(archivo, mode='w', encoding='utf-8') as f:
-            lista_dict = [item.__dict__ for item in datos]
-            json.dump(lista_dict, f, indent=2)
+        with bloquear(ruta_manifiesto()):
+            try:
+                for m in iterar_datos_json(origen):
+                    f = archivos.get(m.periodo_academico)
+                    if f is None:
+                        f = archivos[m.periodo_academico] = open(ruta_periodo(m.periodo_academico) + ".tmp",
+                                                                 mode='w', encoding='utf-8')
+                    f.write(json.dumps(a_dict(m)) + "\n")
+                    cantidades[m.periodo_academico] = cantidades.get(m.periodo_academico, 0) + 1
+                for periodo, f in archivos.items():
+                    f.close()
+                    with bloquear(ruta_periodo(periodo)):
+                        os.replace(f.name, ruta_periodo(periodo))
+            finally:
+                for f in archivos.values():
+                    f.close()
+                    if os.path.exists(f.name):
+                        os.remove(f.name)
+            periodos = leer_manifiesto()
+            for periodo, cantidad in cantidades.items():
+                periodos[periodo] = {"archivo": os.path.basename(ruta_periodo(periodo)),
+                                     "matriculas": cantidad, "cerrado": False}
+            return guardar_manifiesto(periodos)
     except IOError as e:
-        print(f"Error al escribir en {archivo}: {e}")
\ No newline at end of file
+        print(f"Error al particionar {origen}: {e}")
+        return False
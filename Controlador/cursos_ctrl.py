@@ -1,76 +1,74 @@
 # controlador/cursos_ctrl.py
 from typing import List, Optional
 from modelo.entidades import Curso
-from controlador.common import (
-    CURSOS_FILE,
-    MATRICULAS_FILE,
-    cargar_datos_csv,
-    guardar_datos_csv,
-    cargar_datos_json
-)
+from controlador import repositorio
+
+# Campos por los que se puede ordenar el listado
+ORDENES_CURSOS = ('id_curso', 'nombre_curso', 'creditos')
 
 
 def obtener_cursos() -> List[Curso]:
     """Retorna la lista completa de cursos."""
-    return cargar_datos_csv(CURSOS_FILE, Curso)
+    return repositorio.cursos().lista()
+
+
+def obtener_pagina_cursos(numero: int = 1, tamano: int = 20, orden: Optional[str] = None,
+                          descendente: bool = False) -> repositorio.Pagina:
+    """Retorna una página de cursos, opcionalmente ordenada por uno de sus campos."""
+    if orden is not None and orden not in ORDENES_CURSOS:
+        raise ValueError(f"No se puede ordenar cursos por '{orden}'.")
+    return repositorio.paginar(repositorio.cursos(), numero, tamano, orden, descendente)
+
+
+def buscar_cursos(texto: str, solo_prefijo: bool = False) -> List[Curso]:
+    """
+    Busca cursos por nombre, sin distinguir mayúsculas ni tildes. Con
+    solo_prefijo, el texto debe estar al inicio de una palabra.
+    """
+    return repositorio.cursos().buscar_texto(texto, None, solo_prefijo)
 
 
 def obtener_curso_por_id(id_curso: str) -> Optional[Curso]:
     """Busca un curso por su ID."""
-    for curso in obtener_cursos():
-        if curso.id_curso == id_curso:
-            return curso
-    return None
+    return repositorio.obtener_curso(id_curso)
 
 
 def crear_curso(id_curso: str, nombre_curso: str, creditos: int) -> Curso:
     """Crea un nuevo curso y lo guarda."""
-    if obtener_curso_por_id(id_curso):
+    cursos = repositorio.cursos()
+    if id_curso in cursos:
         raise ValueError(f"El ID de curso '{id_curso}' ya existe.")
 
     nuevo = Curso(id_curso=id_curso, nombre_curso=nombre_curso, creditos=creditos)
-    cursos = obtener_cursos()
-    cursos.append(nuevo)
-    guardar_datos_csv(CURSOS_FILE, cursos, ['id_curso', 'nombre_curso', 'creditos'])
+    repositorio.insertar_curso(cursos, nuevo)
     return nuevo
 
 
 def actualizar_curso(id_original: str, nombre_curso: str, creditos: int) -> Optional[Curso]:
     """Actualiza los datos de un curso existente."""
-    cursos = obtener_cursos()
-    curso_encontrado = None
-    for curso in cursos:
-        if curso.id_curso == id_original:
-            curso.nombre_curso = nombre_curso
-            curso.creditos = creditos
-            curso_encontrado = curso
-            break
+    cursos = repositorio.cursos()
+    curso_encontrado = cursos.obtener(id_original)
 
     if curso_encontrado:
-        guardar_datos_csv(CURSOS_FILE, cursos, ['id_curso', 'nombre_curso', 'creditos'])
-        return curso_encontrado
+        # Se reemplaza el registro: las instantáneas publicadas conservan el anterior
+        actualizado = Curso(id_curso=id_original, nombre_curso=nombre_curso, creditos=creditos)
+        repositorio.actualizar_curso(cursos, actualizado)
+        return actualizado
     else:
         raise ValueError(f"No se encontró un curso con ID '{id_original}'.")
 
 
 def eliminar_curso(id_curso: str) -> bool:
     """Elimina un curso de la lista."""
-    cursos = obtener_cursos()
-    curso_a_eliminar = None
-    for curso in cursos:
-        if curso.id_curso == id_curso:
-            curso_a_eliminar = curso
-            break
-
-    if curso_a_eliminar:
+    cursos = repositorio.cursos()
+
+    if id_curso in cursos:
         # Validar que no esté en ninguna matrícula
-        matriculas = cargar_datos_json(MATRICULAS_FILE)
-        for m in matriculas:
-            if id_curso in m.id_cursos:
-                raise ValueError(f"No se puede eliminar. El curso está en la matrícula '{m.id_matricula}'.")
+        matriculas = repositorio.matriculas().buscar('id_curso', id_curso)
+        if matriculas:
+            raise ValueError(f"No se puede eliminar. El curso está en la matrícula '{matriculas[0].id_matricula}'.")
 
-        cursos.remove(curso_a_eliminar)
-        guardar_datos_csv(CURSOS_FILE, cursos, ['id_curso', 'nombre_curso', 'creditos'])
+        repositorio.eliminar_curso(cursos, id_curso)
         return True
     else:
-        raise ValueError(f"No se encontró un curso con ID '{id_curso}'.")
\ No newline at end of file
+        raise ValueError(f"No se encontró un curso con ID '{id_curso}'.")
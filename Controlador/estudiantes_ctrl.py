@@ -1,75 +1,78 @@
 # controlador/estudiantes_ctrl.py
 from typing import List, Optional
 from modelo.entidades import Estudiante
-from controlador.common import (
-    ESTUDIANTES_FILE,
-    cargar_datos_csv,
-    guardar_datos_csv,
-)
+from controlador import repositorio
 # Necesitaremos esto para la validación de borrado
 from controlador import matriculas_ctrl
 
+# Campos por los que se puede ordenar el listado
+ORDENES_ESTUDIANTES = ('id_estudiante', 'nombre', 'carrera')
+
 
 def obtener_estudiantes() -> List[Estudiante]:
     """Retorna la lista completa de estudiantes."""
-    return cargar_datos_csv(ESTUDIANTES_FILE, Estudiante)
+    return repositorio.estudiantes().lista()
+
+
+def obtener_pagina_estudiantes(numero: int = 1, tamano: int = 20, orden: Optional[str] = None,
+                               descendente: bool = False) -> repositorio.Pagina:
+    """Retorna una página de estudiantes, opcionalmente ordenada por uno de sus campos."""
+    if orden is not None and orden not in ORDENES_ESTUDIANTES:
+        raise ValueError(f"No se puede ordenar estudiantes por '{orden}'.")
+    return repositorio.paginar(repositorio.estudiantes(), numero, tamano, orden, descendente)
+
+
+def buscar_estudiantes(texto: str, campo: Optional[str] = None, solo_prefijo: bool = False) -> List[Estudiante]:
+    """
+    Busca estudiantes por nombre o carrera (o solo en `campo`), sin distinguir
+    mayúsculas ni tildes. Con solo_prefijo, el texto debe estar al inicio de una palabra.
+    """
+    if campo is not None and campo not in repositorio.TEXTOS_ESTUDIANTES:
+        raise ValueError(f"No se puede buscar estudiantes por '{campo}'.")
+    return repositorio.estudiantes().buscar_texto(texto, campo, solo_prefijo)
 
 
 def obtener_estudiante_por_id(id_estudiante: str) -> Optional[Estudiante]:
     """Busca un estudiante por su ID."""
-    for est in obtener_estudiantes():
-        if est.id_estudiante == id_estudiante:
-            return est
-    return None
+    return repositorio.obtener_estudiante(id_estudiante)
 
 
 def crear_estudiante(id_estudiante: str, nombre: str, carrera: str) -> Estudiante:
     """Crea un nuevo estudiante y lo guarda."""
-    if obtener_estudiante_por_id(id_estudiante):
+    estudiantes = repositorio.estudiantes()
+    if id_estudiante in estudiantes:
         raise ValueError(f"El ID de estudiante '{id_estudiante}' ya existe.")
 
     nuevo = Estudiante(id_estudiante=id_estudiante, nombre=nombre, carrera=carrera)
-    estudiantes = obtener_estudiantes()
-    estudiantes.append(nuevo)
-    guardar_datos_csv(ESTUDIANTES_FILE, estudiantes, ['id_estudiante', 'nombre', 'carrera'])
+    repositorio.insertar_estudiante(estudiantes, nuevo)
     return nuevo
 
 
 def actualizar_estudiante(id_original: str, nombre: str, carrera: str) -> Optional[Estudiante]:
     """Actualiza los datos de un estudiante existente."""
-    estudiantes = obtener_estudiantes()
-    estudiante_encontrado = None
-    for est in estudiantes:
-        if est.id_estudiante == id_original:
-            est.nombre = nombre
-            est.carrera = carrera
-            estudiante_encontrado = est
-            break
+    estudiantes = repositorio.estudiantes()
+    estudiante_encontrado = estudiantes.obtener(id_original)
 
     if estudiante_encontrado:
-        guardar_datos_csv(ESTUDIANTES_FILE, estudiantes, ['id_estudiante', 'nombre', 'carrera'])
-        return estudiante_encontrado
+        # Se reemplaza el registro: las instantáneas publicadas conservan el anterior
+        actualizado = Estudiante(id_estudiante=id_original, nombre=nombre, carrera=carrera)
+        repositorio.actualizar_estudiante(estudiantes, actualizado)
+        return actualizado
     else:
         raise ValueError(f"No se encontró un estudiante con ID '{id_original}'.")
 
 
 def eliminar_estudiante(id_estudiante: str) -> bool:
     """Elimina un estudiante de la lista."""
-    estudiantes = obtener_estudiantes()
-    estudiante_a_eliminar = None
-    for est in estudiantes:
-        if est.id_estudiante == id_estudiante:
-            estudiante_a_eliminar = est
-            break
-
-    if estudiante_a_eliminar:
+    estudiantes = repositorio.estudiantes()
+
+    if id_estudiante in estudiantes:
         # Validar que no tenga matrículas activas
         matriculas = matriculas_ctrl.obtener_matriculas_por_estudiante(id_estudiante)
         if matriculas:
             raise ValueError(f"No se puede eliminar. El estudiante tiene {len(matriculas)} matrícula(s) asociada(s).")
 
-        estudiantes.remove(estudiante_a_eliminar)
-        guardar_datos_csv(ESTUDIANTES_FILE, estudiantes, ['id_estudiante', 'nombre', 'carrera'])
+        repositorio.eliminar_estudiante(estudiantes, id_estudiante)
         return True
     else:
-        raise ValueError(f"No se encontró un estudiante con ID '{id_estudiante}'.")
\ No newline at end of file
+        raise ValueError(f"No se encontró un estudiante con ID '{id_estudiante}'.")
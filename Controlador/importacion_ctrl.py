@@ -0,0 +1,125 @@
+# controlador/importacion_ctrl.py
+"""
+Importación masiva de estudiantes, cursos y matrículas desde archivos CSV.
+
+Cada archivo se lee fila por fila y se valida contra un índice de los IDs
+existentes construido una sola vez. Las filas válidas se guardan con una sola
+escritura al final; las inválidas se reportan todas juntas con su número de línea.
+"""
+import csv
+from dataclasses import dataclass, field
+from typing import Any, Iterator, List, Set, Tuple
+from modelo.entidades import Estudiante, Curso
+from controlador import repositorio, matriculas_ctrl
+
+# Separador de los IDs de cursos dentro de la columna id_cursos de las matrículas
+SEPARADOR_CURSOS = ';'
+
+
+@dataclass
+class ResultadoImportacion:
+    aceptados: List[Any] = field(default_factory=list)
+    # (número de línea en el archivo, motivo del rechazo)
+    rechazados: List[Tuple[int, str]] = field(default_factory=list)
+
+
+def _filas(ruta: str) -> Iterator[Tuple[int, dict]]:
+    """Recorre el CSV sin cargarlo completo, junto con el número de línea de cada fila."""
+    # utf-8-sig descarta el BOM con que Excel empieza los CSV en UTF-8
+    with open(ruta, mode='r', newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        for fila in reader:
+            yield reader.line_num, fila
+
+
+def _campo(fila: dict, nombre: str) -> str:
+    valor = (fila.get(nombre) or '').strip()
+    if not valor:
+        raise ValueError(f"Falta el campo '{nombre}'.")
+    return valor
+
+
+def _ids(tabla) -> Set[str]:
+    """Índice de los IDs existentes de una tabla, construido una sola vez."""
+    return {getattr(registro, tabla.clave) for registro in tabla}
+
+
+def importar_estudiantes(ruta: str, guardar: bool = True) -> ResultadoImportacion:
+    """Importa estudiantes (id_estudiante, nombre, carrera). Con guardar=False solo valida."""
+    estudiantes = repositorio.estudiantes()
+    ids = _ids(estudiantes)
+    resultado = ResultadoImportacion()
+
+    for linea, fila in _filas(ruta):
+        try:
+            id_estudiante = _campo(fila, 'id_estudiante')
+            if id_estudiante in ids:
+                raise ValueError(f"El ID de estudiante '{id_estudiante}' ya existe.")
+            nuevo = Estudiante(id_estudiante=id_estudiante, nombre=_campo(fila, 'nombre'),
+                               carrera=_campo(fila, 'carrera'))
+        except ValueError as e:
+            resultado.rechazados.append((linea, str(e)))
+            continue
+        ids.add(id_estudiante)
+        resultado.aceptados.append(nuevo)
+
+    if guardar and resultado.aceptados:
+        repositorio.insertar_estudiantes(estudiantes, resultado.aceptados)
+    return resultado
+
+
+def importar_cursos(ruta: str, guardar: bool = True) -> ResultadoImportacion:
+    """Importa cursos (id_curso, nombre_curso, creditos). Con guardar=False solo valida."""
+    cursos = repositorio.cursos()
+    ids = _ids(cursos)
+    resultado = ResultadoImportacion()
+
+    for linea, fila in _filas(ruta):
+        try:
+            id_curso = _campo(fila, 'id_curso')
+            if id_curso in ids:
+                raise ValueError(f"El ID de curso '{id_curso}' ya existe.")
+            try:
+                creditos = int(_campo(fila, 'creditos'))
+            except ValueError as e:
+                raise ValueError(f"Crédito no válido: '{fila.get('creditos')}'.") from e
+            nuevo = Curso(id_curso=id_curso, nombre_curso=_campo(fila, 'nombre_curso'), creditos=creditos)
+        except ValueError as e:
+            resultado.rechazados.append((linea, str(e)))
+            continue
+        ids.add(id_curso)
+        resultado.aceptados.append(nuevo)
+
+    if guardar and resultado.aceptados:
+        repositorio.insertar_cursos(cursos, resultado.aceptados)
+    return resultado
+
+
+def importar_matriculas(ruta: str, guardar: bool = True) -> ResultadoImportacion:
+    """
+    Importa matrículas (id_estudiante, periodo_academico, id_cursos), con los
+    cursos separados por ';'. Con guardar=False solo valida.
+    """
+    resultado = ResultadoImportacion()
+    solicitudes = []
+    lineas = []
+
+    for linea, fila in _filas(ruta):
+        try:
+            id_estudiante = _campo(fila, 'id_estudiante')
+            periodo = _campo(fila, 'periodo_academico')
+            id_cursos = [c.strip() for c in _campo(fila, 'id_cursos').split(SEPARADOR_CURSOS) if c.strip()]
+        except ValueError as e:
+            resultado.rechazados.append((linea, str(e)))
+            continue
+        solicitudes.append((id_estudiante, id_cursos, periodo))
+        lineas.append(linea)
+
+    # Las referencias a estudiantes y cursos se validan en el lote
+    for linea, r in zip(lineas, matriculas_ctrl.matricular_estudiantes_lote(solicitudes, guardar=guardar)):
+        if r["exito"]:
+            resultado.aceptados.append(r["matricula"])
+        else:
+            resultado.rechazados.append((linea, r["error"]))
+    resultado.rechazados.sort()
+    return resultado
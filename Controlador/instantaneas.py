@@ -0,0 +1,307 @@
+# controlador/instantaneas.py
+"""
+Instantáneas inmutables de estudiantes, cursos y matrículas para los lectores.
+
+actual() retorna la versión publicada más reciente. Una Instantanea no cambia
+nunca: un reporte que la recorre no ve cambios aplicados a medias ni necesita
+bloqueos, aunque otros hilos sigan matriculando. Cada alta, modificación o baja
+sobre las tablas del repositorio (recibida como observador de
+repositorio.Tabla) arma una versión nueva a partir de la anterior y la publica
+reemplazando una sola referencia. La versión nueva comparte casi todo con la
+anterior: los registros se guardan en MapaPersistente, que copia solo la
+porción del mapa donde cae la clave modificada.
+
+Los registros (Estudiante, Curso, Matricula) se comparten entre versiones y
+con las tablas, así que deben tratarse como de solo lectura: los controladores
+reemplazan los registros en lugar de modificarlos.
+
+Como en agregados, si el repositorio recarga alguna tabla (otro proceso cambió
+el archivo) la instantánea se vuelve a armar desde las tablas nuevas. Con el
+backend SQLite no hay instantáneas: actual() retorna una VistaSQLite con las
+mismas consultas, que lee la base de datos en cada llamada.
+"""
+import threading
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+from modelo.entidades import Estudiante, Curso, Matricula
+from controlador import repositorio
+
+
+class MapaPersistente(Mapping):
+    """
+    Mapa inmutable repartido en PORCIONES dicts según el hash de la clave.
+    con() y sin() retornan un mapa nuevo que comparte todas las porciones salvo
+    la modificada. No conserva el orden de inserción.
+    """
+    PORCIONES = 64
+    __slots__ = ('_porciones', '_largo')
+
+    def __init__(self, porciones: Optional[Tuple[Dict, ...]] = None, largo: int = 0):
+        self._porciones = porciones or tuple({} for _ in range(self.PORCIONES))
+        self._largo = largo
+
+    @classmethod
+    def desde(cls, pares) -> "MapaPersistente":
+        porciones = tuple({} for _ in range(cls.PORCIONES))
+        for clave, valor in pares:
+            porciones[hash(clave) % cls.PORCIONES][clave] = valor
+        return cls(porciones, sum(map(len, porciones)))
+
+    def __getitem__(self, clave):
+        return self._porciones[hash(clave) % self.PORCIONES][clave]
+
+    def __contains__(self, clave) -> bool:
+        return clave in self._porciones[hash(clave) % self.PORCIONES]
+
+    def __iter__(self) -> Iterator:
+        for porcion in self._porciones:
+            yield from porcion
+
+    def __len__(self) -> int:
+        return self._largo
+
+    def _reemplazar(self, i: int, porcion: Dict, largo: int) -> "MapaPersistente":
+        return MapaPersistente(self._porciones[:i] + (porcion,) + self._porciones[i + 1:], largo)
+
+    def con(self, clave, valor) -> "MapaPersistente":
+        i = hash(clave) % self.PORCIONES
+        porcion = dict(self._porciones[i])
+        nueva = clave not in porcion
+        porcion[clave] = valor
+        return self._reemplazar(i, porcion, self._largo + nueva)
+
+    def sin(self, clave) -> "MapaPersistente":
+        i = hash(clave) % self.PORCIONES
+        if clave not in self._porciones[i]:
+            return self
+        porcion = dict(self._porciones[i])
+        del porcion[clave]
+        return self._reemplazar(i, porcion, self._largo - 1)
+
+
+def _agregar(mapa: MapaPersistente, clave: str, matricula: Matricula) -> MapaPersistente:
+    return mapa.con(clave, mapa.get(clave, ()) + (matricula,))
+
+
+def _quitar(mapa: MapaPersistente, clave: str, id_matricula: str) -> MapaPersistente:
+    restantes = tuple(m for m in mapa.get(clave, ()) if m.id_matricula != id_matricula)
+    return mapa.con(clave, restantes) if restantes else mapa.sin(clave)
+
+
+class Instantanea:
+    """Una versión inmutable de los datos, con las consultas de los reportes."""
+
+    __slots__ = ('version', 'estudiantes', 'cursos', 'matriculas', '_por_estudiante', '_por_curso', '_claves')
+
+    def __init__(self, version: int, estudiantes: MapaPersistente, cursos: MapaPersistente,
+                 matriculas: MapaPersistente, por_estudiante: MapaPersistente, por_curso: MapaPersistente,
+                 claves: MapaPersistente):
+        self.version = version
+        self.estudiantes = estudiantes
+        self.cursos = cursos
+        self.matriculas = matriculas
+        # id_estudiante / id_curso -> matrículas, en el orden en que se agregaron
+        self._por_estudiante = por_estudiante
+        self._por_curso = por_curso
+        # id_matricula -> (id_estudiante, cursos) con los que se indexó
+        self._claves = claves
+
+    @classmethod
+    def desde_tablas(cls, estudiantes, cursos, matriculas, version: int = 1) -> "Instantanea":
+        por_estudiante: Dict[str, List[Matricula]] = {}
+        por_curso: Dict[str, List[Matricula]] = {}
+        claves = []
+        for m in matriculas:
+            cursos_m = tuple(dict.fromkeys(m.id_cursos))
+            claves.append((m.id_matricula, (m.id_estudiante, cursos_m)))
+            por_estudiante.setdefault(m.id_estudiante, []).append(m)
+            for id_curso in cursos_m:
+                por_curso.setdefault(id_curso, []).append(m)
+        return cls(version,
+                   MapaPersistente.desde((e.id_estudiante, e) for e in estudiantes),
+                   MapaPersistente.desde((c.id_curso, c) for c in cursos),
+                   MapaPersistente.desde((m.id_matricula, m) for m in matriculas),
+                   MapaPersistente.desde((k, tuple(v)) for k, v in por_estudiante.items()),
+                   MapaPersistente.desde((k, tuple(v)) for k, v in por_curso.items()),
+                   MapaPersistente.desde(claves))
+
+    # --- Versiones nuevas ---
+
+    def _con(self, **cambios) -> "Instantanea":
+        campos = {nombre: getattr(self, nombre) for nombre in
+                  ('estudiantes', 'cursos', 'matriculas', '_por_estudiante', '_por_curso', '_claves')}
+        campos.update(cambios)
+        return Instantanea(self.version + 1, campos['estudiantes'], campos['cursos'], campos['matriculas'],
+                           campos['_por_estudiante'], campos['_por_curso'], campos['_claves'])
+
+    def con_estudiante(self, id_estudiante: str, estudiante: Optional[Estudiante]) -> "Instantanea":
+        if estudiante is None:
+            return self._con(estudiantes=self.estudiantes.sin(id_estudiante))
+        return self._con(estudiantes=self.estudiantes.con(id_estudiante, estudiante))
+
+    def con_curso(self, id_curso: str, curso: Optional[Curso]) -> "Instantanea":
+        if curso is None:
+            return self._con(cursos=self.cursos.sin(id_curso))
+        return self._con(cursos=self.cursos.con(id_curso, curso))
+
+    def con_matricula(self, id_matricula: str, matricula: Optional[Matricula]) -> "Instantanea":
+        por_estudiante, por_curso, claves = self._por_estudiante, self._por_curso, self._claves
+        anterior = claves.get(id_matricula)
+        if anterior is not None:
+            id_estudiante, cursos_m = anterior
+            por_estudiante = _quitar(por_estudiante, id_estudiante, id_matricula)
+            for id_curso in cursos_m:
+                por_curso = _quitar(por_curso, id_curso, id_matricula)
+        if matricula is None:
+            return self._con(matriculas=self.matriculas.sin(id_matricula), _por_estudiante=por_estudiante,
+                             _por_curso=por_curso, _claves=claves.sin(id_matricula))
+        cursos_m = tuple(dict.fromkeys(matricula.id_cursos))
+        por_estudiante = _agregar(por_estudiante, matricula.id_estudiante, matricula)
+        for id_curso in cursos_m:
+            por_curso = _agregar(por_curso, id_curso, matricula)
+        return self._con(matriculas=self.matriculas.con(id_matricula, matricula), _por_estudiante=por_estudiante,
+                         _por_curso=por_curso, _claves=claves.con(id_matricula, (matricula.id_estudiante, cursos_m)))
+
+    # --- Consultas ---
+    # Con `periodo` solo cuentan las matrículas de ese período
+
+    def obtener_estudiante(self, id_estudiante: str) -> Optional[Estudiante]:
+        return self.estudiantes.get(id_estudiante)
+
+    def obtener_curso(self, id_curso: str) -> Optional[Curso]:
+        return self.cursos.get(id_curso)
+
+    def matriculas_de_estudiante(self, id_estudiante: str, periodo: Optional[str] = None) -> Tuple[Matricula, ...]:
+        return _del_periodo(self._por_estudiante.get(id_estudiante, ()), periodo)
+
+    def matriculas_de_curso(self, id_curso: str, periodo: Optional[str] = None) -> Tuple[Matricula, ...]:
+        return _del_periodo(self._por_curso.get(id_curso, ()), periodo)
+
+    def estudiantes_por_curso(self, id_curso: str, periodo: Optional[str] = None) -> List[Estudiante]:
+        """Estudiantes distintos matriculados en el curso, en el orden de sus matrículas."""
+        ids = dict.fromkeys(m.id_estudiante for m in self.matriculas_de_curso(id_curso, periodo))
+        return [e for e in map(self.estudiantes.get, ids) if e]
+
+    def creditos_estudiante(self, id_estudiante: str, periodo: str) -> int:
+        """Créditos de la (primera) matrícula del estudiante en el período."""
+        for m in self.matriculas_de_estudiante(id_estudiante, periodo):
+            return sum(c.creditos for c in map(self.cursos.get, m.id_cursos) if c)
+        return 0
+
+
+def _del_periodo(matriculas: Tuple[Matricula, ...], periodo: Optional[str]) -> Tuple[Matricula, ...]:
+    if periodo is None:
+        return matriculas
+    return tuple(m for m in matriculas if m.periodo_academico == periodo)
+
+
+class VistaSQLite:
+    """Las consultas de Instantanea, respondidas directamente por la base de datos."""
+
+    def obtener_estudiante(self, id_estudiante: str) -> Optional[Estudiante]:
+        return repositorio.estudiantes().obtener(id_estudiante)
+
+    def obtener_curso(self, id_curso: str) -> Optional[Curso]:
+        return repositorio.cursos().obtener(id_curso)
+
+    def matriculas_de_estudiante(self, id_estudiante: str, periodo: Optional[str] = None) -> Tuple[Matricula, ...]:
+        return tuple(repositorio.matriculas().buscar('id_estudiante', id_estudiante, periodo))
+
+    def matriculas_de_curso(self, id_curso: str, periodo: Optional[str] = None) -> Tuple[Matricula, ...]:
+        return tuple(repositorio.matriculas().buscar('id_curso', id_curso, periodo))
+
+    def estudiantes_por_curso(self, id_curso: str, periodo: Optional[str] = None) -> List[Estudiante]:
+        estudiantes = repositorio.estudiantes()
+        ids = dict.fromkeys(m.id_estudiante for m in self.matriculas_de_curso(id_curso, periodo))
+        return [e for e in map(estudiantes.obtener, ids) if e]
+
+    def creditos_estudiante(self, id_estudiante: str, periodo: str) -> int:
+        for m in self.matriculas_de_estudiante(id_estudiante, periodo):
+            cursos = repositorio.cursos()
+            return sum(c.creditos for c in map(cursos.obtener, m.id_cursos) if c)
+        return 0
+
+
+# --- Versiones publicadas ---
+# Una por tabla de matrículas: None para la de todas las matrículas y, con las
+# matrículas guardadas por período, una por cada período consultado. Cada valor
+# es (tablas de las que sale, instantánea) en una sola tupla, para que un lector
+# nunca vea las tablas de una versión junto con la instantánea de otra.
+
+_vigentes: Dict[Optional[str], Tuple[Tuple, Instantanea]] = {}
+# Solo lo toman quienes arman versiones nuevas; los lectores no lo usan
+_bloqueo = threading.Lock()
+
+
+def _publicar_cambio(clave: Optional[str], tabla: Any, metodo: str, id_registro: str, registro: Optional[Any]):
+    with _bloqueo:
+        vigente = _vigentes.get(clave)
+        if vigente is None or not any(tabla is t for t in vigente[0]):
+            return
+        tablas, instantanea = vigente
+        _vigentes[clave] = (tablas, getattr(instantanea, metodo)(id_registro, registro))
+
+
+class _Observador:
+    """Observador de una tabla que publica una versión nueva con cada cambio."""
+
+    def __init__(self, clave: Optional[str], tabla: Any, metodo: str):
+        self.clave = clave
+        self.tabla = tabla
+        self.metodo = metodo
+
+    def __call__(self, id_registro: str, registro: Optional[Any]):
+        _publicar_cambio(self.clave, self.tabla, self.metodo, id_registro, registro)
+
+
+_observadores: Dict[Optional[str], List[_Observador]] = {}
+
+
+def _soltar(clave: Optional[str]):
+    for observador in _observadores.pop(clave, []):
+        observador.tabla.quitar_observador(observador)
+
+
+def _armar(clave: Optional[str], tablas: Tuple) -> Instantanea:
+    """Arma la instantánea desde cero y se registra como observador de las tablas."""
+    _soltar(clave)
+    vigente = _vigentes.get(clave)
+    version = vigente[1].version + 1 if vigente is not None else 1
+    instantanea = Instantanea.desde_tablas(*tablas, version=version)
+    for tabla, metodo in zip(tablas, ('con_estudiante', 'con_curso', 'con_matricula')):
+        observador = _Observador(clave, tabla, metodo)
+        tabla.agregar_observador(observador)
+        _observadores.setdefault(clave, []).append(observador)
+    _vigentes[clave] = (tablas, instantanea)
+    return instantanea
+
+
+def actual(periodo: Optional[str] = None):
+    """
+    La instantánea publicada más reciente (o una VistaSQLite con ese backend).
+    Con `periodo` y las matrículas guardadas por período, la instantánea solo
+    tiene las matrículas de ese período; si no, tiene todas.
+    Solo se arma de nuevo, con un bloqueo, cuando el repositorio recargó alguna tabla.
+    """
+    if repositorio.usa_sqlite():
+        return VistaSQLite()
+    if periodo is None or not repositorio.por_periodo():
+        clave, matriculas = None, repositorio.matriculas()
+    else:
+        clave, matriculas = periodo, repositorio.matriculas_de_periodo(periodo)
+    tablas = (repositorio.estudiantes(), repositorio.cursos(), matriculas)
+    vigente = _vigentes.get(clave)
+    if vigente is not None and all(a is b for a, b in zip(vigente[0], tablas)):
+        return vigente[1]
+    with _bloqueo:
+        vigente = _vigentes.get(clave)
+        if vigente is not None and all(a is b for a, b in zip(vigente[0], tablas)):
+            return vigente[1]
+        return _armar(clave, tablas)
+
+
+def descartar():
+    """Descarta las instantáneas; la próxima llamada a actual() las arma de nuevo."""
+    with _bloqueo:
+        for clave in list(_observadores):
+            _soltar(clave)
+        _vigentes.clear()
@@ -0,0 +1,287 @@
+# controlador/instrumentacion.py
+"""
+Instrumentación opcional de los controladores y de las funciones de E/S de common.
+
+Está apagada por defecto y en ese estado no agrega ningún costo: activar()
+reemplaza las funciones públicas de los módulos medidos por versiones que miden,
+y desactivar() restaura las originales. Se activa al iniciar con la variable de
+entorno MATRICULAS_INSTRUMENTACION=1; si además se define
+MATRICULAS_INSTRUMENTACION_SALIDA, las estadísticas se guardan en ese archivo
+JSON al terminar el programa.
+
+Mide:
+  - para cada función de los controladores, cantidad de llamadas, errores y un
+    histograma de latencias;
+  - para cada función de E/S de common, cantidad de operaciones, bytes leídos o
+    escritos (tamaño del archivo, o lo que creció al agregar), tiempo total de
+    lectura y parseo, y escrituras fallidas.
+"""
+import atexit
+import bisect
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Límites superiores (en milisegundos) de los intervalos del histograma de latencias
+LIMITES_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+# Funciones de E/S de common: nombre -> (tipo de operación, si escribe en el diario del archivo)
+FUNCIONES_ES: Dict[str, Tuple[str, bool]] = {
+    "cargar_datos_csv": ("lectura", False),
+    "cargar_datos_json": ("lectura", False),
+    "iterar_datos_csv": ("lectura", False),
+    "iterar_datos_json": ("lectura", False),
+    "guardar_datos_csv": ("escritura", False),
+    "guardar_datos_json": ("escritura", False),
+    "compactar_diario": ("escritura", False),
+    "agregar_datos_csv": ("agregado", False),
+    "agregar_datos_json": ("agregado", False),
+    "registrar_en_diario": ("agregado", True),
+}
+
+
+class Histograma:
+    """Latencias agrupadas en los intervalos de LIMITES_MS (el último intervalo no tiene límite)."""
+
+    def __init__(self):
+        self.llamadas = 0
+        self.errores = 0
+        self.total_ms = 0.0
+        self.maximo_ms = 0.0
+        self.cubetas = [0] * (len(LIMITES_MS) + 1)
+
+    def registrar(self, ms: float, error: bool = False):
+        self.llamadas += 1
+        self.errores += error
+        self.total_ms += ms
+        self.maximo_ms = max(self.maximo_ms, ms)
+        self.cubetas[bisect.bisect_left(LIMITES_MS, ms)] += 1
+
+    def percentil(self, p: float) -> Optional[float]:
+        """Límite superior del intervalo donde cae el percentil p (0-100); None si es el último."""
+        objetivo = self.llamadas * p / 100
+        acumulado = 0
+        for i, cantidad in enumerate(self.cubetas):
+            acumulado += cantidad
+            if cantidad and acumulado >= objetivo:
+                return LIMITES_MS[i] if i < len(LIMITES_MS) else None
+        return 0.0
+
+    def a_dict(self) -> Dict[str, Any]:
+        return {
+            "llamadas": self.llamadas,
+            "errores": self.errores,
+            "total_ms": round(self.total_ms, 3),
+            "promedio_ms": round(self.total_ms / self.llamadas, 3) if self.llamadas else 0.0,
+            "maximo_ms": round(self.maximo_ms, 3),
+            "p50_ms": self.percentil(50),
+            "p95_ms": self.percentil(95),
+            "cubetas": {(f"<={limite}" if i < len(LIMITES_MS) else f">{LIMITES_MS[-1]}"): cantidad
+                        for i, (limite, cantidad) in enumerate(zip(LIMITES_MS + (None,), self.cubetas))},
+        }
+
+
+class EstadisticaES:
+    def __init__(self, tipo: str):
+        self.tipo = tipo
+        self.operaciones = 0
+        self.fallidas = 0
+        self.bytes = 0
+        self.total_ms = 0.0
+
+    def a_dict(self) -> Dict[str, Any]:
+        return {"tipo": self.tipo, "operaciones": self.operaciones, "fallidas": self.fallidas,
+                "bytes": self.bytes, "total_ms": round(self.total_ms, 3)}
+
+
+_bloqueo = threading.Lock()
+_latencias: Dict[str, Histograma] = {}
+_es: Dict[str, EstadisticaES] = {}
+# función original por (módulo, nombre), mientras la instrumentación está activa
+_originales: Dict[Tuple[Any, str], Callable] = {}
+# Las funciones de E/S se llaman entre sí (cargar_datos_csv usa iterar_datos_csv):
+# solo se cuenta la llamada más externa de cada hilo
+_local = threading.local()
+
+
+def activa() -> bool:
+    return bool(_originales)
+
+
+def reiniciar():
+    """Descarta las estadísticas acumuladas."""
+    with _bloqueo:
+        _latencias.clear()
+        _es.clear()
+
+
+def _tamano(archivo: str) -> int:
+    try:
+        return os.path.getsize(archivo)
+    except (OSError, TypeError):
+        return 0
+
+
+def _registrar_latencia(nombre: str, ms: float, error: bool):
+    with _bloqueo:
+        _latencias.setdefault(nombre, Histograma()).registrar(ms, error)
+
+
+def _registrar_es(nombre: str, tipo: str, bytes_: int, ms: float, fallida: bool):
+    with _bloqueo:
+        estadistica = _es.setdefault(nombre, EstadisticaES(tipo))
+        estadistica.operaciones += 1
+        estadistica.fallidas += fallida
+        estadistica.bytes += bytes_
+        estadistica.total_ms += ms
+
+
+def _medir_controlador(nombre: str, funcion: Callable) -> Callable:
+    if inspect.isgeneratorfunction(funcion):
+        @functools.wraps(funcion)
+        def medida_iterador(*args, **kwargs):
+            inicio = time.perf_counter()
+            error = True
+            try:
+                yield from funcion(*args, **kwargs)
+                error = False
+            finally:
+                _registrar_latencia(nombre, (time.perf_counter() - inicio) * 1000, error)
+        return medida_iterador
+
+    @functools.wraps(funcion)
+    def medida(*args, **kwargs):
+        inicio = time.perf_counter()
+        error = True
+        try:
+            resultado = funcion(*args, **kwargs)
+            error = False
+            return resultado
+        finally:
+            _registrar_latencia(nombre, (time.perf_counter() - inicio) * 1000, error)
+    return medida
+
+
+def _medir_es(common, nombre: str, funcion: Callable) -> Callable:
+    tipo, en_diario = FUNCIONES_ES[nombre]
+
+    def ruta(archivo: str) -> str:
+        return common.ruta_diario(archivo) if en_diario else archivo
+
+    def registrar(archivo, tamano_antes: int, segundos: float, resultado: Any):
+        tamano = _tamano(ruta(archivo))
+        bytes_ = tamano - tamano_antes if tipo == "agregado" else tamano
+        fallida = tipo != "lectura" and resultado is False
+        _registrar_es(nombre, tipo, max(0, bytes_), segundos * 1000, fallida)
+
+    if inspect.isgeneratorfunction(funcion):
+        @functools.wraps(funcion)
+        def medida_iterador(archivo, *args, **kwargs):
+            if getattr(_local, "profundidad", 0):
+                yield from funcion(archivo, *args, **kwargs)
+                return
+            iterador = funcion(archivo, *args, **kwargs)
+            lectura = 0.0
+            try:
+                while True:
+                    # Solo se cuenta el tiempo de leer cada elemento, no el de quien
+                    # consume el iterador (que puede hacer su propia E/S entre elementos)
+                    _local.profundidad = 1
+                    paso = time.perf_counter()
+                    try:
+                        elemento = next(iterador)
+                    except StopIteration:
+                        return
+                    finally:
+                        lectura += time.perf_counter() - paso
+                        _local.profundidad = 0
+                    yield elemento
+            finally:
+                iterador.close()
+                registrar(archivo, 0, lectura, None)
+        return medida_iterador
+
+    @functools.wraps(funcion)
+    def medida(archivo, *args, **kwargs):
+        if getattr(_local, "profundidad", 0):
+            return funcion(archivo, *args, **kwargs)
+        _local.profundidad = 1
+        tamano_antes = _tamano(ruta(archivo)) if tipo == "agregado" else 0
+        inicio = time.perf_counter()
+        resultado = None
+        try:
+            resultado = funcion(archivo, *args, **kwargs)
+            return resultado
+        finally:
+            _local.profundidad = 0
+            registrar(archivo, tamano_antes, time.perf_counter() - inicio, resultado)
+    return medida
+
+
+def _modulos_controladores() -> List[Any]:
+    from controlador import estudiantes_ctrl, cursos_ctrl, matriculas_ctrl, reportes_ctrl, importacion_ctrl
+    return [estudiantes_ctrl, cursos_ctrl, matriculas_ctrl, reportes_ctrl, importacion_ctrl]
+
+
+def activar():
+    """Empieza a medir (no hace nada si ya estaba activa)."""
+    from controlador import common
+    if activa():
+        return
+    for modulo in _modulos_controladores():
+        corto = modulo.__name__.rsplit('.', 1)[-1]
+        for nombre, funcion in inspect.getmembers(modulo, inspect.isfunction):
+            if nombre.startswith('_') or funcion.__module__ != modulo.__name__:
+                continue
+            _originales[(modulo, nombre)] = funcion
+            setattr(modulo, nombre, _medir_controlador(f"{corto}.{nombre}", funcion))
+    for nombre in FUNCIONES_ES:
+        funcion = getattr(common, nombre)
+        _originales[(common, nombre)] = funcion
+        setattr(common, nombre, _medir_es(common, nombre, funcion))
+
+
+def desactivar():
+    """Deja de medir y restaura las funciones originales; las estadísticas se conservan."""
+    for (modulo, nombre), funcion in _originales.items():
+        setattr(modulo, nombre, funcion)
+    _originales.clear()
+
+
+def instantanea() -> Dict[str, Any]:
+    """Estadísticas acumuladas, listas para mostrar o guardar como JSON."""
+    with _bloqueo:
+        es = {nombre: e.a_dict() for nombre, e in sorted(_es.items())}
+        latencias = {nombre: h.a_dict() for nombre, h in sorted(_latencias.items())}
+    totales = {"cargas": 0, "guardados": 0, "bytes_leidos": 0, "bytes_escritos": 0, "ms_lectura": 0.0}
+    for e in es.values():
+        if e["tipo"] == "lectura":
+            totales["cargas"] += e["operaciones"]
+            totales["bytes_leidos"] += e["bytes"]
+            totales["ms_lectura"] += e["total_ms"]
+        else:
+            totales["guardados"] += e["operaciones"]
+            totales["bytes_escritos"] += e["bytes"]
+    totales["ms_lectura"] = round(totales["ms_lectura"], 3)
+    return {"activa": activa(), "totales": totales, "entrada_salida": es, "controladores": latencias}
+
+
+def volcar(ruta: str):
+    """Guarda la instantánea en un archivo JSON."""
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(instantanea(), f, indent=2, ensure_ascii=False)
+
+
+def activar_desde_entorno() -> bool:
+    """Activa la instrumentación si así lo piden las variables de entorno. Retorna si quedó activa."""
+    if os.environ.get("MATRICULAS_INSTRUMENTACION") != "1":
+        return False
+    activar()
+    salida: Optional[str] = os.environ.get("MATRICULAS_INSTRUMENTACION_SALIDA")
+    if salida:
+        atexit.register(volcar, salida)
+    return True
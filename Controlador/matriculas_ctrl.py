@@ -1,12 +1,23 @@
 # controlador/matriculas_ctrl.py
-from typing import List
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 from modelo.entidades import Estudiante, Matricula
-from controlador.common import (
-    MATRICULAS_FILE,
-    cargar_datos_json,
-    guardar_datos_json
-)
-from controlador import estudiantes_ctrl, cursos_ctrl
+from controlador import estudiantes_ctrl, instantaneas, repositorio, secuencias
+
+
+def _validar_matricula(id_estudiante: str, id_cursos: List[str], existe_estudiante, existe_curso):
+    """Lanza ValueError si el estudiante o alguno de los cursos no existe."""
+    if not existe_estudiante(id_estudiante):
+        raise ValueError(f"El estudiante con ID '{id_estudiante}' no existe.")
+    for id_c in id_cursos:
+        if not existe_curso(id_c):
+            raise ValueError(f"El curso con ID '{id_c}' no existe.")
+
+
+def _validar_periodo(periodo: str, cerrados: Set[str]):
+    """Lanza ValueError si el período está cerrado (solo lectura)."""
+    if periodo in cerrados:
+        raise ValueError(f"El período '{periodo}' está cerrado: no admite matrículas nuevas.")
 
 
 def matricular_estudiante(
@@ -15,76 +26,130 @@ def matricular_estudiante(
         periodo: str
 ) -> Matricula:
     """Crea una nueva matrícula para un estudiante."""
-    # Validar que el estudiante exista
-    if not estudiantes_ctrl.obtener_estudiante_por_id(id_estudiante):
-        raise ValueError(f"El estudiante con ID '{id_estudiante}' no existe.")
+    cursos = repositorio.cursos()
+    _validar_matricula(id_estudiante, id_cursos, repositorio.estudiantes().__contains__, cursos.__contains__)
+    _validar_periodo(periodo, repositorio.periodos_cerrados())
 
-    # Validar que todos los cursos existan
-    cursos_validos = []
-    for id_c in id_cursos:
-        curso = cursos_ctrl.obtener_curso_por_id(id_c)
-        if not curso:
-            raise ValueError(f"El curso con ID '{id_c}' no existe.")
-        cursos_validos.append(curso)
-
-    matriculas = cargar_datos_json(MATRICULAS_FILE)
-
-    # Generar un nuevo ID de matrícula
-    nuevo_id = f"M{len(matriculas) + 1:03d}"
+    matriculas = repositorio.matriculas_de_periodo(periodo)
 
     nueva_matricula = Matricula(
-        id_matricula=nuevo_id,
+        id_matricula=secuencias.siguiente_id_matricula(),
         id_estudiante=id_estudiante,
         periodo_academico=periodo,
-        id_cursos=id_cursos
+        id_cursos=list(id_cursos)
     )
 
-    matriculas.append(nueva_matricula)
-    guardar_datos_json(MATRICULAS_FILE, matriculas)
+    repositorio.insertar_matricula(matriculas, nueva_matricula)
     return nueva_matricula
 
 
-def obtener_matriculas_por_estudiante(id_estudiante: str) -> List[Matricula]:
-    """Retorna todas las matrículas de un estudiante específico."""
-    matriculas = cargar_datos_json(MATRICULAS_FILE)
-    return [m for m in matriculas if m.id_estudiante == id_estudiante]
-
-
-def obtener_estudiantes_por_curso(id_curso: str) -> List[Estudiante]:
-    """Retorna todos los estudiantes matriculados en un curso específico."""
-    matriculas = cargar_datos_json(MATRICULAS_FILE)
-    estudiantes_en_curso = []
-    id_estudiantes_en_curso = set()
-
-    for m in matriculas:
-        if id_curso in m.id_cursos:
-            id_estudiantes_en_curso.add(m.id_estudiante)
-
-    for id_est in id_estudiantes_en_curso:
-        est = estudiantes_ctrl.obtener_estudiante_por_id(id_est)
-        if est:
-            estudiantes_en_curso.append(est)
-
-    return estudiantes_en_curso
+def matricular_estudiantes_lote(
+        solicitudes: Iterable[Tuple[str, List[str], str]],
+        guardar: bool = True
+) -> List[dict]:
+    """
+    Matricula varios estudiantes a la vez. Cada solicitud es (id_estudiante, id_cursos, periodo).
+    Todas se validan contra una misma lectura de estudiantes y cursos, las válidas
+    reciben un bloque de IDs reservado de una vez y se guardan con una sola escritura.
+    Retorna, en el mismo orden de las solicitudes, un dict con "exito", "matricula"
+    (o None) y "error" (o None).
+    Con las matrículas guardadas por período el lote no es atómico: se escribe
+    un grupo por período, y si uno falla (un conflicto, un período que otro
+    proceso cerró) solo las solicitudes de ese grupo quedan con "exito" False;
+    las de los demás grupos sí se guardaron.
+    Con guardar=False solo valida: las matrículas llevan los IDs que recibirían,
+    pero no se reservan ni se guardan.
+    """
+    ids_estudiantes = {e.id_estudiante for e in repositorio.estudiantes()}
+    ids_cursos = {c.id_curso for c in repositorio.cursos()}
+    cerrados = repositorio.periodos_cerrados()
+
+    resultados = []
+    nuevas = []
+    # id(matrícula) -> su resultado, para marcar los grupos que no se pudieron guardar
+    resultado_de = {}
+    for id_estudiante, id_cursos, periodo in solicitudes:
+        try:
+            _validar_matricula(id_estudiante, id_cursos, ids_estudiantes.__contains__, ids_cursos.__contains__)
+            _validar_periodo(periodo, cerrados)
+        except ValueError as e:
+            resultados.append({"exito": False, "matricula": None, "error": str(e)})
+            continue
+        nueva = Matricula(
+            id_matricula="",  # Se asigna abajo, con un solo bloque para todo el lote
+            id_estudiante=id_estudiante,
+            periodo_academico=periodo,
+            id_cursos=list(id_cursos)
+        )
+        nuevas.append(nueva)
+        resultados.append({"exito": True, "matricula": nueva, "error": None})
+        resultado_de[id(nueva)] = resultados[-1]
+
+    if not nuevas:
+        return resultados
+    if guardar:
+        ids = secuencias.reservar_ids_matricula(len(nuevas))
+    else:
+        ids = secuencias.proximos_ids_matricula(len(nuevas))
+    for nueva, id_matricula in zip(nuevas, ids):
+        nueva.id_matricula = id_matricula
+
+    if guardar:
+        # Una escritura por tabla: una sola, salvo con las matrículas guardadas por período
+        tablas = {p: repositorio.matriculas_de_periodo(p) for p in dict.fromkeys(n.periodo_academico for n in nuevas)}
+        por_tabla = {}
+        for nueva in nuevas:
+            tabla = tablas[nueva.periodo_academico]
+            por_tabla.setdefault(id(tabla), (tabla, []))[1].append(nueva)
+        for tabla, grupo in por_tabla.values():
+            try:
+                repositorio.insertar_matriculas(tabla, grupo)
+            except ValueError as e:
+                for nueva in grupo:
+                    resultado_de[id(nueva)].update(exito=False, matricula=None, error=str(e))
+    return resultados
+
+
+def obtener_matriculas_por_estudiante(id_estudiante: str, periodo: Optional[str] = None) -> List[Matricula]:
+    """Retorna todas las matrículas de un estudiante específico (opcionalmente, solo las de un período)."""
+    return list(instantaneas.actual(periodo).matriculas_de_estudiante(id_estudiante, periodo))
+
+
+def obtener_estudiantes_por_curso(id_curso: str, periodo: Optional[str] = None) -> List[Estudiante]:
+    """Retorna todos los estudiantes matriculados en un curso específico (opcionalmente, en un período)."""
+    # La instantánea no cambia mientras se recorre, aunque otro hilo esté matriculando
+    return instantaneas.actual(periodo).estudiantes_por_curso(id_curso, periodo)
+
+
+# Estudiantes de cada curso (y período) ya armados como Tabla, de la última
+# instantánea consultada: las páginas siguientes de la misma versión reutilizan
+# la tabla y el orden que esta calcula una sola vez.
+_en_curso: Tuple[Any, Dict[Tuple[str, Optional[str]], repositorio.Tabla]] = (None, {})
+# El servidor HTTP consulta páginas desde varios hilos a la vez
+_bloqueo_en_curso = threading.Lock()
+
+
+def obtener_pagina_estudiantes_por_curso(id_curso: str, numero: int = 1, tamano: int = 20,
+                                         orden: Optional[str] = None, descendente: bool = False,
+                                         periodo: Optional[str] = None) -> repositorio.Pagina:
+    """Retorna una página de los estudiantes matriculados en un curso."""
+    global _en_curso
+    if orden is not None and orden not in estudiantes_ctrl.ORDENES_ESTUDIANTES:
+        raise ValueError(f"No se puede ordenar estudiantes por '{orden}'.")
+    instantanea = instantaneas.actual(periodo)
+    with _bloqueo_en_curso:
+        vista, tablas = _en_curso
+        if vista is not instantanea:
+            tablas = {}
+            _en_curso = (instantanea, tablas)
+        en_curso = tablas.get((id_curso, periodo))
+        if en_curso is None:
+            en_curso = repositorio.Tabla('id_estudiante', instantanea.estudiantes_por_curso(id_curso, periodo))
+            tablas[(id_curso, periodo)] = en_curso
+    return repositorio.paginar(en_curso, numero, tamano, orden, descendente)
 
 
 # --- Reto Final ---
 def calcular_creditos_estudiante(id_estudiante: str, periodo: str) -> int:
     """Calcula el total de créditos matriculados por un estudiante en un período."""
-    matriculas = obtener_matriculas_por_estudiante(id_estudiante)
-    matricula_periodo = None
-    for m in matriculas:
-        if m.periodo_academico == periodo:
-            matricula_periodo = m
-            break
-
-    if not matricula_periodo:
-        return 0
-
-    total_creditos = 0
-    for id_c in matricula_periodo.id_cursos:
-        curso = cursos_ctrl.obtener_curso_por_id(id_c)
-        if curso:
-            total_creditos += curso.creditos
-
-    return total_creditos
\ No newline at end of file
+    return instantaneas.actual(periodo).creditos_estudiante(id_estudiante, periodo)
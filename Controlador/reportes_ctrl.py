@@ -0,0 +1,264 @@
+# controlador/reportes_ctrl.py
+"""
+Reportes que recorren los datos en una sola pasada.
+
+A diferencia de los controladores, la mayoría de estos reportes no cargan las
+tablas en memoria: leen las matrículas en flujo (repositorio.iterar_*), así que
+la memoria usada no crece con el historial de matrículas. Las excepciones son
+creditos_por_estudiante y reporte_carga_precalculado, que leen los agregados
+precalculados (agregados.py) en lugar de recorrer las matrículas.
+"""
+import os
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from modelo.entidades import Estudiante
+from controlador import repositorio, agregados
+
+# Créditos máximos por período: una carga que los supera es una sobrecarga
+LIMITE_CREDITOS_PERIODO = 20
+
+
+def iterar_estudiantes_por_curso(id_curso: str) -> Iterator[Estudiante]:
+    """Entrega los estudiantes matriculados en un curso, en el orden del archivo de estudiantes."""
+    ids_estudiantes = {m.id_estudiante for m in repositorio.iterar_matriculas() if id_curso in m.id_cursos}
+    if not ids_estudiantes:
+        return
+    for est in repositorio.iterar_estudiantes():
+        if est.id_estudiante in ids_estudiantes:
+            yield est
+
+
+def creditos_por_estudiante(periodo: Optional[str] = None) -> Dict[str, int]:
+    """
+    Total de créditos matriculados por cada estudiante en un período, o en todos
+    los períodos si no se indica. Si un estudiante tiene varias matrículas en el
+    período se suman todas. Solo incluye estudiantes con matrículas.
+    """
+    return agregados.creditos_por_estudiante(periodo)
+
+
+# --- Carga de Créditos de Toda la Población ---
+
+@dataclass
+class ReporteCargaCreditos:
+    periodo: Optional[str]
+    # Créditos por estudiante (todos los estudiantes, incluso los que tienen 0)
+    totales: Dict[str, int] = field(default_factory=dict)
+    # Cantidad de estudiantes por total de créditos, ordenado por créditos
+    distribucion: Dict[int, int] = field(default_factory=dict)
+    # (id_estudiante, período, créditos) de cada carga por encima del límite
+    sobrecargas: List[Tuple[str, str, int]] = field(default_factory=list)
+
+    @property
+    def promedio(self) -> float:
+        return sum(self.totales.values()) / len(self.totales) if self.totales else 0.0
+
+    @property
+    def maximo(self) -> int:
+        return max(self.totales.values(), default=0)
+
+
+def reporte_carga_creditos(periodo: Optional[str] = None,
+                           limite: int = LIMITE_CREDITOS_PERIODO) -> ReporteCargaCreditos:
+    """
+    Calcula la carga de créditos de todos los estudiantes en una sola pasada.
+
+    Los cursos, estudiantes y períodos se codifican como enteros: los créditos
+    de cada curso quedan en un arreglo indexado por código, y en la misma pasada
+    por las matrículas se acumulan los totales por estudiante y los créditos por
+    (estudiante, período), sin buscar ningún curso por ID. Los créditos por
+    período se guardan solo para los pares que tienen matrículas, así que no
+    crecen con estudiantes × períodos. La sobrecarga se evalúa por período,
+    también cuando el reporte abarca todos los períodos.
+    """
+    codigo_curso: Dict[str, int] = {}
+    creditos = array('l')
+    for c in repositorio.iterar_cursos():
+        codigo_curso[c.id_curso] = len(creditos)
+        creditos.append(c.creditos)
+
+    codigo_estudiante: Dict[str, int] = {}
+    for est in repositorio.iterar_estudiantes():
+        codigo_estudiante.setdefault(est.id_estudiante, len(codigo_estudiante))
+    totales = array('l', bytes(len(codigo_estudiante) * creditos.itemsize))
+
+    codigo_periodo: Dict[str, int] = {}
+    por_periodo: Dict[Tuple[int, int], int] = {}
+    for m in repositorio.iterar_matriculas(None if periodo is None else [periodo]):
+        if periodo is not None and m.periodo_academico != periodo:
+            continue
+        # Matrículas de estudiantes que ya no existen también cuentan
+        i_est = codigo_estudiante.setdefault(m.id_estudiante, len(codigo_estudiante))
+        if i_est == len(totales):
+            totales.append(0)
+        clave = (i_est, codigo_periodo.setdefault(m.periodo_academico, len(codigo_periodo)))
+        cred = sum(creditos[codigo_curso[id_c]] for id_c in m.id_cursos if id_c in codigo_curso)
+        totales[i_est] += cred
+        por_periodo[clave] = por_periodo.get(clave, 0) + cred
+
+    ids_estudiantes = list(codigo_estudiante)
+    ids_periodos = list(codigo_periodo)
+    reporte = ReporteCargaCreditos(periodo)
+    reporte.totales = dict(zip(ids_estudiantes, totales))
+    reporte.distribucion = dict(sorted(Counter(totales).items()))
+    reporte.sobrecargas = [
+        (ids_estudiantes[i_est], ids_periodos[i_per], por_periodo[(i_est, i_per)])
+        for i_est, i_per in sorted(clave for clave, cred in por_periodo.items() if cred > limite)
+    ]
+    return reporte
+
+
+def reporte_carga_precalculado(periodo: Optional[str] = None,
+                               limite: int = LIMITE_CREDITOS_PERIODO) -> ReporteCargaCreditos:
+    """
+    El mismo reporte que reporte_carga_creditos, armado con los agregados y la
+    tabla de estudiantes de la caché, sin leer los archivos: para quien mantiene
+    las tablas cargadas, como el servidor. Las sobrecargas de un estudiante se
+    ordenan por período.
+    """
+    actuales = agregados.obtener()
+    totales = {est.id_estudiante: 0 for est in repositorio.estudiantes()}
+    if periodo is None:
+        por_periodo = actuales.creditos
+        creditos = actuales.creditos_totales
+    else:
+        por_periodo = {periodo: actuales.creditos.get(periodo, {})}
+        creditos = por_periodo[periodo]
+    # Matrículas de estudiantes que ya no existen también cuentan
+    totales.update(creditos)
+
+    orden = {id_estudiante: i for i, id_estudiante in enumerate(totales)}
+    reporte = ReporteCargaCreditos(periodo)
+    reporte.totales = totales
+    reporte.distribucion = dict(sorted(Counter(totales.values()).items()))
+    reporte.sobrecargas = sorted(
+        ((id_estudiante, periodo_m, cred) for periodo_m, del_periodo in por_periodo.items()
+         for id_estudiante, cred in del_periodo.items() if cred > limite),
+        key=lambda sobrecarga: (orden[sobrecarga[0]], sobrecarga[1]))
+    return reporte
+
+
+# --- Cierre de Períodos en Paralelo ---
+
+@dataclass
+class ResumenCarrera:
+    estudiantes: int = 0
+    creditos: int = 0
+
+
+@dataclass
+class ReportePeriodo:
+    periodo: str
+    # Créditos por estudiante (suma de todas sus matrículas en el período)
+    creditos: Dict[str, int] = field(default_factory=dict)
+    # Estudiantes de cada curso, ordenados por ID
+    planillas: Dict[str, List[str]] = field(default_factory=dict)
+    # Estudiantes y créditos por carrera; "" agrupa a los estudiantes que ya no existen
+    carreras: Dict[str, ResumenCarrera] = field(default_factory=dict)
+
+    def combinar(self, otro: "ReportePeriodo"):
+        """Agrega el reporte de otra parte del mismo período (con otros estudiantes)."""
+        self.creditos.update(otro.creditos)
+        for id_curso, ids in otro.planillas.items():
+            self.planillas.setdefault(id_curso, []).extend(ids)
+        for carrera, resumen in otro.carreras.items():
+            total = self.carreras.setdefault(carrera, ResumenCarrera())
+            total.estudiantes += resumen.estudiantes
+            total.creditos += resumen.creditos
+
+
+# Matrícula reducida a lo que necesita el reporte: (id_estudiante, id_cursos)
+Fila = Tuple[str, Tuple[str, ...]]
+# (créditos por curso, carrera por estudiante)
+Catalogo = Tuple[Dict[str, int], Dict[str, str]]
+
+# Catálogo de cada proceso del pool; se recibe una sola vez, en _iniciar_proceso
+_catalogo: Optional[Catalogo] = None
+
+
+def _iniciar_proceso(catalogo: Catalogo):
+    global _catalogo
+    _catalogo = catalogo
+
+
+def _reporte_parte(periodo: str, filas: List[Fila], catalogo: Optional[Catalogo] = None) -> ReportePeriodo:
+    creditos_curso, carrera_estudiante = catalogo or _catalogo
+    reporte = ReportePeriodo(periodo)
+    creditos = reporte.creditos
+    planillas: Dict[str, set] = {}
+    for id_est, id_cursos in filas:
+        creditos[id_est] = creditos.get(id_est, 0) + sum(creditos_curso.get(id_c, 0) for id_c in id_cursos)
+        for id_c in id_cursos:
+            planillas.setdefault(id_c, set()).add(id_est)
+    reporte.planillas = {id_c: sorted(ids) for id_c, ids in planillas.items()}
+    for id_est, total in creditos.items():
+        resumen = reporte.carreras.setdefault(carrera_estudiante.get(id_est, ""), ResumenCarrera())
+        resumen.estudiantes += 1
+        resumen.creditos += total
+    return reporte
+
+
+def _partes(filas_periodo: Dict[str, List[Fila]], procesos: int) -> List[Tuple[str, List[Fila]]]:
+    """
+    Divide las filas en tareas de un período cada una. Si hay menos períodos que
+    procesos, los períodos grandes se dividen por estudiante, para que las partes
+    de un período se puedan combinar sin repetir estudiantes.
+    """
+    total = sum(map(len, filas_periodo.values()))
+    partes = []
+    for periodo, filas in filas_periodo.items():
+        cantidad = max(1, round(procesos * 2 * len(filas) / total)) if procesos > 1 else 1
+        if cantidad == 1:
+            partes.append((periodo, filas))
+            continue
+        divididas: List[List[Fila]] = [[] for _ in range(cantidad)]
+        for fila in filas:
+            divididas[hash(fila[0]) % cantidad].append(fila)
+        partes += [(periodo, d) for d in divididas if d]
+    # Las tareas más grandes primero, para repartir mejor la carga
+    partes.sort(key=lambda parte: len(parte[1]), reverse=True)
+    return partes
+
+
+def reportes_por_periodo(periodos: Optional[Iterable[str]] = None,
+                         procesos: Optional[int] = None) -> Dict[str, ReportePeriodo]:
+    """
+    Créditos por estudiante, planillas de cada curso y resumen por carrera de
+    cada período (o de los períodos indicados), ordenados por período.
+
+    Los archivos se leen una sola vez, en este proceso. El cálculo se reparte
+    entre `procesos` procesos (por defecto, uno por CPU): el catálogo de cursos
+    y estudiantes se envía una vez a cada proceso al crear el pool y cada tarea
+    recibe solo las matrículas de su parte. Con un solo proceso se calcula aquí
+    mismo, sin pool.
+    """
+    periodos = set(periodos) if periodos is not None else None
+    catalogo: Catalogo = ({c.id_curso: c.creditos for c in repositorio.iterar_cursos()},
+                          {e.id_estudiante: e.carrera for e in repositorio.iterar_estudiantes()})
+    filas_periodo: Dict[str, List[Fila]] = {}
+    for m in repositorio.iterar_matriculas(periodos):
+        if periodos is None or m.periodo_academico in periodos:
+            filas_periodo.setdefault(m.periodo_academico, []).append((m.id_estudiante, tuple(m.id_cursos)))
+
+    procesos = (os.cpu_count() or 1) if procesos is None else max(1, procesos)
+    partes = _partes(filas_periodo, procesos)
+    if procesos == 1 or len(partes) <= 1:
+        resultados = [_reporte_parte(periodo, filas, catalogo) for periodo, filas in partes]
+    else:
+        with ProcessPoolExecutor(min(procesos, len(partes)), initializer=_iniciar_proceso,
+                                 initargs=(catalogo,)) as pool:
+            resultados = list(pool.map(_reporte_parte, *zip(*partes)))
+
+    reportes: Dict[str, ReportePeriodo] = {}
+    for parte in resultados:
+        if parte.periodo in reportes:
+            reportes[parte.periodo].combinar(parte)
+        else:
+            reportes[parte.periodo] = parte
+    for reporte in reportes.values():
+        for ids in reporte.planillas.values():
+            ids.sort()
+    return dict(sorted(reportes.items()))
@@ -0,0 +1,841 @@
+# controlador/repositorio.py
+"""
+Repositorio en memoria de las entidades.
+
+Con el backend "sqlite" (common.BACKEND) las tablas son almacen_sqlite.TablaSQLite,
+que tienen la misma interfaz pero consultan la base de datos directamente.
+
+Con el backend de archivos, mantiene los registros ya parseados de Estudiante, Curso y Matricula, indexados
+por su clave primaria, y solo vuelve a leer un archivo cuando cambia su firma en
+disco (mtime, tamaño o inodo). Las escrituras hechas a través de este módulo
+actualizan la caché en el lugar, así que la siguiente lectura no necesita volver
+a parsear el archivo. Si varios hilos piden a la vez un archivo que hay que
+leer, uno solo lo lee y los demás esperan y reutilizan esa carga.
+
+Cada escritura toma el bloqueo exclusivo del archivo y antes de escribir
+verifica que el archivo siga como estaba cuando se cargó la tabla. Si otro
+proceso lo cambió entretanto, la tabla se descarta de la caché y se lanza
+ConflictoConcurrente: repetir la operación la aplica sobre los datos nuevos en
+lugar de pisarlos.
+
+Con common.MATRICULAS_POR_PERIODO las matrículas se guardan en un archivo por
+período. matriculas_de_periodo() carga solo el de un período, y las escrituras
+sobre esa tabla solo escriben ese archivo y el manifiesto. matriculas() reúne
+todos los períodos; como cada escritura reescribe el manifiesto, su firma sirve
+de firma de la tabla completa. Una escritura sobre cualquiera de las dos tablas
+se aplica también sobre la otra si está en caché y al día.
+
+Con common.USAR_BINARIO las cargas de estudiantes, cursos y matrículas leen la
+instantánea binaria del archivo (almacen_binario) si está al día. Las
+escrituras que reescriben el archivo completo la regeneran; las altas, que solo
+agregan al final, la dejan vieja hasta la próxima carga, que la regenera.
+obtener_estudiante() y obtener_curso() buscan en ella por ID sin cargar la
+tabla, si no está ya en caché.
+"""
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from modelo.entidades import Estudiante, Curso, Matricula, a_dict
+# Se importa el módulo (y no las constantes) para leer las rutas en cada llamada
+from controlador import common, almacen_sqlite, almacen_binario, busqueda
+from controlador.bloqueo import bloquear, ConflictoConcurrente
+
+Firma = Tuple[int, int, int]
+
+
+def _clave_orden(valor: Any):
+    """Ordena los textos sin distinguir mayúsculas; los demás valores tal cual."""
+    return valor.casefold() if isinstance(valor, str) else valor
+
+
+class Tabla:
+    """Registros de un archivo indexados por su clave primaria.
+
+    Conserva el orden del archivo (los dict mantienen el orden de inserción),
+    así que guardar la tabla reescribe los registros en el mismo orden.
+
+    Opcionalmente mantiene índices inversos: cada índice tiene un nombre y una
+    función que retorna los valores bajo los que se indexa un registro (por
+    ejemplo, todos los cursos de una matrícula).
+
+    Si se indican `campos_texto`, buscar_texto busca en esos atributos con un
+    busqueda.IndiceTexto que se construye en la primera búsqueda y después se
+    actualiza junto con los demás índices.
+
+    Los observadores (agregar_observador) reciben (id, registro) después de cada
+    alta o modificación y (id, None) después de cada baja.
+    """
+
+    def __init__(self, clave: str, registros: List[Any],
+                 indices: Optional[Dict[str, Callable[[Any], Iterable[str]]]] = None,
+                 campos_texto: Sequence[str] = ()):
+        self.clave = clave
+        self.campos_texto = tuple(campos_texto)
+        self._indice_texto: Optional[busqueda.IndiceTexto] = None
+        self._observadores: List[Callable[[str, Optional[Any]], None]] = []
+        self._por_id: Dict[str, Any] = {}
+        self._funciones_indice = indices or {}
+        # nombre del índice -> valor -> {id: registro}
+        self._inversos: Dict[str, Dict[str, Dict[str, Any]]] = {n: {} for n in self._funciones_indice}
+        # nombre del índice -> id -> valores con los que se indexó el registro
+        self._valores_indexados: Dict[str, Dict[str, Tuple[str, ...]]] = {n: {} for n in self._funciones_indice}
+        # (atributo, descendente) -> IDs ordenados; se descarta con cualquier cambio
+        self._ordenados: Dict[Tuple[str, bool], List[str]] = {}
+        for registro in registros:
+            id_registro = getattr(registro, clave)
+            if id_registro in self._por_id:
+                print(f"Advertencia: {clave} duplicado '{id_registro}'. Se conserva el primero.")
+                continue
+            self._por_id[id_registro] = registro
+            self._indexar(id_registro, registro)
+
+    def __len__(self) -> int:
+        return len(self._por_id)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._por_id.values())
+
+    def __contains__(self, id_registro: str) -> bool:
+        return id_registro in self._por_id
+
+    def obtener(self, id_registro: str) -> Optional[Any]:
+        return self._por_id.get(id_registro)
+
+    def lista(self) -> List[Any]:
+        return list(self._por_id.values())
+
+    def buscar(self, indice: str, valor: str) -> List[Any]:
+        """Retorna los registros indexados bajo `valor` en el índice inverso indicado."""
+        return list(self._inversos[indice].get(valor, {}).values())
+
+    def pagina(self, inicio: int, cantidad: int, orden: Optional[str] = None,
+               descendente: bool = False) -> List[Any]:
+        """
+        Retorna `cantidad` registros a partir de la posición `inicio`, en el orden
+        del archivo o ordenados por el atributo `orden`. El orden se calcula una
+        vez y se reutiliza para las páginas siguientes mientras la tabla no cambie.
+        """
+        if orden is None:
+            registros = self._por_id.values()
+            if descendente:
+                registros = reversed(registros)
+            return list(islice(registros, inicio, inicio + cantidad))
+        ids = self._ordenados.get((orden, descendente))
+        if ids is None:
+            ids = sorted(self._por_id, key=lambda i: _clave_orden(getattr(self._por_id[i], orden)),
+                         reverse=descendente)
+            self._ordenados[(orden, descendente)] = ids
+        return [self._por_id[i] for i in ids[inicio:inicio + cantidad]]
+
+    def buscar_texto(self, consulta: str, campo: Optional[str] = None,
+                     solo_prefijo: bool = False) -> List[Any]:
+        """
+        Registros cuyo texto contiene la consulta (o tiene una palabra que empieza
+        con ella), sin distinguir mayúsculas ni tildes, ordenados por ese texto.
+        `campo` limita la búsqueda a uno de los campos de texto.
+        """
+        campos = self.campos_texto if campo is None else (campo,)
+        if not set(campos) <= set(self.campos_texto):
+            raise KeyError(campo)
+        if self._indice_texto is None:
+            # Se publica recién completo: otro hilo puede estar leyendo la misma tabla
+            indice = busqueda.IndiceTexto()
+            for id_registro, registro in self._por_id.items():
+                indice.agregar(id_registro, self._textos(registro))
+            self._indice_texto = indice
+        candidatos = self._indice_texto.candidatos(consulta, solo_prefijo) or ()
+        return busqueda.filtrar((self._por_id[i] for i in candidatos), campos, consulta, solo_prefijo, self.clave,
+                                campo is None)
+
+    def agregar_observador(self, funcion: Callable[[str, Optional[Any]], None]):
+        self._observadores.append(funcion)
+
+    def quitar_observador(self, funcion: Callable[[str, Optional[Any]], None]):
+        if funcion in self._observadores:
+            self._observadores.remove(funcion)
+
+    def _notificar(self, id_registro: str, registro: Optional[Any]):
+        for funcion in self._observadores:
+            funcion(id_registro, registro)
+
+    def _textos(self, registro: Any) -> List[str]:
+        return [getattr(registro, c) for c in self.campos_texto]
+
+    def agregar(self, registro: Any):
+        id_registro = getattr(registro, self.clave)
+        if id_registro in self._por_id:
+            raise ValueError(f"El {self.clave} '{id_registro}' ya existe.")
+        self._por_id[id_registro] = registro
+        self._indexar(id_registro, registro)
+        self._ordenados.clear()
+        self._notificar(id_registro, registro)
+
+    def agregar_varios(self, registros: List[Any]):
+        """Agrega varios registros; si alguno ya existe no agrega ninguno."""
+        ids = [getattr(r, self.clave) for r in registros]
+        for id_registro in ids:
+            if id_registro in self._por_id:
+                raise ValueError(f"El {self.clave} '{id_registro}' ya existe.")
+        if len(set(ids)) != len(ids):
+            raise ValueError(f"Hay valores de {self.clave} repetidos entre los registros a agregar.")
+        for registro in registros:
+            self.agregar(registro)
+
+    def quitar(self, id_registro: str) -> Any:
+        registro = self._por_id.pop(id_registro)
+        self._desindexar(id_registro)
+        self._ordenados.clear()
+        self._notificar(id_registro, None)
+        return registro
+
+    def actualizar(self, registro: Any):
+        """Reemplaza el registro con la misma clave (o lo re-indexa si se modificó en el lugar)."""
+        id_registro = getattr(registro, self.clave)
+        if id_registro not in self._por_id:
+            raise KeyError(id_registro)
+        self._desindexar(id_registro)
+        self._por_id[id_registro] = registro
+        self._indexar(id_registro, registro)
+        self._ordenados.clear()
+        self._notificar(id_registro, registro)
+
+    def _indexar(self, id_registro: str, registro: Any):
+        if self._indice_texto is not None:
+            self._indice_texto.agregar(id_registro, self._textos(registro))
+        for nombre, funcion in self._funciones_indice.items():
+            # dict.fromkeys descarta valores repetidos conservando el orden
+            valores = tuple(dict.fromkeys(funcion(registro)))
+            self._valores_indexados[nombre][id_registro] = valores
+            inverso = self._inversos[nombre]
+            for valor in valores:
+                inverso.setdefault(valor, {})[id_registro] = registro
+
+    def _desindexar(self, id_registro: str):
+        if self._indice_texto is not None:
+            self._indice_texto.quitar(id_registro)
+        for nombre in self._funciones_indice:
+            inverso = self._inversos[nombre]
+            for valor in self._valores_indexados[nombre].pop(id_registro, ()):
+                registros = inverso.get(valor)
+                if registros is not None:
+                    registros.pop(id_registro, None)
+                    if not registros:
+                        del inverso[valor]
+
+
+# --- Paginación ---
+
+@dataclass
+class Pagina:
+    registros: List[Any] = field(default_factory=list)
+    numero: int = 1  # Empieza en 1
+    tamano: int = 20
+    total: int = 0  # Registros en toda la tabla
+
+    @property
+    def total_paginas(self) -> int:
+        return max(1, -(-self.total // self.tamano))
+
+
+def paginar(tabla: Tabla, numero: int, tamano: int, orden: Optional[str] = None,
+            descendente: bool = False) -> Pagina:
+    """Obtiene la página `numero` de la tabla; un número fuera de rango se ajusta a la primera o la última."""
+    if tamano < 1:
+        raise ValueError("El tamaño de página debe ser mayor que cero.")
+    total = len(tabla)
+    numero = min(max(1, numero), max(1, -(-total // tamano)))
+    registros = tabla.pagina((numero - 1) * tamano, tamano, orden, descendente)
+    return Pagina(registros, numero, tamano, total)
+
+
+@dataclass
+class _EntradaCache:
+    firma: Any  # Firma del archivo, o (archivo, diario) si tiene diario
+    tabla: Tabla
+
+
+# Campos en los que busca Tabla.buscar_texto
+TEXTOS_ESTUDIANTES = ('nombre', 'carrera')
+TEXTOS_CURSOS = ('nombre_curso',)
+
+# Índices inversos de las matrículas, usados para las validaciones de
+# integridad referencial y los reportes por curso o por estudiante.
+INDICES_MATRICULAS: Dict[str, Callable[[Matricula], Iterable[str]]] = {
+    'id_estudiante': lambda m: (m.id_estudiante,),
+    'id_curso': lambda m: m.id_cursos,
+}
+
+# Caché por ruta de archivo
+_cache: Dict[str, _EntradaCache] = {}
+# Un bloqueo por ruta de archivo, para que una carga en curso no se repita en otros hilos
+_cargas: Dict[str, threading.Lock] = {}
+_bloqueo_cargas = threading.Lock()
+
+
+def _firma_archivo(archivo: str) -> Optional[Firma]:
+    """Retorna (mtime_ns, tamaño, inodo) del archivo, o None si no existe."""
+    try:
+        st = os.stat(archivo)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _firma(archivo: str):
+    """Firma del archivo junto con la de su diario de cambios, si lo tiene."""
+    firma = _firma_archivo(archivo)
+    firma_diario = _firma_archivo(common.ruta_diario(archivo))
+    return firma if firma_diario is None else (firma, firma_diario)
+
+
+def _obtener(archivo: str, crear_tabla: Callable[[], Tabla]) -> Tabla:
+    """Retorna la tabla en caché del archivo, recargándola si cambió en disco."""
+    entrada = _cache.get(archivo)
+    if entrada is not None and entrada.firma == _firma(archivo):
+        return entrada.tabla
+    with _bloqueo_cargas:
+        carga = _cargas.setdefault(archivo, threading.Lock())
+    # Con el bloqueo compartido ningún proceso escribe entre tomar la firma y leer
+    with carga, bloquear(archivo, compartido=True):
+        # Mientras se esperaba, otro hilo pudo haber cargado el archivo
+        firma = _firma(archivo)
+        entrada = _cache.get(archivo)
+        if entrada is None or entrada.firma != firma:
+            entrada = _EntradaCache(firma=firma, tabla=crear_tabla())
+            _cache[archivo] = entrada
+    return entrada.tabla
+
+
+def _actualizar(archivo: str, tabla: Tabla, escrito: bool):
+    """Refresca la caché después de escribir el archivo."""
+    if escrito:
+        _cache[archivo] = _EntradaCache(firma=_firma(archivo), tabla=tabla)
+    else:
+        # Si la escritura falló, lo que hay en disco manda
+        _cache.pop(archivo, None)
+
+
+@contextmanager
+def _escribiendo(archivo: str, tabla: Tabla):
+    """
+    Toma el bloqueo exclusivo del archivo para escribir la tabla, verificando
+    antes que nadie lo haya cambiado desde que se cargó (ConflictoConcurrente).
+    """
+    with bloquear(archivo):
+        entrada = _cache.get(archivo)
+        if entrada is not None and (entrada.tabla is not tabla or entrada.firma != _firma(archivo)):
+            _cache.pop(archivo, None)
+            raise ConflictoConcurrente(
+                f"El archivo {os.path.basename(archivo)} fue modificado por otro proceso. "
+                f"Vuelva a intentar la operación.")
+        yield
+
+
+# --- Instantáneas Binarias ---
+
+def _modelo_binario(archivo: str) -> Optional[type]:
+    """Entidad de la instantánea binaria del archivo, o None si no usa una."""
+    if not common.USAR_BINARIO or usa_sqlite():
+        return None
+    return {common.ESTUDIANTES_FILE: Estudiante, common.CURSOS_FILE: Curso,
+            common.MATRICULAS_FILE: Matricula}.get(archivo)
+
+
+def _regenerar_binario(archivo: str, registros: Iterable[Any]):
+    """Regenera la instantánea binaria del archivo (salvo con diario: no sería válida)."""
+    modelo = _modelo_binario(archivo)
+    if modelo is not None and not os.path.exists(common.ruta_diario(archivo)):
+        almacen_binario.guardar(archivo, registros, modelo)
+
+
+def _cargar(archivo: str, cargar: Callable[[], List[Any]]) -> List[Any]:
+    """
+    Registros del archivo: de su instantánea binaria si está al día; si no, los
+    lee del archivo y regenera la instantánea para la próxima carga.
+    """
+    modelo = _modelo_binario(archivo)
+    if modelo is None:
+        return cargar()
+    instantanea = almacen_binario.abrir(archivo, modelo)
+    if instantanea is not None:
+        with instantanea:
+            return list(instantanea)
+    registros = cargar()
+    _regenerar_binario(archivo, registros)
+    return registros
+
+
+def _obtener_por_id(archivo: str, tabla: Callable[[], Tabla], id_registro: str) -> Optional[Any]:
+    """Busca en la tabla si está en caché y al día; si no, en la instantánea binaria si la hay."""
+    modelo = _modelo_binario(archivo)
+    entrada = _cache.get(archivo)
+    if modelo is not None and (entrada is None or entrada.firma != _firma(archivo)):
+        with bloquear(archivo, compartido=True):
+            instantanea = almacen_binario.abrir(archivo, modelo)
+        # Un reemplazo posterior del .bin no afecta al mapa ya abierto
+        if instantanea is not None:
+            with instantanea:
+                return instantanea.obtener(id_registro)
+    return tabla().obtener(id_registro)
+
+
+def invalidar(archivo: Optional[str] = None):
+    """Descarta la caché de un archivo, o de todos si no se indica ninguno."""
+    if archivo is None:
+        _cache.clear()
+    else:
+        _cache.pop(archivo, None)
+
+
+# --- Lectura ---
+# Las tablas retornadas son las de la caché: quien las modifique debe guardarlas
+# con la función correspondiente para mantener disco y memoria sincronizados.
+
+def usa_sqlite() -> bool:
+    """Indica si las tablas son las del backend SQLite (common.BACKEND)."""
+    return common.BACKEND == "sqlite"
+
+
+def estudiantes() -> Tabla:
+    if usa_sqlite():
+        return almacen_sqlite.TablaSQLite(Estudiante)
+    archivo = common.ESTUDIANTES_FILE
+    return _obtener(archivo, lambda: Tabla('id_estudiante',
+                                          _cargar(archivo, lambda: common.cargar_datos_csv(archivo, Estudiante)),
+                                          campos_texto=TEXTOS_ESTUDIANTES))
+
+
+def obtener_estudiante(id_estudiante: str) -> Optional[Estudiante]:
+    """Busca un estudiante por ID; con instantánea binaria, sin cargar la tabla si no está en caché."""
+    if usa_sqlite():
+        return estudiantes().obtener(id_estudiante)
+    return _obtener_por_id(common.ESTUDIANTES_FILE, estudiantes, id_estudiante)
+
+
+def cursos() -> Tabla:
+    if usa_sqlite():
+        return almacen_sqlite.TablaSQLite(Curso)
+    archivo = common.CURSOS_FILE
+    return _obtener(archivo, lambda: Tabla('id_curso',
+                                          _cargar(archivo, lambda: common.cargar_datos_csv(archivo, Curso)),
+                                          campos_texto=TEXTOS_CURSOS))
+
+
+def obtener_curso(id_curso: str) -> Optional[Curso]:
+    """Busca un curso por ID; con instantánea binaria, sin cargar la tabla si no está en caché."""
+    if usa_sqlite():
+        return cursos().obtener(id_curso)
+    return _obtener_por_id(common.CURSOS_FILE, cursos, id_curso)
+
+
+def matriculas() -> Tabla:
+    """Matrículas con índices inversos 'id_estudiante' e 'id_curso'."""
+    if usa_sqlite():
+        return almacen_sqlite.TablaSQLite(Matricula)
+    if por_periodo():
+        return _obtener(common.ruta_manifiesto(),
+                        lambda: Tabla('id_matricula', list(_iterar_periodos()), INDICES_MATRICULAS))
+    archivo = common.MATRICULAS_FILE
+    return _obtener(archivo, lambda: Tabla('id_matricula', _cargar(archivo, lambda: common.cargar_datos_json(archivo)),
+                                           INDICES_MATRICULAS))
+
+
+def matriculas_de_periodo(periodo: str) -> Tabla:
+    """
+    Tabla que contiene las matrículas del período: en el modo por período, la
+    del archivo del período; si no, la de todas las matrículas.
+    """
+    if not por_periodo():
+        return matriculas()
+    archivo = common.ruta_periodo(periodo)
+    # Un período sin matrículas todavía no tiene archivo
+    return _obtener(archivo, lambda: Tabla('id_matricula', common.cargar_datos_json(archivo)
+                                           if os.path.exists(archivo) else [], INDICES_MATRICULAS))
+
+
+# --- Matrículas por Período ---
+
+def por_periodo() -> bool:
+    """Indica si las matrículas se guardan en un archivo por período."""
+    return common.MATRICULAS_POR_PERIODO and not usa_sqlite()
+
+
+def periodos_cerrados() -> Set[str]:
+    """Períodos cerrados, cuyas matrículas ya no se pueden modificar."""
+    if not por_periodo():
+        return set()
+    return {periodo for periodo, datos in common.leer_manifiesto().items() if datos.get("cerrado")}
+
+
+def cerrar_periodo(periodo: str):
+    """Cierra un período: desde entonces sus matrículas son de solo lectura."""
+    if not por_periodo():
+        raise ValueError("Solo se pueden cerrar períodos si las matrículas se guardan por período.")
+    archivo = common.ruta_manifiesto()
+    with bloquear(archivo):
+        previa = _firma(archivo)
+        periodos = common.leer_manifiesto()
+        if periodo not in periodos:
+            raise ValueError(f"El período '{periodo}' no tiene matrículas.")
+        periodos[periodo]["cerrado"] = True
+        escrito = common.guardar_manifiesto(periodos)
+        # La tabla de todas las matrículas no cambia: solo se actualiza su firma
+        entrada = _cache.pop(archivo, None)
+        if escrito and entrada is not None and entrada.firma == previa:
+            _cache[archivo] = _EntradaCache(firma=_firma(archivo), tabla=entrada.tabla)
+
+
+def _iterar_periodos(periodos: Optional[Iterable[str]] = None) -> Iterator[Matricula]:
+    for periodo in (common.leer_manifiesto() if periodos is None else periodos):
+        archivo = common.ruta_periodo(periodo)
+        if os.path.exists(archivo):
+            yield from common.iterar_datos_json(archivo)
+
+
+# --- Lectura en Flujo ---
+# Recorren los registros directamente desde el almacenamiento, sin pasar por la
+# caché ni cargarlos todos: pensadas para reportes sobre historiales grandes.
+
+def iterar_estudiantes() -> Iterator[Estudiante]:
+    if usa_sqlite():
+        return almacen_sqlite.iterar_datos_sqlite(Estudiante)
+    return common.iterar_datos_csv(common.ESTUDIANTES_FILE, Estudiante)
+
+
+def iterar_cursos() -> Iterator[Curso]:
+    if usa_sqlite():
+        return almacen_sqlite.iterar_datos_sqlite(Curso)
+    return common.iterar_datos_csv(common.CURSOS_FILE, Curso)
+
+
+def iterar_matriculas(periodos: Optional[Iterable[str]] = None) -> Iterator[Matricula]:
+    """Con `periodos`, solo las de esos períodos (en el modo por período, solo se leen sus archivos)."""
+    if por_periodo():
+        return _iterar_periodos(None if periodos is None else list(dict.fromkeys(periodos)))
+    if usa_sqlite():
+        datos = almacen_sqlite.iterar_datos_sqlite(Matricula)
+    else:
+        datos = common.iterar_datos_json(common.MATRICULAS_FILE)
+    if periodos is None:
+        return datos
+    periodos = set(periodos)
+    return (m for m in datos if m.periodo_academico in periodos)
+
+
+# --- Escritura ---
+# Las tablas de SQLite guardan cada cambio al hacerlo, así que para ellas las
+# funciones de escritura solo aplican el cambio sobre la tabla.
+
+def guardar_estudiantes(tabla: Tabla):
+    if isinstance(tabla, almacen_sqlite.TablaSQLite):
+        return
+    archivo = common.ESTUDIANTES_FILE
+    with _escribiendo(archivo, tabla):
+        escrito = common.guardar_datos_csv(archivo, tabla.lista(), common.ENCABEZADOS_ESTUDIANTES)
+        _actualizar(archivo, tabla, escrito)
+        if escrito:
+            _regenerar_binario(archivo, tabla)
+
+
+def guardar_cursos(tabla: Tabla):
+    if isinstance(tabla, almacen_sqlite.TablaSQLite):
+        return
+    archivo = common.CURSOS_FILE
+    with _escribiendo(archivo, tabla):
+        escrito = common.guardar_datos_csv(archivo, tabla.lista(), common.ENCABEZADOS_CURSOS)
+        _actualizar(archivo, tabla, escrito)
+        if escrito:
+            _regenerar_binario(archivo, tabla)
+
+
+def guardar_matriculas(tabla: Tabla):
+    """En el modo por período reescribe los períodos abiertos de la tabla; los cerrados no se tocan."""
+    if isinstance(tabla, almacen_sqlite.TablaSQLite):
+        return
+    if por_periodo():
+        _escribir_periodos(tabla, None)
+        return
+    with _escribiendo(common.MATRICULAS_FILE, tabla):
+        _reescribir_matriculas(tabla)
+
+
+def _reescribir_matriculas(tabla: Tabla):
+    """Reescribe el JSON de matrículas; quien llama ya tiene el bloqueo y verificó la tabla."""
+    archivo = common.MATRICULAS_FILE
+    escrito = common.guardar_datos_json(archivo, tabla.lista())
+    _actualizar(archivo, tabla, escrito)
+    if escrito:
+        _regenerar_binario(archivo, tabla)
+
+
+# --- Altas ---
+# Un alta solo agrega los registros al final del archivo, con una sola escritura
+# por llamada; las modificaciones y bajas reescriben el archivo completo.
+# Todas cambian la tabla en memoria recién dentro de _escribiendo, después de
+# verificar que nadie más escribió el archivo: si hay un conflicto, la tabla
+# (y sus observadores) no se enteran de un cambio que no se guardó.
+
+def insertar_estudiantes(tabla: Tabla, nuevos: List[Estudiante]):
+    if isinstance(tabla, almacen_sqlite.TablaSQLite):
+        tabla.agregar_varios(nuevos)
+        return
+    archivo = common.ESTUDIANTES_FILE
+    with _escribiendo(archivo, tabla):
+        tabla.agregar_varios(nuevos)
+        escrito = common.agregar_datos_csv(archivo, nuevos, common.ENCABEZADOS_ESTUDIANTES)
+        _actualizar(archivo, tabla, escrito)
+
+
+def insertar_cursos(tabla: Tabla, nuevos: List[Curso]):
+    if isinstance(tabla, almacen_sqlite.TablaSQLite):
+        tabla.agregar_varios(nuevos)
+        return
+    archivo = common.CURSOS_FILE
+    with _escribiendo(archivo, tabla):
+        tabla.agregar_varios(nuevos)
+        escrito = common.agregar_datos_csv(archivo, nuevos, common.ENCABEZADOS_CURSOS)
+        _actualizar(archivo, tabla, escrito)
+
+
+def insertar_matriculas(tabla: Tabla, nuevas: List[Matricula]):
+    if por_periodo():
+        _validar_periodos(tabla, {m.periodo_academico for m in nuevas})
+        _escribir_periodos(tabla, [(m.periodo_academico, m.id_matricula, m) for m in nuevas], solo_altas=True,
+                           aplicar=lambda: tabla.agregar_varios(nuevas))
+        return
+    if isinstance(tabla, almacen_sqlite.TablaSQLite):
+        tabla.agregar_varios(nuevas)
+        return
+    archivo = common.MATRICULAS_FILE
+    with _escribiendo(archivo, tabla):
+        tabla.agregar_varios(nuevas)
+        if common.MODO_DIARIO_MATRICULAS:
+            _registrar_en_diario(tabla, [{"op": "alta", "matricula": a_dict(m)} for m in nuevas])
+        elif common.agregar_datos_json(archivo, nuevas):
+            _actualizar(archivo, tabla, True)
+        else:
+            _reescribir_matriculas(tabla)
+
+
+def insertar_estudiante(tabla: Tabla, estudiante: Estudiante):
+    insertar_estudiantes(tabla, [estudiante])
+
+
+def insertar_curso(tabla: Tabla, curso: Curso):
+    insertar_cursos(tabla, [curso])
+
+
+def insertar_matricula(tabla: Tabla, matricula: Matricula):
+    insertar_matriculas(tabla, [matricula])
+
+
+# --- Modificaciones y Bajas de Estudiantes y Cursos ---
+
+def actualizar_estudiante(tabla: Tabla, estudiante: Estudiante):
+    if isinstance(tabla, almacen_sqlite.TablaSQLite):
+        tabla.actualizar(estudiante)
+        return
+    with _escribiendo(common.ESTUDIANTES_FILE, tabla):
+        tabla.actualizar(estudiante)
+        guardar_estudiantes(tabla)
+
+
+def eliminar_estudiante(tabla: Tabla, id_estudiante: str) -> Estudiante:
+    if isinstance(tabla, almacen_sqlite.TablaSQLite):
+        return tabla.quitar(id_estudiante)
+    with _escribiendo(common.ESTUDIANTES_FILE, tabla):
+        estudiante = tabla.quitar(id_estudiante)
+        guardar_estudiantes(tabla)
+    return estudiante
+
+
+def actualizar_curso(tabla: Tabla, curso: Curso):
+    if isinstance(tabla, almacen_sqlite.TablaSQLite):
+        tabla.actualizar(curso)
+        return
+    with _escribiendo(common.CURSOS_FILE, tabla):
+        tabla.actualizar(curso)
+        guardar_cursos(tabla)
+
+
+def eliminar_curso(tabla: Tabla, id_curso: str) -> Curso:
+    if isinstance(tabla, almacen_sqlite.TablaSQLite):
+        return tabla.quitar(id_curso)
+    with _escribiendo(common.CURSOS_FILE, tabla):
+        curso = tabla.quitar(id_curso)
+        guardar_cursos(tabla)
+    return curso
+
+
+# --- Modificaciones y Bajas de Matrículas ---
+# En modo diario se registran como líneas del diario; si no, reescriben el JSON.
+
+def actualizar_matricula(tabla: Tabla, matricula: Matricula):
+    if por_periodo():
+        anterior = tabla.obtener(matricula.id_matricula)
+        periodo_anterior = matricula.periodo_academico if anterior is None else anterior.periodo_academico
+        _validar_periodos(tabla, {periodo_anterior, matricula.periodo_academico})
+        cambios = [(matricula.periodo_academico, matricula.id_matricula, matricula)]
+        if periodo_anterior != matricula.periodo_academico:
+            cambios.insert(0, (periodo_anterior, matricula.id_matricula, None))
+        _escribir_periodos(tabla, cambios, aplicar=lambda: tabla.actualizar(matricula))
+        return
+    if isinstance(tabla, almacen_sqlite.TablaSQLite):
+        tabla.actualizar(matricula)
+        return
+    with _escribiendo(common.MATRICULAS_FILE, tabla):
+        tabla.actualizar(matricula)
+        if common.MODO_DIARIO_MATRICULAS:
+            _registrar_en_diario(tabla, [{"op": "modificacion", "matricula": a_dict(matricula)}])
+        else:
+            _reescribir_matriculas(tabla)
+
+
+def eliminar_matricula(tabla: Tabla, id_matricula: str) -> Matricula:
+    if por_periodo():
+        matricula = tabla.obtener(id_matricula)
+        if matricula is None:
+            raise KeyError(id_matricula)
+        _validar_periodos(tabla, {matricula.periodo_academico})
+        _escribir_periodos(tabla, [(matricula.periodo_academico, id_matricula, None)],
+                           aplicar=lambda: tabla.quitar(id_matricula))
+        return matricula
+    if isinstance(tabla, almacen_sqlite.TablaSQLite):
+        return tabla.quitar(id_matricula)
+    with _escribiendo(common.MATRICULAS_FILE, tabla):
+        matricula = tabla.quitar(id_matricula)
+        if common.MODO_DIARIO_MATRICULAS:
+            _registrar_en_diario(tabla, [{"op": "baja", "id_matricula": id_matricula}])
+        else:
+            _reescribir_matriculas(tabla)
+    return matricula
+
+
+def _registrar_en_diario(tabla: Tabla, operaciones: List[dict]):
+    """
+    Registra las operaciones en el diario y compacta si el diario creció
+    demasiado; quien llama ya tiene el bloqueo y aplicó los cambios a la tabla.
+    """
+    archivo = common.MATRICULAS_FILE
+    if not common.registrar_en_diario(archivo, operaciones):
+        # La tabla en memoria tiene un cambio que no quedó en disco: se descarta
+        _actualizar(archivo, tabla, False)
+        raise OSError(f"No se pudo registrar el cambio en el diario de {os.path.basename(archivo)}.")
+    if common.diario_supera_umbral(archivo):
+        # La tabla en memoria ya tiene todos los cambios: basta con reescribir el JSON
+        _reescribir_matriculas(tabla)
+    else:
+        _actualizar(archivo, tabla, True)
+
+
+# --- Escritura de Matrículas por Período ---
+# Cambio de una matrícula: (período, id_matricula, matrícula o None si es una baja)
+Cambio = Tuple[str, str, Optional[Matricula]]
+
+
+def _archivo_de_tabla(tabla: Tabla) -> str:
+    """Archivo de la caché al que corresponde la tabla (el manifiesto o el de un período)."""
+    for archivo, entrada in list(_cache.items()):
+        if entrada.tabla is tabla:
+            return archivo
+    raise ConflictoConcurrente("La tabla de matrículas ya no está vigente. Vuelva a intentar la operación.")
+
+
+def _periodo_de_archivo(archivo: str) -> Optional[str]:
+    """Período del archivo, o None si es el manifiesto (la tabla de todos los períodos)."""
+    if archivo == common.ruta_manifiesto():
+        return None
+    return os.path.basename(archivo)[:-len(".jsonl")]
+
+
+def _validar_periodos(tabla: Tabla, periodos: Set[str]):
+    """Antes de tocar la tabla: los períodos deben estar abiertos y, si la tabla es de un período, ser ese."""
+    periodo_tabla = _periodo_de_archivo(_archivo_de_tabla(tabla))
+    cerrados = periodos_cerrados()
+    for periodo in sorted(periodos):
+        if periodo_tabla is not None and periodo != periodo_tabla:
+            raise ValueError(f"La matrícula es del período '{periodo}' y la tabla del período '{periodo_tabla}'.")
+        if periodo in cerrados:
+            raise ValueError(f"El período '{periodo}' está cerrado: sus matrículas son de solo lectura.")
+
+
+def _aplicar(tabla: Tabla, id_matricula: str, matricula: Optional[Matricula]):
+    if matricula is None:
+        if id_matricula in tabla:
+            tabla.quitar(id_matricula)
+    elif id_matricula in tabla:
+        tabla.actualizar(matricula)
+    else:
+        tabla.agregar(matricula)
+
+
+def _escribir_periodos(tabla: Tabla, cambios: Optional[List[Cambio]], solo_altas: bool = False,
+                       aplicar: Optional[Callable[[], Any]] = None):
+    """
+    Escribe los archivos de los períodos tocados por los cambios y el
+    manifiesto. `aplicar` aplica los cambios sobre la tabla, una vez tomados
+    los bloqueos y verificado que no hay conflicto. Las altas se agregan al
+    final del archivo; lo demás reescribe el archivo del período. Con
+    cambios=None reescribe todos los períodos abiertos de la tabla.
+
+    Todo ocurre bajo el bloqueo exclusivo del manifiesto, así que las
+    escrituras de matrículas de distintos procesos se ejecutan de a una.
+    """
+    manifiesto = common.ruta_manifiesto()
+    archivo_tabla = _archivo_de_tabla(tabla)
+    periodo_tabla = _periodo_de_archivo(archivo_tabla)
+    # El bloqueo del manifiesto es un archivo dentro del directorio
+    os.makedirs(common.MATRICULAS_DIR, exist_ok=True)
+    with bloquear(manifiesto), _escribiendo(archivo_tabla, tabla):
+        periodos = common.leer_manifiesto()
+        if cambios is not None:
+            tocados = list(dict.fromkeys(periodo for periodo, _, _ in cambios))
+            for periodo in tocados:
+                if periodos.get(periodo, {}).get("cerrado"):
+                    # Otro proceso cerró el período después de la validación
+                    _cache.pop(archivo_tabla, None)
+                    raise ValueError(f"El período '{periodo}' está cerrado: sus matrículas son de solo lectura.")
+        if aplicar is not None:
+            aplicar()
+        contenidos: Optional[Dict[str, List[Matricula]]] = None
+        if cambios is None or not solo_altas:
+            contenidos = {}
+            for m in tabla:
+                contenidos.setdefault(m.periodo_academico, []).append(m)
+        if cambios is None:
+            tocados = [periodo_tabla] if periodo_tabla is not None else list(dict.fromkeys([*periodos, *contenidos]))
+            tocados = [p for p in tocados if not periodos.get(p, {}).get("cerrado")]
+
+        # Tablas en caché que se mantienen al día aplicándoles los mismos cambios
+        espejos = [a for a in [manifiesto, *map(common.ruta_periodo, tocados)] if a != archivo_tabla]
+        previas = {archivo: _firma(archivo) for archivo in espejos}
+
+        escrito = True
+        for periodo in tocados:
+            archivo = common.ruta_periodo(periodo)
+            if solo_altas:
+                nuevas = [m for p, _, m in cambios if p == periodo]
+                ok = common.agregar_datos_json(archivo, nuevas)
+                cantidad = periodos.get(periodo, {}).get("matriculas", 0) + len(nuevas)
+            else:
+                contenido = contenidos.get(periodo, [])
+                ok = common.guardar_datos_json(archivo, contenido)
+                cantidad = len(contenido)
+            if ok:
+                periodos[periodo] = {"archivo": os.path.basename(archivo), "matriculas": cantidad, "cerrado": False}
+            escrito = escrito and ok
+        escrito = common.guardar_manifiesto(periodos) and escrito
+        _actualizar(archivo_tabla, tabla, escrito)
+
+        for archivo, previa in previas.items():
+            entrada = _cache.pop(archivo, None)
+            if entrada is None or not escrito or cambios is None or entrada.firma != previa:
+                continue
+            periodo_espejo = _periodo_de_archivo(archivo)
+            for periodo, id_matricula, matricula in cambios:
+                if periodo_espejo is None or periodo == periodo_espejo:
+                    _aplicar(entrada.tabla, id_matricula, matricula)
+            _cache[archivo] = _EntradaCache(firma=_firma(archivo), tabla=entrada.tabla)
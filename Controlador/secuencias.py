@@ -0,0 +1,73 @@
+# controlador/secuencias.py
+"""
+Secuencia persistente de IDs de matrícula.
+
+El último número asignado se guarda en '<matriculas>.seq' y cada reserva lo
+lee y actualiza bajo un bloqueo entre procesos, así que generar un ID no requiere
+cargar las matrículas y dos procesos nunca reciben el mismo. La primera vez que
+se usa (sin archivo de secuencia) se inicializa con el mayor ID existente.
+"""
+import os
+import re
+from typing import List
+from controlador import common, repositorio
+from controlador.bloqueo import bloquear
+
+FORMATO_ID_MATRICULA = "M{:03d}"
+_PATRON_ID_MATRICULA = re.compile(r"M(\d+)$")
+
+
+def ruta_secuencia() -> str:
+    if repositorio.por_periodo():
+        return os.path.join(common.MATRICULAS_DIR, "matriculas.seq")
+    return common.MATRICULAS_FILE + ".seq"
+
+
+def _ultimo_id_existente() -> int:
+    """Mayor número entre los IDs de matrícula guardados (0 si no hay)."""
+    numeros = [int(c.group(1)) for m in repositorio.matriculas()
+               if (c := _PATRON_ID_MATRICULA.match(m.id_matricula))]
+    return max(numeros, default=0)
+
+
+def _leer_ultimo(ruta: str) -> int:
+    try:
+        with open(ruta, mode='r', encoding='utf-8') as f:
+            return int(f.read().strip())
+    except FileNotFoundError:
+        return _ultimo_id_existente()
+    except ValueError:
+        print(f"Advertencia: Secuencia {ruta} corrupta. Se reinicia desde las matrículas existentes.")
+        return _ultimo_id_existente()
+
+
+def _escribir_ultimo(ruta: str, ultimo: int):
+    # Se escribe aparte y se renombra para que una caída no deje el archivo vacío
+    temporal = ruta + ".tmp"
+    with open(temporal, mode='w', encoding='utf-8') as f:
+        f.write(str(ultimo))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, ruta)
+
+
+def reservar_ids_matricula(cantidad: int = 1) -> List[str]:
+    """Reserva un bloque de `cantidad` IDs consecutivos con una sola actualización de la secuencia."""
+    ruta = ruta_secuencia()
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with bloquear(ruta):
+        ultimo = _leer_ultimo(ruta)
+        _escribir_ultimo(ruta, ultimo + cantidad)
+    return [FORMATO_ID_MATRICULA.format(n) for n in range(ultimo + 1, ultimo + cantidad + 1)]
+
+
+def siguiente_id_matricula() -> str:
+    return reservar_ids_matricula(1)[0]
+
+
+def proximos_ids_matricula(cantidad: int) -> List[str]:
+    """IDs que se asignarían a continuación, sin reservarlos (para validaciones)."""
+    ruta = ruta_secuencia()
+    with bloquear(ruta):
+        ultimo = _leer_ultimo(ruta)
+    return [FORMATO_ID_MATRICULA.format(n) for n in range(ultimo + 1, ultimo + cantidad + 1)]
@@ -1,23 +1,56 @@
 # modelo/entidades.py
+import os
+import sys
 from dataclasses import dataclass, field
-from typing import List
+from typing import Sequence
 
-@dataclass
+# En modo compacto Matricula.id_cursos es una tupla en lugar de una lista: ocupa
+# menos memoria, pero ya no se puede modificar en el lugar (se reemplaza completa).
+MODO_COMPACTO = os.environ.get("MATRICULAS_COMPACTO") == "1"
+
+
+def _intern(valor):
+    """Comparte una sola copia de los textos que se repiten entre registros (carreras, períodos, IDs)."""
+    return sys.intern(valor) if type(valor) is str else valor
+
+
+# Las entidades usan __slots__ (slots=True): sin __dict__ por instancia ocupan
+# bastante menos memoria y los atributos se usan igual que antes.
+
+@dataclass(slots=True)
 class Estudiante:
     id_estudiante: str
     nombre: str
     carrera: str
 
-@dataclass
+    def __post_init__(self):
+        self.id_estudiante = _intern(self.id_estudiante)
+        self.carrera = _intern(self.carrera)
+
+@dataclass(slots=True)
 class Curso:
     id_curso: str
     nombre_curso: str
     creditos: int  # Los créditos son numéricos
 
-@dataclass
+    def __post_init__(self):
+        self.id_curso = _intern(self.id_curso)
+
+@dataclass(slots=True)
 class Matricula:
     id_matricula: str
     id_estudiante: str
     periodo_academico: str
     # Usamos field para inicializar la lista vacía si no se provee
-    id_cursos: List[str] = field(default_factory=list)
\ No newline at end of file
+    id_cursos: Sequence[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.id_estudiante = _intern(self.id_estudiante)
+        self.periodo_academico = _intern(self.periodo_academico)
+        cursos = [_intern(id_c) for id_c in self.id_cursos]
+        self.id_cursos = tuple(cursos) if MODO_COMPACTO else cursos
+
+
+def a_dict(entidad) -> dict:
+    """Campos de una entidad como dict (las entidades no tienen __dict__)."""
+    return {campo: getattr(entidad, campo) for campo in entidad.__slots__}
@@ -0,0 +1,92 @@
+# benchmarks/arranque.py
+"""
+Mide el arranque en frío de los subcomandos de main.py: cada medición es un
+proceso nuevo de Python, desde que se lanza hasta que termina de escribir el
+resultado. Falla (código 1) si la mediana de algún comando supera
+main.PRESUPUESTO_ARRANQUE_S.
+
+Los comandos solo leen los archivos de data/ (o los de --datos).
+
+Uso: python benchmarks/arranque.py [--repeticiones 7] [--datos DIRECTORIO]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+import main as principal  # noqa: E402
+
+COMANDOS: List[List[str]] = [
+    ["--help"],
+    ["cursos", "--formato", "json"],
+    ["estudiantes", "--orden", "nombre", "--formato", "csv"],
+    ["creditos", "--formato", "json"],
+]
+
+# Módulos que un subcomando no debe cargar
+PESADOS = ("rich", "menu", "vista")
+
+
+def _entorno(datos: Optional[str]) -> Optional[Dict[str, str]]:
+    """Entorno del proceso hijo: con `datos`, common usa ese directorio en lugar de data/."""
+    if datos is None:
+        return None
+    return {**os.environ, "MATRICULAS_DATOS": datos}
+
+
+def medir(argv: Sequence[str], repeticiones: int = 7, datos: Optional[str] = None) -> List[float]:
+    """Segundos de cada ejecución de `python -m main argv` en un proceso nuevo."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "main", *argv], cwd=RAIZ, env=_entorno(datos), check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def modulos_cargados(argv: Sequence[str], datos: Optional[str] = None) -> List[str]:
+    """Módulos cargados después de ejecutar el subcomando en un proceso nuevo."""
+    codigo = ("import contextlib, io, json, sys, main\n"
+              "with contextlib.redirect_stdout(io.StringIO()):\n"
+              f"    main.ejecutar_comando({list(argv)!r})\n"
+              "print(json.dumps(sorted(sys.modules)))")
+    resultado = subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, env=_entorno(datos), check=True,
+                               capture_output=True, text=True)
+    return json.loads(resultado.stdout)
+
+
+def pesados_cargados(argv: Sequence[str], datos: Optional[str] = None) -> List[str]:
+    return [m for m in modulos_cargados(argv, datos) if m.split('.')[0] in PESADOS]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el arranque en frío de los subcomandos de main.py.")
+    parser.add_argument("--repeticiones", type=int, default=7)
+    parser.add_argument("--datos", help="directorio de datos en lugar de data/")
+    args = parser.parse_args()
+
+    presupuesto = principal.PRESUPUESTO_ARRANQUE_S
+    excedidos: Dict[str, float] = {}
+    print(f"Presupuesto: {presupuesto * 1000:.0f} ms")
+    for argv in COMANDOS:
+        comando = " ".join(argv)
+        mediana = statistics.median(medir(argv, max(1, args.repeticiones), args.datos))
+        pesados = pesados_cargados(argv, args.datos) if argv != ["--help"] else []
+        print(f"{comando:<50} mediana {mediana * 1000:8.1f} ms"
+              + (f"   carga {', '.join(pesados)}" if pesados else ""))
+        if mediana > presupuesto:
+            excedidos[comando] = mediana
+    if excedidos:
+        print(f"{len(excedidos)} comando(s) sobre el presupuesto.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# benchmarks/cierre.py
+"""
+Mide reportes_ctrl.reportes_por_periodo (cierre de todos los períodos) con
+distinta cantidad de procesos, sobre datos generados con benchmarks/generador.py,
+e informa la mediana, las matrículas por segundo y la aceleración respecto de
+un proceso.
+
+Uso: python benchmarks/cierre.py [--escala 100k] [--procesos 1 2 4 8] [--repeticiones 3]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from controlador import common, repositorio, reportes_ctrl  # noqa: E402
+from benchmarks import generador, ejecutar  # noqa: E402
+
+
+def medir(estudiantes: int, procesos: Sequence[int], repeticiones: int = 3,
+          semilla: int = 42) -> List[Dict[str, Any]]:
+    """Mediana de segundos de un cierre completo para cada cantidad de procesos."""
+    originales = {nombre: getattr(common, nombre) for nombre in ejecutar._CONFIGURACION}
+    resultados = []
+    with tempfile.TemporaryDirectory(prefix="benchmark_") as directorio:
+        generador.generar(directorio, estudiantes, semilla)
+        ejecutar._apuntar_a(directorio)
+        try:
+            matriculas = sum(1 for _ in repositorio.iterar_matriculas())
+            for cantidad in procesos:
+                tiempos = []
+                for _ in range(repeticiones):
+                    inicio = time.perf_counter()
+                    reportes_ctrl.reportes_por_periodo(procesos=cantidad)
+                    tiempos.append(time.perf_counter() - inicio)
+                mediana = statistics.median(tiempos)
+                resultados.append({"procesos": cantidad, "mediana_s": mediana,
+                                   "matriculas_por_s": matriculas / mediana if mediana else 0.0})
+        finally:
+            ejecutar._restaurar(originales)
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el cierre de períodos con distinta cantidad de procesos.")
+    parser.add_argument("--escala", type=generador.escala, default=100_000)
+    parser.add_argument("--procesos", nargs="+", type=int,
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    resultados = medir(args.escala, args.procesos, max(1, args.repeticiones))
+    base = resultados[0]["mediana_s"]
+    print(f"Escala: {args.escala} estudiantes, {os.cpu_count()} CPU")
+    for r in resultados:
+        print(f"{r['procesos']:>4} procesos   mediana {r['mediana_s'] * 1000:10.1f} ms   "
+              f"{r['matriculas_por_s']:12.0f} matrículas/s   x{base / r['mediana_s']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
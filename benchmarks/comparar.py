@@ -0,0 +1,65 @@
+# benchmarks/comparar.py
+"""
+Compara dos resultados de benchmarks/ejecutar.py y lista las funciones que se
+volvieron más lentas.
+
+Una función es una regresión si su mediana (o su tiempo en frío) creció más que
+el umbral y el tiempo base supera el mínimo, para no reportar ruido de
+mediciones de microsegundos. Termina con código 1 si hay regresiones.
+
+Uso: python benchmarks/comparar.py base.json nuevo.json [--umbral 1.25] [--minimo-ms 1]
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Tuple
+
+
+def _por_clave(informe: dict) -> Dict[Tuple[int, str], dict]:
+    return {(r["escala"], r["funcion"]): r for r in informe["resultados"]}
+
+
+def regresiones(base: dict, nuevo: dict, umbral: float = 1.25, minimo_s: float = 0.001) -> List[str]:
+    """Descripción de cada medición que empeoró más que el umbral."""
+    encontradas = []
+    actuales = _por_clave(nuevo)
+    for clave, anterior in sorted(_por_clave(base).items()):
+        actual = actuales.get(clave)
+        if actual is None:
+            continue
+        for medida in ("mediana_s", "frio_s"):
+            if anterior[medida] >= minimo_s and actual[medida] > anterior[medida] * umbral:
+                encontradas.append(
+                    f"{clave[0]:>9} {clave[1]:<55} {medida[:-2]:<7} "
+                    f"{anterior[medida] * 1000:10.2f} ms -> {actual[medida] * 1000:10.2f} ms "
+                    f"(x{actual[medida] / anterior[medida]:.2f})")
+    return encontradas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara dos resultados de benchmarks.")
+    parser.add_argument("base")
+    parser.add_argument("nuevo")
+    parser.add_argument("--umbral", type=float, default=1.25, help="factor de tiempo que cuenta como regresión")
+    parser.add_argument("--minimo-ms", type=float, default=1.0, help="ignorar mediciones base más rápidas que esto")
+    args = parser.parse_args()
+
+    with open(args.base, encoding='utf-8') as f:
+        base = json.load(f)
+    with open(args.nuevo, encoding='utf-8') as f:
+        nuevo = json.load(f)
+
+    print(f"Base:  {base.get('commit', '')[:12]} ({base.get('fecha', '')})")
+    print(f"Nuevo: {nuevo.get('commit', '')[:12]} ({nuevo.get('fecha', '')})")
+    encontradas = regresiones(base, nuevo, args.umbral, args.minimo_ms / 1000)
+    if not encontradas:
+        print("Sin regresiones.")
+        return
+    print(f"{len(encontradas)} regresión(es):")
+    for linea in encontradas:
+        print(linea)
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+# benchmarks/ejecutar.py
+"""
+Mide cada función pública de estudiantes_ctrl, cursos_ctrl, matriculas_ctrl y
+common sobre datos generados con benchmarks/generador.py, y guarda los tiempos
+en JSON para comparar entre commits (benchmarks/comparar.py).
+
+Cada función se ejecuta `repeticiones` veces: la primera con la caché del
+repositorio vacía (tiempo en frío) y las demás con la caché cargada. Las
+funciones públicas que no tienen un caso en CASOS se listan en "sin_caso".
+
+Con --por-periodo las matrículas generadas se reparten en archivos por
+período (common.MATRICULAS_POR_PERIODO) antes de medir. Con --binario las
+cargas usan las instantáneas binarias (common.USAR_BINARIO).
+
+Uso: python benchmarks/ejecutar.py [--escalas 1k 10k] [--repeticiones 5] [--por-periodo] [--binario]
+                                   [--salida resultados.json]
+"""
+import argparse
+import inspect
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modelo.entidades import Estudiante, Curso, Matricula  # noqa: E402
+from controlador import estudiantes_ctrl, cursos_ctrl, matriculas_ctrl, common, repositorio  # noqa: E402
+from benchmarks import generador  # noqa: E402
+
+MODULOS = (estudiantes_ctrl, cursos_ctrl, matriculas_ctrl, common)
+
+
+class Contexto:
+    """Datos de una escala: rutas, IDs existentes y un contador para IDs nuevos."""
+
+    def __init__(self, directorio: str, estudiantes: int):
+        self.directorio = directorio
+        self.estudiantes = estudiantes
+        self.cursos = generador.cantidad_cursos(estudiantes)
+        self._contador = 0
+
+    def id_estudiante(self, i: Optional[int] = None) -> str:
+        return f"E{(self.estudiantes // 2 if i is None else i):07d}"
+
+    def id_curso(self, i: int = 0) -> str:
+        return f"C{i:05d}"
+
+    def nuevo_id(self, prefijo: str) -> str:
+        self._contador += 1
+        return f"{prefijo}B{self._contador:06d}"
+
+    def ruta(self, nombre: str) -> str:
+        return os.path.join(self.directorio, nombre)
+
+    def copia(self, origen: str, nombre: str) -> str:
+        """
+        Copia un archivo de datos para que las funciones de escritura de common no
+        modifiquen el original. Descarta el diario que haya dejado otro caso en la copia.
+        """
+        destino = self.ruta(nombre)
+        shutil.copyfile(origen, destino)
+        if os.path.exists(common.ruta_diario(destino)):
+            os.remove(common.ruta_diario(destino))
+        return destino
+
+
+# --- Casos ---
+# Cada caso prepara lo que necesite (fuera de la medición) y retorna la llamada a medir.
+
+Caso = Callable[[Contexto], Callable[[], Any]]
+
+
+def _consumir(iterador) -> int:
+    return sum(1 for _ in iterador)
+
+
+def _crear_estudiante(ctx: Contexto):
+    return lambda: estudiantes_ctrl.crear_estudiante(ctx.nuevo_id("E"), "Benchmark Pérez", "Medicina")
+
+
+def _eliminar_estudiante(ctx: Contexto):
+    id_est = ctx.nuevo_id("E")
+    estudiantes_ctrl.crear_estudiante(id_est, "Temporal", "Medicina")
+    return lambda: estudiantes_ctrl.eliminar_estudiante(id_est)
+
+
+def _crear_curso(ctx: Contexto):
+    return lambda: cursos_ctrl.crear_curso(ctx.nuevo_id("C"), "Curso Benchmark", 3)
+
+
+def _eliminar_curso(ctx: Contexto):
+    id_curso = ctx.nuevo_id("C")
+    cursos_ctrl.crear_curso(id_curso, "Temporal", 3)
+    return lambda: cursos_ctrl.eliminar_curso(id_curso)
+
+
+def _matricular_lote(ctx: Contexto):
+    solicitudes = [(ctx.id_estudiante(i), [ctx.id_curso(0), ctx.id_curso(1)], "2026-01")
+                   for i in range(min(100, ctx.estudiantes))]
+    return lambda: matriculas_ctrl.matricular_estudiantes_lote(solicitudes)
+
+
+def _guardar_datos_csv(ctx: Contexto):
+    estudiantes = common.cargar_datos_csv(common.ESTUDIANTES_FILE, Estudiante)
+    archivo = ctx.ruta("copia_estudiantes.csv")
+    return lambda: common.guardar_datos_csv(archivo, estudiantes, common.ENCABEZADOS_ESTUDIANTES)
+
+
+def _agregar_datos_csv(ctx: Contexto):
+    archivo = ctx.copia(common.CURSOS_FILE, "copia_cursos.csv")
+    nuevo = Curso(ctx.nuevo_id("C"), "Agregado", 3)
+    return lambda: common.agregar_datos_csv(archivo, [nuevo], common.ENCABEZADOS_CURSOS)
+
+
+def _agregar_datos_json(ctx: Contexto):
+    archivo = ctx.copia(common.MATRICULAS_FILE, "copia_matriculas.json")
+    nueva = Matricula(ctx.nuevo_id("M"), ctx.id_estudiante(), "2026-01", [ctx.id_curso()])
+    return lambda: common.agregar_datos_json(archivo, [nueva])
+
+
+def _registrar_en_diario(ctx: Contexto):
+    archivo = ctx.copia(common.MATRICULAS_FILE, "copia_registrar_diario.json")
+    operacion = {"op": "alta", "matricula": {"id_matricula": ctx.nuevo_id("M"), "id_estudiante": ctx.id_estudiante(),
+                                             "periodo_academico": "2026-01", "id_cursos": [ctx.id_curso()]}}
+    return lambda: common.registrar_en_diario(archivo, [operacion])
+
+
+def _guardar_manifiesto(ctx: Contexto):
+    periodos = common.leer_manifiesto()
+    return lambda: common.guardar_manifiesto(periodos)
+
+
+def _compactar_diario(ctx: Contexto):
+    archivo = ctx.copia(common.MATRICULAS_FILE, "copia_compactar_diario.json")
+    common.registrar_en_diario(archivo, [{"op": "baja", "id_matricula": "M001"}])
+    return lambda: common.compactar_diario(archivo)
+
+
+CASOS: Dict[str, Caso] = {
+    # estudiantes_ctrl
+    "estudiantes_ctrl.obtener_estudiantes": lambda ctx: estudiantes_ctrl.obtener_estudiantes,
+    "estudiantes_ctrl.obtener_pagina_estudiantes":
+        lambda ctx: lambda: estudiantes_ctrl.obtener_pagina_estudiantes(10, 20, orden="nombre"),
+    "estudiantes_ctrl.buscar_estudiantes": lambda ctx: lambda: estudiantes_ctrl.buscar_estudiantes("gonzalez ram"),
+    "estudiantes_ctrl.obtener_estudiante_por_id":
+        lambda ctx: lambda: estudiantes_ctrl.obtener_estudiante_por_id(ctx.id_estudiante()),
+    "estudiantes_ctrl.crear_estudiante": _crear_estudiante,
+    "estudiantes_ctrl.actualizar_estudiante":
+        lambda ctx: lambda: estudiantes_ctrl.actualizar_estudiante(ctx.id_estudiante(), "Nombre Actualizado", "Física"),
+    "estudiantes_ctrl.eliminar_estudiante": _eliminar_estudiante,
+    # cursos_ctrl
+    "cursos_ctrl.obtener_cursos": lambda ctx: cursos_ctrl.obtener_cursos,
+    "cursos_ctrl.obtener_pagina_cursos": lambda ctx: lambda: cursos_ctrl.obtener_pagina_cursos(2, 20, orden="creditos"),
+    "cursos_ctrl.buscar_cursos": lambda ctx: lambda: cursos_ctrl.buscar_cursos("calculo"),
+    "cursos_ctrl.obtener_curso_por_id": lambda ctx: lambda: cursos_ctrl.obtener_curso_por_id(ctx.id_curso()),
+    "cursos_ctrl.crear_curso": _crear_curso,
+    "cursos_ctrl.actualizar_curso": lambda ctx: lambda: cursos_ctrl.actualizar_curso(ctx.id_curso(), "Cálculo 1", 4),
+    "cursos_ctrl.eliminar_curso": _eliminar_curso,
+    # matriculas_ctrl
+    "matriculas_ctrl.matricular_estudiante":
+        lambda ctx: lambda: matriculas_ctrl.matricular_estudiante(ctx.id_estudiante(), [ctx.id_curso()], "2026-01"),
+    "matriculas_ctrl.matricular_estudiantes_lote": _matricular_lote,
+    "matriculas_ctrl.obtener_matriculas_por_estudiante":
+        lambda ctx: lambda: matriculas_ctrl.obtener_matriculas_por_estudiante(ctx.id_estudiante()),
+    "matriculas_ctrl.obtener_estudiantes_por_curso":
+        lambda ctx: lambda: matriculas_ctrl.obtener_estudiantes_por_curso(ctx.id_curso()),
+    "matriculas_ctrl.obtener_pagina_estudiantes_por_curso":
+        lambda ctx: lambda: matriculas_ctrl.obtener_pagina_estudiantes_por_curso(ctx.id_curso(), 1, 20, "nombre"),
+    "matriculas_ctrl.calcular_creditos_estudiante":
+        lambda ctx: lambda: matriculas_ctrl.calcular_creditos_estudiante(ctx.id_estudiante(), "2023-01"),
+    # common
+    "common.cargar_datos_csv": lambda ctx: lambda: common.cargar_datos_csv(common.ESTUDIANTES_FILE, Estudiante),
+    "common.iterar_datos_csv":
+        lambda ctx: lambda: _consumir(common.iterar_datos_csv(common.ESTUDIANTES_FILE, Estudiante)),
+    "common.guardar_datos_csv": _guardar_datos_csv,
+    "common.agregar_datos_csv": _agregar_datos_csv,
+    "common.cargar_datos_json": lambda ctx: lambda: common.cargar_datos_json(common.MATRICULAS_FILE),
+    "common.iterar_datos_json": lambda ctx: lambda: _consumir(common.iterar_datos_json(common.MATRICULAS_FILE)),
+    "common.guardar_datos_json": lambda ctx: lambda: common.guardar_datos_json(
+        ctx.ruta("copia_matriculas.json"), common.iterar_datos_json(common.MATRICULAS_FILE)),
+    "common.agregar_datos_json": _agregar_datos_json,
+    "common.convertir_matriculas": lambda ctx: lambda: common.convertir_matriculas(
+        common.MATRICULAS_FILE, ctx.ruta("copia_matriculas.jsonl")),
+    "common.ruta_diario": lambda ctx: lambda: common.ruta_diario(common.MATRICULAS_FILE),
+    "common.registrar_en_diario": _registrar_en_diario,
+    "common.diario_supera_umbral": lambda ctx: lambda: common.diario_supera_umbral(common.MATRICULAS_FILE),
+    "common.compactar_diario": _compactar_diario,
+    "common.ruta_periodo": lambda ctx: lambda: common.ruta_periodo("2026-01"),
+    "common.ruta_manifiesto": lambda ctx: common.ruta_manifiesto,
+    "common.leer_manifiesto": lambda ctx: common.leer_manifiesto,
+    "common.guardar_manifiesto": _guardar_manifiesto,
+    "common.particionar_matriculas": lambda ctx: lambda: common.particionar_matriculas(common.MATRICULAS_FILE),
+}
+
+
+def funciones_publicas() -> List[str]:
+    """Nombres 'modulo.funcion' de las funciones públicas definidas en los módulos medidos."""
+    nombres = []
+    for modulo in MODULOS:
+        corto = modulo.__name__.rsplit('.', 1)[-1]
+        for nombre, funcion in inspect.getmembers(modulo, inspect.isfunction):
+            if not nombre.startswith('_') and funcion.__module__ == modulo.__name__:
+                nombres.append(f"{corto}.{nombre}")
+    return nombres
+
+
+def _apuntar_a(directorio: str):
+    common.ESTUDIANTES_FILE = os.path.join(directorio, "estudiantes.csv")
+    common.CURSOS_FILE = os.path.join(directorio, "cursos.csv")
+    common.MATRICULAS_FILE = os.path.join(directorio, "matriculas.json")
+    common.MATRICULAS_DIR = os.path.join(directorio, "matriculas")
+    common.MATRICULAS_POR_PERIODO = False
+    common.USAR_BINARIO = False
+    common.BACKEND = "archivos"
+    repositorio.invalidar()
+
+
+# Configuración que _apuntar_a cambia y que hay que restaurar después de medir
+_CONFIGURACION = ("ESTUDIANTES_FILE", "CURSOS_FILE", "MATRICULAS_FILE", "MATRICULAS_DIR", "BACKEND",
+                  "MATRICULAS_POR_PERIODO", "USAR_BINARIO")
+
+
+def _restaurar(originales: Dict[str, Any]):
+    for nombre, valor in originales.items():
+        setattr(common, nombre, valor)
+    repositorio.invalidar()
+
+
+def medir_escala(estudiantes: int, repeticiones: int, semilla: int = 42,
+                 por_periodo: bool = False, binario: bool = False) -> List[Dict[str, Any]]:
+    """Genera los datos de una escala en un directorio temporal y mide todos los casos."""
+    originales = {nombre: getattr(common, nombre) for nombre in _CONFIGURACION}
+    resultados = []
+    with tempfile.TemporaryDirectory(prefix="benchmark_") as directorio:
+        generador.generar(directorio, estudiantes, semilla)
+        _apuntar_a(directorio)
+        if por_periodo:
+            common.particionar_matriculas(common.MATRICULAS_FILE)
+            common.MATRICULAS_POR_PERIODO = True
+        common.USAR_BINARIO = binario
+        ctx = Contexto(directorio, estudiantes)
+        try:
+            for nombre, caso in CASOS.items():
+                tiempos = []
+                for i in range(repeticiones):
+                    llamada = caso(ctx)
+                    if i == 0:
+                        repositorio.invalidar()
+                    inicio = time.perf_counter()
+                    llamada()
+                    tiempos.append(time.perf_counter() - inicio)
+                calientes = tiempos[1:] or tiempos
+                resultados.append({
+                    "escala": estudiantes,
+                    "por_periodo": por_periodo,
+                    "binario": binario,
+                    "funcion": nombre,
+                    "frio_s": tiempos[0],
+                    "mediana_s": statistics.median(calientes),
+                    "min_s": min(calientes),
+                    "repeticiones": repeticiones,
+                })
+        finally:
+            _restaurar(originales)
+    return resultados
+
+
+def _commit() -> str:
+    try:
+        raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=raiz, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def ejecutar(escalas: List[int], repeticiones: int, semilla: int = 42, por_periodo: bool = False,
+             binario: bool = False) -> Dict[str, Any]:
+    resultados = []
+    for estudiantes in escalas:
+        print(f"Midiendo {estudiantes} estudiantes...", file=sys.stderr)
+        resultados += medir_escala(estudiantes, repeticiones, semilla, por_periodo, binario)
+    return {
+        "commit": _commit(),
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "semilla": semilla,
+        "resultados": resultados,
+        "sin_caso": sorted(set(funciones_publicas()) - set(CASOS)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide las funciones públicas de los controladores y de common.")
+    parser.add_argument("--escalas", nargs="+", type=generador.escala, default=[1_000, 10_000],
+                        help="cantidades de estudiantes (1k, 10k, 100k, 1m o números)")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--por-periodo", action="store_true", help="matrículas en un archivo por período")
+    parser.add_argument("--binario", action="store_true", help="cargas desde instantáneas binarias")
+    parser.add_argument("--salida", default="benchmarks/resultados.json")
+    args = parser.parse_args()
+
+    informe = ejecutar(args.escalas, max(1, args.repeticiones), args.semilla, args.por_periodo, args.binario)
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(informe, f, indent=2, ensure_ascii=False)
+    for r in informe["resultados"]:
+        print(f"{r['escala']:>9} {r['funcion']:<55} frío {r['frio_s'] * 1000:10.2f} ms   "
+              f"mediana {r['mediana_s'] * 1000:10.2f} ms")
+    if informe["sin_caso"]:
+        print("Funciones sin caso de benchmark: " + ", ".join(informe["sin_caso"]), file=sys.stderr)
+    print(f"Resultados en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/generador.py
+"""
+Generador de datos sintéticos con semilla fija: la misma escala y semilla
+producen siempre los mismos archivos.
+
+La escala es la cantidad de estudiantes. Hay un curso por cada 50 estudiantes
+(entre 20 y 2000) y cada estudiante se matricula en 1 a 4 períodos, con 3 a 6
+cursos por matrícula (unas 2,5 matrículas por estudiante).
+
+Uso: python benchmarks/generador.py directorio escala [--semilla N] [--jsonl]
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+from typing import Dict, Iterator
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modelo.entidades import Matricula  # noqa: E402
+from controlador import common  # noqa: E402
+
+ESCALAS = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+NOMBRES = ["Ana", "José", "María", "Luis", "Sofía", "Andrés", "Camila", "Juan", "Valentina", "Mateo",
+           "Lucía", "Sebastián", "Isabella", "Nicolás", "Mariana", "Tomás", "Daniela", "Martín", "Gabriela", "Ángel"]
+APELLIDOS = ["García", "Rodríguez", "Martínez", "López", "González", "Pérez", "Sánchez", "Ramírez", "Torres",
+             "Flores", "Rivera", "Gómez", "Díaz", "Cruz", "Morales", "Ortiz", "Gutiérrez", "Chávez", "Ramos", "Núñez"]
+CARRERAS = ["Ingeniería de Software", "Ingeniería Civil", "Ingeniería Industrial", "Medicina", "Derecho",
+            "Arquitectura", "Contaduría", "Administración", "Psicología", "Diseño Gráfico", "Economía",
+            "Biología", "Física", "Matemáticas", "Comunicación Social"]
+AREAS = ["Cálculo", "Álgebra", "Programación", "Física", "Química", "Estadística", "Historia", "Ética",
+         "Contabilidad", "Dibujo", "Anatomía", "Redacción", "Economía", "Bases de Datos", "Redes"]
+PERIODOS = [f"{anio}-0{semestre}" for anio in range(2021, 2026) for semestre in (1, 2)]
+
+
+def escala(valor: str) -> int:
+    """Convierte '10k', '1m' o un número en una cantidad de estudiantes."""
+    return ESCALAS.get(valor.lower()) or int(valor)
+
+
+def cantidad_cursos(estudiantes: int) -> int:
+    return min(2000, max(20, estudiantes // 50))
+
+
+def _estudiantes(rnd: random.Random, cantidad: int) -> Iterator[list]:
+    for i in range(cantidad):
+        nombre = f"{rnd.choice(NOMBRES)} {rnd.choice(APELLIDOS)} {rnd.choice(APELLIDOS)}"
+        yield [f"E{i:07d}", nombre, rnd.choice(CARRERAS)]
+
+
+def _cursos(rnd: random.Random, cantidad: int) -> Iterator[list]:
+    for i in range(cantidad):
+        nivel = i // len(AREAS) + 1
+        yield [f"C{i:05d}", f"{AREAS[i % len(AREAS)]} {nivel}", rnd.choice((2, 3, 3, 4, 4, 5, 6))]
+
+
+def _matriculas(rnd: random.Random, estudiantes: int, cursos: int) -> Iterator[Matricula]:
+    numero = 0
+    for i in range(estudiantes):
+        for periodo in sorted(rnd.sample(PERIODOS, rnd.randint(1, 4))):
+            numero += 1
+            id_cursos = [f"C{c:05d}" for c in rnd.sample(range(cursos), rnd.randint(3, 6))]
+            yield Matricula(f"M{numero:03d}", f"E{i:07d}", periodo, id_cursos)
+
+
+def generar(directorio: str, estudiantes: int, semilla: int = 42, jsonl: bool = False) -> Dict[str, str]:
+    """
+    Escribe estudiantes.csv, cursos.csv y matriculas.json (o .jsonl) en el
+    directorio, en flujo, y retorna las rutas por nombre.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    rnd = random.Random(semilla)
+    rutas = {
+        "estudiantes": os.path.join(directorio, "estudiantes.csv"),
+        "cursos": os.path.join(directorio, "cursos.csv"),
+        "matriculas": os.path.join(directorio, "matriculas.jsonl" if jsonl else "matriculas.json"),
+    }
+    n_cursos = cantidad_cursos(estudiantes)
+    for nombre, encabezados, filas in (
+            ("estudiantes", common.ENCABEZADOS_ESTUDIANTES, _estudiantes(rnd, estudiantes)),
+            ("cursos", common.ENCABEZADOS_CURSOS, _cursos(rnd, n_cursos))):
+        with open(rutas[nombre], 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(encabezados)
+            writer.writerows(filas)
+    if not common.guardar_datos_json(rutas["matriculas"], _matriculas(rnd, estudiantes, n_cursos)):
+        raise OSError(f"No se pudo escribir {rutas['matriculas']}")
+    return rutas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos de estudiantes, cursos y matrículas.")
+    parser.add_argument("directorio")
+    parser.add_argument("escala", type=escala, help="cantidad de estudiantes (1k, 10k, 100k, 1m o un número)")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--jsonl", action="store_true", help="escribir las matrículas en formato JSON Lines")
+    args = parser.parse_args()
+    for nombre, ruta in generar(args.directorio, args.escala, args.semilla, args.jsonl).items():
+        print(f"{nombre}: {ruta}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/memoria_entidades.py
+"""
+Compara la memoria que ocupan las entidades según su representación:
+
+  - dataclass:  @dataclass simple con __dict__ y textos sin compartir (la representación original)
+  - slots:      las entidades actuales (__slots__ y textos repetidos internados)
+  - compacto:   lo anterior más MODO_COMPACTO (id_cursos como tupla)
+
+Uso: python benchmarks/memoria_entidades.py [cantidad_de_matriculas]
+"""
+import os
+import random
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modelo import entidades  # noqa: E402
+
+
+@dataclass
+class EstudianteDict:
+    id_estudiante: str
+    nombre: str
+    carrera: str
+
+
+@dataclass
+class MatriculaDict:
+    id_matricula: str
+    id_estudiante: str
+    periodo_academico: str
+    id_cursos: List[str] = field(default_factory=list)
+
+
+def _texto(valor: str) -> str:
+    """Un str nuevo con el mismo contenido, como los que produce el parser de CSV/JSON."""
+    return valor.encode().decode()
+
+
+def _filas(cantidad: int):
+    """Filas sintéticas con la misma repetición de textos que los datos reales."""
+    rnd = random.Random(42)
+    carreras = [f"Carrera {i}" for i in range(20)]
+    periodos = [f"20{a}-0{s}" for a in range(15, 25) for s in (1, 2)]
+    estudiantes = [(f"E{i:06d}", f"Estudiante {i}", rnd.choice(carreras)) for i in range(cantidad // 3)]
+    matriculas = [(f"M{i:06d}", rnd.choice(estudiantes)[0], rnd.choice(periodos),
+                   [f"C{rnd.randrange(200):03d}" for _ in range(rnd.randint(3, 6))])
+                  for i in range(cantidad)]
+    return estudiantes, matriculas
+
+
+def _medir(crear_estudiante, crear_matricula, estudiantes, matriculas) -> int:
+    tracemalloc.start()
+    objetos = [crear_estudiante(*map(_texto, e)) for e in estudiantes]
+    objetos += [crear_matricula(_texto(m[0]), _texto(m[1]), _texto(m[2]), [_texto(c) for c in m[3]])
+                for m in matriculas]
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objetos
+    return actual
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    estudiantes, matriculas = _filas(cantidad)
+    registros = len(estudiantes) + len(matriculas)
+
+    resultados = {"dataclass": _medir(EstudianteDict, MatriculaDict, estudiantes, matriculas)}
+    entidades.MODO_COMPACTO = False
+    resultados["slots"] = _medir(entidades.Estudiante, entidades.Matricula, estudiantes, matriculas)
+    entidades.MODO_COMPACTO = True
+    resultados["compacto"] = _medir(entidades.Estudiante, entidades.Matricula, estudiantes, matriculas)
+
+    base = resultados["dataclass"]
+    print(f"{len(estudiantes)} estudiantes y {len(matriculas)} matrículas")
+    for nombre, total in resultados.items():
+        print(f"{nombre:>10}: {total / 2**20:8.1f} MiB  {total / registros:7.1f} bytes/registro  "
+              f"{100 * total / base:5.1f}%")
+
+
+if __name__ == "__main__":
+    main()
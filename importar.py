@@ -0,0 +1,48 @@
+# importar.py
+"""
+Importación masiva desde archivos CSV.
+
+Uso: python importar.py {estudiantes,cursos,matriculas} archivo.csv [--validar]
+
+Columnas esperadas:
+  estudiantes: id_estudiante,nombre,carrera
+  cursos:      id_curso,nombre_curso,creditos
+  matriculas:  id_estudiante,periodo_academico,id_cursos (IDs separados por ';')
+
+Las filas válidas se guardan aunque haya filas rechazadas; con --validar no se
+guarda nada y solo se reportan los errores.
+"""
+import argparse
+import sys
+from controlador import importacion_ctrl
+
+IMPORTADORES = {
+    "estudiantes": importacion_ctrl.importar_estudiantes,
+    "cursos": importacion_ctrl.importar_cursos,
+    "matriculas": importacion_ctrl.importar_matriculas,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importación masiva desde archivos CSV.")
+    parser.add_argument("tipo", choices=IMPORTADORES.keys())
+    parser.add_argument("archivo")
+    parser.add_argument("--validar", action="store_true", help="solo valida, no guarda")
+    args = parser.parse_args()
+
+    try:
+        resultado = IMPORTADORES[args.tipo](args.archivo, guardar=not args.validar)
+    except OSError as e:
+        print(f"Error al leer {args.archivo}: {e}")
+        sys.exit(1)
+
+    for linea, motivo in resultado.rechazados:
+        print(f"Línea {linea}: {motivo}")
+    accion = "válidos" if args.validar else "importados"
+    print(f"{len(resultado.aceptados)} registro(s) {accion}, {len(resultado.rechazados)} rechazado(s).")
+    if resultado.rechazados:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,207 +1,232 @@
 # main.py
+"""
+Sistema de Gestión de Matrículas Académicas.
+
+Sin argumentos abre el menú interactivo. Con un subcomando se ejecuta una sola
+operación sin interacción y el resultado se escribe como tabla de texto, JSON
+o CSV, para usarlo desde scripts:
+
+  python main.py estudiantes [--pagina N] [--tamano N] [--orden CAMPO] [--desc] [--buscar TEXTO]
+  python main.py cursos [--pagina N] [--tamano N] [--orden CAMPO] [--desc] [--buscar TEXTO]
+  python main.py en-curso ID_CURSO [--periodo PERIODO] [--pagina N] [--tamano N]
+  python main.py matriculas ID_ESTUDIANTE [--periodo PERIODO]
+  python main.py matricular ID_ESTUDIANTE PERIODO ID_CURSO [ID_CURSO ...]
+  python main.py creditos [ID_ESTUDIANTE] [--periodo PERIODO]
+  python main.py sobrecargas [--periodo PERIODO] [--limite N]
+  python main.py cerrar-periodo PERIODO
+
+Todos los subcomandos aceptan --formato {tabla,json,csv}. Los errores se
+escriben en stderr y el programa termina con código 1.
+
+Los módulos se importan recién cuando se necesitan: un subcomando no carga
+rich ni el menú, y --help no carga los controladores. Así el arranque en frío
+de un subcomando se mantiene dentro de PRESUPUESTO_ARRANQUE_S
+(benchmarks/arranque.py lo mide).
+"""
+import argparse
+import csv
+import json
 import sys
-from vista import consola as vista
-from controlador import estudiantes_ctrl, cursos_ctrl, matriculas_ctrl
-
-
-def gestionar_estudiantes():
-    """Maneja el submenú de gestión de estudiantes."""
-    while True:
-        opcion = vista.mostrar_menu_gestion("Estudiante")
-
-        try:
-            if opcion == "1":  # Crear
-                datos = vista.solicitar_datos_estudiante()
-                estudiantes_ctrl.crear_estudiante(**datos)
-                vista.mostrar_exito("Estudiante creado correctamente.")
-
-            elif opcion == "2":  # Listar
-                estudiantes = estudiantes_ctrl.obtener_estudiantes()
-                vista.mostrar_estudiantes(estudiantes)
-
-            elif opcion == "3":  # Actualizar
-                id_est = vista.solicitar_id("estudiante a actualizar")
-                estudiante = estudiantes_ctrl.obtener_estudiante_por_id(id_est)
-                if estudiante:
-                    vista.consola.print(f"Actualizando a: {estudiante.nombre}")
-                    datos = vista.solicitar_datos_estudiante(actualizando=True)
-                    estudiantes_ctrl.actualizar_estudiante(id_est, **datos)
-                    vista.mostrar_exito("Estudiante actualizado.")
-                else:
-                    vista.mostrar_error("Estudiante no encontrado.")
-
-            elif opcion == "4":  # Eliminar
-                id_est = vista.solicitar_id("estudiante a eliminar")
-                estudiantes_ctrl.eliminar_estudiante(id_est)
-                vista.mostrar_exito("Estudiante eliminado.")
-
-            elif opcion == "5":  # Volver
-                break
-
-        except ValueError as e:
-            vista.mostrar_error(str(e))
-        except Exception as e:
-            vista.mostrar_error(f"Ocurrió un error inesperado: {e}")
-
-        if opcion != "2":  # No pausar después de listar
-            vista.pausar_pantalla()
-
-
-def gestionar_cursos():
-    """Maneja el submenú de gestión de cursos."""
-    while True:
-        opcion = vista.mostrar_menu_gestion("Curso")
-
-        try:
-            if opcion == "1":  # Crear
-                datos = vista.solicitar_datos_curso()
-                cursos_ctrl.crear_curso(**datos)
-                vista.mostrar_exito("Curso creado correctamente.")
-
-            elif opcion == "2":  # Listar
-                cursos = cursos_ctrl.obtener_cursos()
-                vista.mostrar_cursos(cursos)
-
-            elif opcion == "3":  # Actualizar
-                id_curso = vista.solicitar_id("curso a actualizar")
-                curso = cursos_ctrl.obtener_curso_por_id(id_curso)
-                if curso:
-                    vista.consola.print(f"Actualizando a: {curso.nombre_curso}")
-                    datos = vista.solicitar_datos_curso(actualizando=True)
-                    cursos_ctrl.actualizar_curso(id_curso, **datos)
-                    vista.mostrar_exito("Curso actualizado.")
-                else:
-                    vista.mostrar_error("Curso no encontrado.")
-
-            elif opcion == "4":  # Eliminar
-                id_curso = vista.solicitar_id("curso a eliminar")
-                cursos_ctrl.eliminar_curso(id_curso)
-                vista.mostrar_exito("Curso eliminado.")
-
-            elif opcion == "5":  # Volver
-                break
-
-        except ValueError as e:
-            vista.mostrar_error(str(e))
-        except Exception as e:
-            vista.mostrar_error(f"Ocurrió un error inesperado: {e}")
-
-        if opcion != "2":
-            vista.pausar_pantalla()
-
-
-def gestionar_matriculas():
-    """Maneja el submenú de matrículas."""
-    while True:
-        opcion = vista.mostrar_menu_matriculas()
-
-        try:
-            if opcion == "1":  # Matricular
-                datos = vista.solicitar_datos_matricula()
-                matriculas_ctrl.matricular_estudiante(
-                    datos["id_estudiante"],
-                    datos["id_cursos"],
-                    datos["periodo"]
-                )
-                vista.mostrar_exito("Estudiante matriculado exitosamente.")
-
-            elif opcion == "2":  # Ver matrícula de estudiante
-                id_est = vista.solicitar_id("estudiante")
-                periodo = vista.solicitar_periodo()
-                estudiante = estudiantes_ctrl.obtener_estudiante_por_id(id_est)
-
-                if not estudiante:
-                    vista.mostrar_error("Estudiante no encontrado.")
-                    continue
-
-                matriculas = matriculas_ctrl.obtener_matriculas_por_estudiante(id_est)
-                matricula_periodo = None
-                for m in matriculas:
-                    if m.periodo_academico == periodo:
-                        matricula_periodo = m
-                        break
-
-                cursos_matriculados = []
-                creditos_totales = 0
-                if matricula_periodo:
-                    for id_c in matricula_periodo.id_cursos:
-                        curso = cursos_ctrl.obtener_curso_por_id(id_c)
-                        if curso:
-                            cursos_matriculados.append(curso)
-
-                    creditos_totales = matriculas_ctrl.calcular_creditos_estudiante(id_est, periodo)
-
-                vista.mostrar_matricula_estudiante(estudiante, cursos_matriculados, creditos_totales, periodo)
-
-            elif opcion == "3":  # Volver
-                break
-
-        except ValueError as e:
-            vista.mostrar_error(str(e))
-        except Exception as e:
-            vista.mostrar_error(f"Ocurrió un error inesperado: {e}")
-
-        vista.pausar_pantalla()
-
-
-def gestionar_reportes():
-    """Maneja el submenú de reportes."""
-    while True:
-        opcion = vista.mostrar_menu_reportes()
-
-        try:
-            if opcion == "1":  # Estudiantes por curso
-                id_curso = vista.solicitar_id("curso")
-                curso = cursos_ctrl.obtener_curso_por_id(id_curso)
-
-                if not curso:
-                    vista.mostrar_error("Curso no encontrado.")
-                    continue
-
-                estudiantes = matriculas_ctrl.obtener_estudiantes_por_curso(id_curso)
-                vista.mostrar_estudiantes_por_curso(curso, estudiantes)
-
-            elif opcion == "2":  # Calcular créditos (Reto Final)
-                id_est = vista.solicitar_id("estudiante")
-                periodo = vista.solicitar_periodo()
-
-                estudiante = estudiantes_ctrl.obtener_estudiante_por_id(id_est)
-                if not estudiante:
-                    vista.mostrar_error("Estudiante no encontrado.")
-                    continue
-
-                creditos = matriculas_ctrl.calcular_creditos_estudiante(id_est, periodo)
-                vista.mostrar_exito(
-                    f"El estudiante [bold]{estudiante.nombre}[/bold] tiene [bold]{creditos}[/bold] créditos en el período {periodo}.")
-
-            elif opcion == "3":  # Volver
-                break
-
-        except ValueError as e:
-            vista.mostrar_error(str(e))
-        except Exception as e:
-            vista.mostrar_error(f"Ocurrió un error inesperado: {e}")
-
-        vista.pausar_pantalla()
-
-
-def main():
+from typing import Any, Dict, List, Optional, Sequence
+
+# Tiempo máximo de arranque en frío (segundos) de un subcomando, hasta escribir el resultado
+PRESUPUESTO_ARRANQUE_S = 0.3
+
+FORMATOS = ("tabla", "json", "csv")
+
+
+# --- Salida ---
+
+def _escribir(filas: List[Dict[str, Any]], formato: str, salida=None):
+    """Escribe las filas (dicts con las mismas claves) en el formato pedido."""
+    salida = salida or sys.stdout
+    if formato == "json":
+        json.dump(filas, salida, indent=2, ensure_ascii=False)
+        salida.write("\n")
+        return
+    if not filas:
+        if formato == "tabla":
+            salida.write("(sin resultados)\n")
+        return
+    columnas = list(filas[0])
+    if formato == "csv":
+        writer = csv.DictWriter(salida, fieldnames=columnas, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(filas)
+        return
+    textos = [[_texto(fila[c]) for c in columnas] for fila in filas]
+    anchos = [max(len(c), *(len(t[i]) for t in textos)) for i, c in enumerate(columnas)]
+    for valores in [columnas, ["-" * ancho for ancho in anchos]] + textos:
+        salida.write("  ".join(v.ljust(ancho) for v, ancho in zip(valores, anchos)).rstrip() + "\n")
+
+
+def _texto(valor: Any) -> str:
+    if isinstance(valor, (list, tuple)):
+        return ";".join(map(str, valor))
+    return str(valor)
+
+
+def _filas(registros) -> List[Dict[str, Any]]:
+    from modelo.entidades import a_dict
+    filas = []
+    for registro in registros:
+        fila = a_dict(registro)
+        if "id_cursos" in fila:
+            fila["id_cursos"] = list(fila["id_cursos"])
+        filas.append(fila)
+    return filas
+
+
+# --- Subcomandos ---
+
+def _cmd_estudiantes(args) -> List[Dict[str, Any]]:
+    from controlador import estudiantes_ctrl
+    if args.buscar is not None:
+        return _filas(estudiantes_ctrl.buscar_estudiantes(args.buscar))
+    pagina = estudiantes_ctrl.obtener_pagina_estudiantes(args.pagina, args.tamano, args.orden, args.desc)
+    return _filas(pagina.registros)
+
+
+def _cmd_cursos(args) -> List[Dict[str, Any]]:
+    from controlador import cursos_ctrl
+    if args.buscar is not None:
+        return _filas(cursos_ctrl.buscar_cursos(args.buscar))
+    pagina = cursos_ctrl.obtener_pagina_cursos(args.pagina, args.tamano, args.orden, args.desc)
+    return _filas(pagina.registros)
+
+
+def _cmd_en_curso(args) -> List[Dict[str, Any]]:
+    from controlador import cursos_ctrl, matriculas_ctrl
+    if not cursos_ctrl.obtener_curso_por_id(args.id_curso):
+        raise ValueError(f"No se encontró un curso con ID '{args.id_curso}'.")
+    pagina = matriculas_ctrl.obtener_pagina_estudiantes_por_curso(args.id_curso, args.pagina, args.tamano,
+                                                                  periodo=args.periodo)
+    return _filas(pagina.registros)
+
+
+def _cmd_matriculas(args) -> List[Dict[str, Any]]:
+    from controlador import estudiantes_ctrl, matriculas_ctrl
+    if not estudiantes_ctrl.obtener_estudiante_por_id(args.id_estudiante):
+        raise ValueError(f"No se encontró un estudiante con ID '{args.id_estudiante}'.")
+    return _filas(matriculas_ctrl.obtener_matriculas_por_estudiante(args.id_estudiante, args.periodo))
+
+
+def _cmd_matricular(args) -> List[Dict[str, Any]]:
+    from controlador import matriculas_ctrl
+    return _filas([matriculas_ctrl.matricular_estudiante(args.id_estudiante, args.id_cursos, args.periodo)])
+
+
+def _cmd_creditos(args) -> List[Dict[str, Any]]:
+    if args.id_estudiante is None:
+        from controlador import agregados
+        totales = agregados.creditos_por_estudiante(args.periodo)
+        return [{"id_estudiante": id_est, "creditos": creditos} for id_est, creditos in sorted(totales.items())]
+    from controlador import estudiantes_ctrl, matriculas_ctrl
+    if args.periodo is None:
+        raise ValueError("Indique el período con --periodo para calcular los créditos de un estudiante.")
+    if not estudiantes_ctrl.obtener_estudiante_por_id(args.id_estudiante):
+        raise ValueError(f"No se encontró un estudiante con ID '{args.id_estudiante}'.")
+    creditos = matriculas_ctrl.calcular_creditos_estudiante(args.id_estudiante, args.periodo)
+    return [{"id_estudiante": args.id_estudiante, "periodo": args.periodo, "creditos": creditos}]
+
+
+def _cmd_sobrecargas(args) -> List[Dict[str, Any]]:
+    from controlador import reportes_ctrl
+    limite = reportes_ctrl.LIMITE_CREDITOS_PERIODO if args.limite is None else args.limite
+    reporte = reportes_ctrl.reporte_carga_creditos(args.periodo, limite)
+    return [{"id_estudiante": id_est, "periodo": periodo, "creditos": creditos}
+            for id_est, periodo, creditos in reporte.sobrecargas]
+
+
+def _cmd_cerrar_periodo(args) -> List[Dict[str, Any]]:
+    from controlador import repositorio
+    repositorio.cerrar_periodo(args.periodo)
+    return [{"periodo": args.periodo, "cerrado": True}]
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    comun = argparse.ArgumentParser(add_help=False)
+    comun.add_argument("--formato", choices=FORMATOS, default="tabla", help="formato de salida (por defecto: tabla)")
+    paginado = argparse.ArgumentParser(add_help=False)
+    paginado.add_argument("--pagina", type=int, default=1)
+    paginado.add_argument("--tamano", type=int, default=20, help="registros por página")
+
+    parser = argparse.ArgumentParser(
+        description="Sistema de Gestión de Matrículas Académicas. Sin subcomando abre el menú interactivo.")
+    subcomandos = parser.add_subparsers(dest="comando", metavar="subcomando")
+
+    # Los campos de orden se repiten aquí para no importar los controladores al construir el parser
+    for nombre, ordenes, funcion, ayuda in (
+            ("estudiantes", ("id_estudiante", "nombre", "carrera"), _cmd_estudiantes, "lista o busca estudiantes"),
+            ("cursos", ("id_curso", "nombre_curso", "creditos"), _cmd_cursos, "lista o busca cursos")):
+        sub = subcomandos.add_parser(nombre, parents=[comun, paginado], help=ayuda)
+        sub.add_argument("--orden", choices=ordenes)
+        sub.add_argument("--desc", action="store_true", help="orden descendente")
+        sub.add_argument("--buscar", metavar="TEXTO", help="buscar por texto en lugar de listar")
+        sub.set_defaults(funcion=funcion)
+
+    sub = subcomandos.add_parser("en-curso", parents=[comun, paginado], help="estudiantes matriculados en un curso")
+    sub.add_argument("id_curso")
+    sub.add_argument("--periodo", help="solo los matriculados en ese período")
+    sub.set_defaults(funcion=_cmd_en_curso)
+
+    sub = subcomandos.add_parser("matriculas", parents=[comun], help="matrículas de un estudiante")
+    sub.add_argument("id_estudiante")
+    sub.add_argument("--periodo", help="solo las matrículas de ese período")
+    sub.set_defaults(funcion=_cmd_matriculas)
+
+    sub = subcomandos.add_parser("matricular", parents=[comun], help="matricula a un estudiante en uno o más cursos")
+    sub.add_argument("id_estudiante")
+    sub.add_argument("periodo")
+    sub.add_argument("id_cursos", nargs="+", metavar="id_curso")
+    sub.set_defaults(funcion=_cmd_matricular)
+
+    sub = subcomandos.add_parser("creditos", parents=[comun],
+                                 help="créditos de un estudiante en un período, o de todos los estudiantes")
+    sub.add_argument("id_estudiante", nargs="?")
+    sub.add_argument("--periodo")
+    sub.set_defaults(funcion=_cmd_creditos)
+
+    sub = subcomandos.add_parser("sobrecargas", parents=[comun], help="cargas de créditos por encima del límite")
+    sub.add_argument("--periodo")
+    sub.add_argument("--limite", type=int, help="créditos máximos por período (por defecto: 20)")
+    sub.set_defaults(funcion=_cmd_sobrecargas)
+
+    sub = subcomandos.add_parser("cerrar-periodo", parents=[comun],
+                                 help="deja de solo lectura las matrículas de un período (matrículas por período)")
+    sub.add_argument("periodo")
+    sub.set_defaults(funcion=_cmd_cerrar_periodo)
+    return parser
+
+
+def ejecutar_comando(argv: Sequence[str]) -> int:
+    """Ejecuta un subcomando sin interacción. Retorna el código de salida."""
+    args = crear_parser().parse_args(argv)
+    if args.comando is None:
+        crear_parser().print_help()
+        return 2
+    try:
+        filas = args.funcion(args)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except OSError as e:
+        print(f"Error de archivo: {e}", file=sys.stderr)
+        return 1
+    _escribir(filas, args.formato)
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None):
     """Función principal de la aplicación."""
-    while True:
-        opcion = vista.mostrar_menu_principal()
-
-        if opcion == "1":
-            gestionar_estudiantes()
-        elif opcion == "2":
-            gestionar_cursos()
-        elif opcion == "3":
-            gestionar_matriculas()
-        elif opcion == "4":
-            gestionar_reportes()
-        elif opcion == "5":
-            vista.consola.print("[bold green]¡Hasta luego! 👋[/bold green]")
-            sys.exit(0)
+    argv = sys.argv[1:] if argv is None else list(argv)
+    from controlador import instrumentacion
+    instrumentacion.activar_desde_entorno()
+    if argv:
+        sys.exit(ejecutar_comando(argv))
+    import menu
+    menu.ejecutar()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,26 @@
+# migrar_sqlite.py
+"""
+Importa los archivos CSV/JSON de la carpeta data a la base de datos SQLite.
+
+Uso: python migrar_sqlite.py [ruta_de_la_base]
+Después, ejecute la aplicación con MATRICULAS_BACKEND=sqlite para usarla.
+"""
+import sys
+from controlador import common, almacen_sqlite
+
+
+def main():
+    if len(sys.argv) > 1:
+        common.SQLITE_FILE = sys.argv[1]
+    try:
+        importados = almacen_sqlite.migrar_desde_archivos()
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    for nombre, cantidad in importados.items():
+        print(f"{nombre}: {cantidad} registro(s) importado(s)")
+    print(f"Base de datos: {common.SQLITE_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+# servidor.py
+"""
+API HTTP/JSON sobre los controladores, con la biblioteca estándar.
+
+Uso: python servidor.py [--host 127.0.0.1] [--puerto 8000] [--hilos 8]
+
+Rutas (los cuerpos y las respuestas son JSON):
+
+  GET    /estudiantes                  ?pagina=&tamano=&orden=&desc=1 o ?buscar=texto
+  POST   /estudiantes                  {"id_estudiante", "nombre", "carrera"}
+  GET    /estudiantes/{id}
+  PUT    /estudiantes/{id}             {"nombre", "carrera"}
+  DELETE /estudiantes/{id}
+  GET    /estudiantes/{id}/matriculas    ?periodo=
+  GET    /estudiantes/{id}/creditos    ?periodo=
+  GET    /cursos                       ?pagina=&tamano=&orden=&desc=1 o ?buscar=texto
+  POST   /cursos                       {"id_curso", "nombre_curso", "creditos"}
+  GET    /cursos/{id}
+  PUT    /cursos/{id}                  {"nombre_curso", "creditos"}
+  DELETE /cursos/{id}
+  GET    /cursos/{id}/estudiantes      ?pagina=&tamano=&periodo=
+  POST   /matriculas                   {"id_estudiante", "id_cursos", "periodo"}
+  GET    /reportes/carga               ?periodo=&limite=
+  GET    /diagnostico
+
+Las solicitudes se atienden en un grupo fijo de hilos. Todos comparten la caché
+del repositorio, que se carga al iniciar y se mantiene al día con las
+escrituras, así que una solicitud no vuelve a leer los archivos salvo que otro
+proceso los cambie. Las lecturas se atienden en paralelo y las escrituras de a
+una (bloqueo.LectoresEscritor), porque las tablas en memoria no admiten
+cambios concurrentes.
+
+Un ValueError de los controladores responde 400 con {"error": mensaje}; un
+registro inexistente, 404.
+"""
+import argparse
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+from modelo.entidades import a_dict
+from controlador import (estudiantes_ctrl, cursos_ctrl, matriculas_ctrl, reportes_ctrl, instrumentacion,
+                         repositorio, agregados)
+from controlador.bloqueo import LectoresEscritor
+
+HILOS = 8
+# Tamaño máximo del cuerpo de una solicitud
+MAX_CUERPO = 1024 * 1024
+
+
+class ErrorHTTP(Exception):
+    def __init__(self, estado: HTTPStatus, mensaje: str):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+# --- Conversión a JSON ---
+
+def _registro(registro) -> Optional[Dict[str, Any]]:
+    if registro is None:
+        return None
+    datos = a_dict(registro)
+    if "id_cursos" in datos:
+        datos["id_cursos"] = list(datos["id_cursos"])
+    return datos
+
+
+def _pagina(pagina: repositorio.Pagina) -> Dict[str, Any]:
+    return {"registros": [_registro(r) for r in pagina.registros], "numero": pagina.numero,
+            "tamano": pagina.tamano, "total": pagina.total, "total_paginas": pagina.total_paginas}
+
+
+# --- Parámetros ---
+
+def _texto(consulta: Dict[str, List[str]], nombre: str, por_defecto: Optional[str] = None) -> Optional[str]:
+    valores = consulta.get(nombre)
+    return valores[-1] if valores else por_defecto
+
+
+def _entero(consulta: Dict[str, List[str]], nombre: str, por_defecto: int) -> int:
+    valor = _texto(consulta, nombre)
+    if valor is None:
+        return por_defecto
+    try:
+        return int(valor)
+    except ValueError as e:
+        raise ValueError(f"El parámetro '{nombre}' debe ser un número entero.") from e
+
+
+def _campo(cuerpo: Dict[str, Any], nombre: str) -> Any:
+    if nombre not in cuerpo:
+        raise ValueError(f"Falta el campo '{nombre}'.")
+    return cuerpo[nombre]
+
+
+def _campo_texto(cuerpo: Dict[str, Any], nombre: str) -> str:
+    valor = _campo(cuerpo, nombre)
+    if not isinstance(valor, str) or not valor:
+        raise ValueError(f"El campo '{nombre}' debe ser un texto no vacío.")
+    return valor
+
+
+def _campo_entero(cuerpo: Dict[str, Any], nombre: str) -> int:
+    valor = _campo(cuerpo, nombre)
+    if isinstance(valor, bool) or not isinstance(valor, (int, str)):
+        raise ValueError(f"El campo '{nombre}' debe ser un número entero.")
+    try:
+        return int(valor)
+    except ValueError as e:
+        raise ValueError(f"El campo '{nombre}' debe ser un número entero.") from e
+
+
+def _encontrado(registro, tipo: str, id_registro: str):
+    if registro is None:
+        raise ErrorHTTP(HTTPStatus.NOT_FOUND, f"No se encontró un {tipo} con ID '{id_registro}'.")
+    return registro
+
+
+# --- Operaciones ---
+# Cada una recibe los parámetros de la URL, el cuerpo JSON (o None) y los grupos
+# de la ruta, y retorna (estado, datos).
+
+Respuesta = Tuple[HTTPStatus, Any]
+
+
+def listar_estudiantes(consulta, cuerpo) -> Respuesta:
+    texto = _texto(consulta, "buscar")
+    if texto is not None:
+        return HTTPStatus.OK, [_registro(e) for e in estudiantes_ctrl.buscar_estudiantes(texto)]
+    return HTTPStatus.OK, _pagina(estudiantes_ctrl.obtener_pagina_estudiantes(
+        _entero(consulta, "pagina", 1), _entero(consulta, "tamano", 20), _texto(consulta, "orden"),
+        _texto(consulta, "desc") == "1"))
+
+
+def crear_estudiante(consulta, cuerpo) -> Respuesta:
+    estudiante = estudiantes_ctrl.crear_estudiante(
+        _campo_texto(cuerpo, "id_estudiante"), _campo_texto(cuerpo, "nombre"), _campo_texto(cuerpo, "carrera"))
+    return HTTPStatus.CREATED, _registro(estudiante)
+
+
+def obtener_estudiante(consulta, cuerpo, id_estudiante: str) -> Respuesta:
+    estudiante = estudiantes_ctrl.obtener_estudiante_por_id(id_estudiante)
+    return HTTPStatus.OK, _registro(_encontrado(estudiante, "estudiante", id_estudiante))
+
+
+def actualizar_estudiante(consulta, cuerpo, id_estudiante: str) -> Respuesta:
+    _encontrado(estudiantes_ctrl.obtener_estudiante_por_id(id_estudiante), "estudiante", id_estudiante)
+    estudiante = estudiantes_ctrl.actualizar_estudiante(id_estudiante, _campo_texto(cuerpo, "nombre"),
+                                                        _campo_texto(cuerpo, "carrera"))
+    return HTTPStatus.OK, _registro(estudiante)
+
+
+def eliminar_estudiante(consulta, cuerpo, id_estudiante: str) -> Respuesta:
+    _encontrado(estudiantes_ctrl.obtener_estudiante_por_id(id_estudiante), "estudiante", id_estudiante)
+    estudiantes_ctrl.eliminar_estudiante(id_estudiante)
+    return HTTPStatus.NO_CONTENT, None
+
+
+def matriculas_de_estudiante(consulta, cuerpo, id_estudiante: str) -> Respuesta:
+    _encontrado(estudiantes_ctrl.obtener_estudiante_por_id(id_estudiante), "estudiante", id_estudiante)
+    matriculas = matriculas_ctrl.obtener_matriculas_por_estudiante(id_estudiante, _texto(consulta, "periodo"))
+    return HTTPStatus.OK, [_registro(m) for m in matriculas]
+
+
+def creditos_de_estudiante(consulta, cuerpo, id_estudiante: str) -> Respuesta:
+    _encontrado(estudiantes_ctrl.obtener_estudiante_por_id(id_estudiante), "estudiante", id_estudiante)
+    periodo = _texto(consulta, "periodo")
+    if not periodo:
+        raise ValueError("Falta el parámetro 'periodo'.")
+    creditos = matriculas_ctrl.calcular_creditos_estudiante(id_estudiante, periodo)
+    return HTTPStatus.OK, {"id_estudiante": id_estudiante, "periodo": periodo, "creditos": creditos}
+
+
+def listar_cursos(consulta, cuerpo) -> Respuesta:
+    texto = _texto(consulta, "buscar")
+    if texto is not None:
+        return HTTPStatus.OK, [_registro(c) for c in cursos_ctrl.buscar_cursos(texto)]
+    return HTTPStatus.OK, _pagina(cursos_ctrl.obtener_pagina_cursos(
+        _entero(consulta, "pagina", 1), _entero(consulta, "tamano", 20), _texto(consulta, "orden"),
+        _texto(consulta, "desc") == "1"))
+
+
+def crear_curso(consulta, cuerpo) -> Respuesta:
+    curso = cursos_ctrl.crear_curso(_campo_texto(cuerpo, "id_curso"), _campo_texto(cuerpo, "nombre_curso"),
+                                    _campo_entero(cuerpo, "creditos"))
+    return HTTPStatus.CREATED, _registro(curso)
+
+
+def obtener_curso(consulta, cuerpo, id_curso: str) -> Respuesta:
+    return HTTPStatus.OK, _registro(_encontrado(cursos_ctrl.obtener_curso_por_id(id_curso), "curso", id_curso))
+
+
+def actualizar_curso(consulta, cuerpo, id_curso: str) -> Respuesta:
+    _encontrado(cursos_ctrl.obtener_curso_por_id(id_curso), "curso", id_curso)
+    curso = cursos_ctrl.actualizar_curso(id_curso, _campo_texto(cuerpo, "nombre_curso"),
+                                         _campo_entero(cuerpo, "creditos"))
+    return HTTPStatus.OK, _registro(curso)
+
+
+def eliminar_curso(consulta, cuerpo, id_curso: str) -> Respuesta:
+    _encontrado(cursos_ctrl.obtener_curso_por_id(id_curso), "curso", id_curso)
+    cursos_ctrl.eliminar_curso(id_curso)
+    return HTTPStatus.NO_CONTENT, None
+
+
+def estudiantes_de_curso(consulta, cuerpo, id_curso: str) -> Respuesta:
+    _encontrado(cursos_ctrl.obtener_curso_por_id(id_curso), "curso", id_curso)
+    return HTTPStatus.OK, _pagina(matriculas_ctrl.obtener_pagina_estudiantes_por_curso(
+        id_curso, _entero(consulta, "pagina", 1), _entero(consulta, "tamano", 20),
+        periodo=_texto(consulta, "periodo")))
+
+
+def matricular(consulta, cuerpo) -> Respuesta:
+    id_cursos = _campo(cuerpo, "id_cursos")
+    if not isinstance(id_cursos, list) or not all(isinstance(id_curso, str) and id_curso for id_curso in id_cursos):
+        raise ValueError("El campo 'id_cursos' debe ser una lista de textos.")
+    matricula = matriculas_ctrl.matricular_estudiante(_campo_texto(cuerpo, "id_estudiante"), id_cursos,
+                                                      _campo_texto(cuerpo, "periodo"))
+    return HTTPStatus.CREATED, _registro(matricula)
+
+
+def reporte_carga(consulta, cuerpo) -> Respuesta:
+    # Con los agregados y las tablas de la caché: no vuelve a leer los archivos
+    reporte = reportes_ctrl.reporte_carga_precalculado(
+        _texto(consulta, "periodo"), _entero(consulta, "limite", reportes_ctrl.LIMITE_CREDITOS_PERIODO))
+    return HTTPStatus.OK, {
+        "periodo": reporte.periodo,
+        "estudiantes": len(reporte.totales),
+        "promedio": reporte.promedio,
+        "maximo": reporte.maximo,
+        "distribucion": {str(creditos): cantidad for creditos, cantidad in reporte.distribucion.items()},
+        "sobrecargas": [{"id_estudiante": e, "periodo": p, "creditos": c} for e, p, c in reporte.sobrecargas],
+    }
+
+
+def diagnostico(consulta, cuerpo) -> Respuesta:
+    return HTTPStatus.OK, instrumentacion.instantanea()
+
+
+# (método, ruta, operación); las rutas de escritura son las que no usan GET
+RUTAS: List[Tuple[str, str, Callable[..., Respuesta]]] = [
+    ("GET", r"/estudiantes", listar_estudiantes),
+    ("POST", r"/estudiantes", crear_estudiante),
+    ("GET", r"/estudiantes/([^/]+)", obtener_estudiante),
+    ("PUT", r"/estudiantes/([^/]+)", actualizar_estudiante),
+    ("DELETE", r"/estudiantes/([^/]+)", eliminar_estudiante),
+    ("GET", r"/estudiantes/([^/]+)/matriculas", matriculas_de_estudiante),
+    ("GET", r"/estudiantes/([^/]+)/creditos", creditos_de_estudiante),
+    ("GET", r"/cursos", listar_cursos),
+    ("POST", r"/cursos", crear_curso),
+    ("GET", r"/cursos/([^/]+)", obtener_curso),
+    ("PUT", r"/cursos/([^/]+)", actualizar_curso),
+    ("DELETE", r"/cursos/([^/]+)", eliminar_curso),
+    ("GET", r"/cursos/([^/]+)/estudiantes", estudiantes_de_curso),
+    ("POST", r"/matriculas", matricular),
+    ("GET", r"/reportes/carga", reporte_carga),
+    ("GET", r"/diagnostico", diagnostico),
+]
+_RUTAS = [(metodo, re.compile(patron + r"/?"), operacion) for metodo, patron, operacion in RUTAS]
+
+
+def resolver(metodo: str, ruta: str) -> Tuple[Callable[..., Respuesta], Tuple[str, ...]]:
+    """Operación y grupos de la ruta; ErrorHTTP 404 o 405 si no hay ninguna."""
+    encontrada = False
+    for metodo_ruta, patron, operacion in _RUTAS:
+        coincidencia = patron.fullmatch(ruta)
+        if coincidencia:
+            encontrada = True
+            if metodo_ruta == metodo:
+                return operacion, tuple(unquote(g) for g in coincidencia.groups())
+    if encontrada:
+        raise ErrorHTTP(HTTPStatus.METHOD_NOT_ALLOWED, f"Método {metodo} no permitido en {ruta}.")
+    raise ErrorHTTP(HTTPStatus.NOT_FOUND, f"No existe la ruta {ruta}.")
+
+
+# --- Servidor ---
+
+class ManejadorAPI(BaseHTTPRequestHandler):
+    server: "ServidorAPI"
+
+    def do_GET(self):
+        self._atender("GET")
+
+    def do_POST(self):
+        self._atender("POST")
+
+    def do_PUT(self):
+        self._atender("PUT")
+
+    def do_DELETE(self):
+        self._atender("DELETE")
+
+    def _atender(self, metodo: str):
+        partes = urlsplit(self.path)
+        try:
+            operacion, grupos = resolver(metodo, partes.path)
+            consulta = parse_qs(partes.query)
+            cuerpo = self._leer_cuerpo() if metodo in ("POST", "PUT") else None
+            bloqueo = self.server.bloqueo
+            with (bloqueo.leyendo() if metodo == "GET" else bloqueo.escribiendo()):
+                estado, datos = operacion(consulta, cuerpo, *grupos)
+        except ErrorHTTP as e:
+            estado, datos = e.estado, {"error": str(e)}
+        except ValueError as e:
+            estado, datos = HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        except Exception as e:
+            self.log_error("Error inesperado en %s %s: %r", metodo, self.path, e)
+            estado, datos = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"Ocurrió un error inesperado: {e}"}
+        self._responder(estado, datos)
+
+    def _leer_cuerpo(self) -> Dict[str, Any]:
+        try:
+            largo = int(self.headers.get("Content-Length", 0))
+        except ValueError as e:
+            raise ErrorHTTP(HTTPStatus.BAD_REQUEST, "Content-Length inválido.") from e
+        if largo < 0:
+            # rfile.read(-1) esperaría a que el cliente cierre la conexión
+            raise ErrorHTTP(HTTPStatus.BAD_REQUEST, "Content-Length inválido.")
+        if largo > MAX_CUERPO:
+            raise ErrorHTTP(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "El cuerpo de la solicitud es demasiado grande.")
+        try:
+            cuerpo = json.loads(self.rfile.read(largo) or b"{}")
+        except ValueError as e:
+            raise ErrorHTTP(HTTPStatus.BAD_REQUEST, "El cuerpo no es JSON válido.") from e
+        if not isinstance(cuerpo, dict):
+            raise ErrorHTTP(HTTPStatus.BAD_REQUEST, "El cuerpo debe ser un objeto JSON.")
+        return cuerpo
+
+    def _responder(self, estado: HTTPStatus, datos: Any):
+        self.send_response(estado)
+        if estado == HTTPStatus.NO_CONTENT:
+            self.end_headers()
+            return
+        contenido = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(contenido)))
+        self.end_headers()
+        self.wfile.write(contenido)
+
+    def log_message(self, formato: str, *args):
+        if self.server.registrar_solicitudes:
+            super().log_message(formato, *args)
+
+
+class ServidorAPI(HTTPServer):
+    """HTTPServer que atiende cada conexión en un grupo fijo de hilos."""
+
+    def __init__(self, direccion: Tuple[str, int], hilos: int = HILOS, registrar_solicitudes: bool = True):
+        super().__init__(direccion, ManejadorAPI)
+        self.bloqueo = LectoresEscritor()
+        self.registrar_solicitudes = registrar_solicitudes
+        self._hilos = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="api")
+
+    def process_request(self, request, client_address):
+        self._hilos.submit(self._atender_conexion, request, client_address)
+
+    def _atender_conexion(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._hilos.shutdown(wait=True)
+
+
+def precargar():
+    """Carga las tablas y los agregados en la caché antes de aceptar solicitudes."""
+    repositorio.estudiantes()
+    repositorio.cursos()
+    repositorio.matriculas()
+    agregados.obtener()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API HTTP/JSON del sistema de matrículas.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8000)
+    parser.add_argument("--hilos", type=int, default=HILOS, help=f"hilos que atienden solicitudes (por defecto: {HILOS})")
+    args = parser.parse_args()
+
+    instrumentacion.activar_desde_entorno()
+    precargar()
+    servidor = ServidorAPI((args.host, args.puerto), max(1, args.hilos))
+    print(f"Escuchando en http://{args.host}:{servidor.server_port} con {args.hilos} hilo(s). Ctrl+C para terminar.")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
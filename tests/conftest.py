@@ -0,0 +1,37 @@
+# tests/conftest.py
+import pytest
+import csv
+import json
+from controlador import common
+
+
+# --- Fixture ---
+# Datos de prueba mínimos (un estudiante, un curso, ninguna matrícula) en un
+# directorio temporal; los archivos de prueba pueden extenderlo redefiniéndolo
+@pytest.fixture
+def setup_test_data(tmp_path):
+    original_est_file = common.ESTUDIANTES_FILE
+    original_cur_file = common.CURSOS_FILE
+    original_mat_file = common.MATRICULAS_FILE
+    temp_data_dir = tmp_path / "data"
+    temp_data_dir.mkdir()
+    temp_est_file = temp_data_dir / "estudiantes.csv"
+    temp_cur_file = temp_data_dir / "cursos.csv"
+    temp_mat_file = temp_data_dir / "matriculas.json"
+    with open(temp_est_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id_estudiante', 'nombre', 'carrera'])
+        writer.writerow(['E100', 'Estudiante Prueba', 'Carrera Prueba'])
+    with open(temp_cur_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id_curso', 'nombre_curso', 'creditos'])
+        writer.writerow(['C100', 'Curso Prueba', '3'])
+    with open(temp_mat_file, 'w') as f:
+        json.dump([], f)
+    common.ESTUDIANTES_FILE = str(temp_est_file)
+    common.CURSOS_FILE = str(temp_cur_file)
+    common.MATRICULAS_FILE = str(temp_mat_file)
+    yield
+    common.ESTUDIANTES_FILE = original_est_file
+    common.CURSOS_FILE = original_cur_file
+    common.MATRICULAS_FILE = original_mat_file
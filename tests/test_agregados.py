@@ -0,0 +1,56 @@
+# tests/test_agregados.py
+import pytest
+from controlador import estudiantes_ctrl, cursos_ctrl, matriculas_ctrl, repositorio, reportes_ctrl, agregados
+
+
+# --- Fixture ---
+@pytest.fixture
+def datos_reporte(setup_test_data):
+    """Dos estudiantes y dos cursos, con matrículas en dos períodos."""
+    estudiantes_ctrl.crear_estudiante("E101", "Segundo Estudiante", "Otra Carrera")
+    cursos_ctrl.crear_curso("C101", "Curso Avanzado", 5)
+    matriculas_ctrl.matricular_estudiante("E100", ["C100", "C101"], "2025-T1")
+    matriculas_ctrl.matricular_estudiante("E101", ["C101"], "2025-T1")
+    matriculas_ctrl.matricular_estudiante("E100", ["C100"], "2025-T2")
+
+
+
+
+# --- Pruebas de Agregados ---
+
+def test_agregados_iniciales(datos_reporte):
+    assert agregados.matriculas_por_curso() == {"C100": 2, "C101": 2}
+    assert agregados.creditos_por_estudiante("2025-T1") == {"E100": 8, "E101": 5}
+    assert agregados.creditos_por_estudiante() == {"E100": 11, "E101": 5}
+    assert agregados.estudiantes_por_carrera("2025-T1") == {"Carrera Prueba": 1, "Otra Carrera": 1}
+    assert agregados.verificar() == []
+
+def test_agregados_se_actualizan_con_los_cambios(datos_reporte):
+    agregados.obtener()
+    matriculas_ctrl.matricular_estudiante("E101", ["C100"], "2025-T2")
+    cursos_ctrl.actualizar_curso("C101", "Curso Avanzado", 6)
+    estudiantes_ctrl.actualizar_estudiante("E101", "Segundo Estudiante", "Carrera Prueba")
+    assert agregados.creditos_por_estudiante("2025-T1") == {"E100": 9, "E101": 6}
+    assert agregados.estudiantes_por_carrera("2025-T2") == {"Carrera Prueba": 2}
+
+    tabla = repositorio.matriculas()
+    for m in matriculas_ctrl.obtener_matriculas_por_estudiante("E100"):
+        repositorio.eliminar_matricula(tabla, m.id_matricula)
+    assert agregados.matriculas_por_curso() == {"C100": 1, "C101": 1}
+    assert agregados.creditos_por_estudiante() == {"E101": 9}
+    assert agregados.estudiantes_por_carrera("2025-T1") == {"Carrera Prueba": 1}
+    assert agregados.verificar() == []
+
+def test_verificar_detecta_y_reconstruir_corrige(datos_reporte):
+    agregados.obtener().matriculas_por_curso["C100"] = 99
+    assert agregados.verificar() == ["matriculas_por_curso['C100']: 99 en lugar de 2"]
+    agregados.reconstruir()
+    assert agregados.verificar() == []
+
+def test_agregados_coinciden_con_reporte_en_flujo(datos_reporte):
+    estudiantes_ctrl.crear_estudiante("E102", "Sin Matricula", "Otra Carrera")
+    for periodo in ("2025-T1", "2025-T2", None):
+        en_flujo = reportes_ctrl.reporte_carga_creditos(periodo, limite=4)
+        precalculado = reportes_ctrl.reporte_carga_precalculado(periodo, limite=4)
+        assert precalculado == en_flujo
+        assert agregados.creditos_por_estudiante(periodo) == {e: c for e, c in en_flujo.totales.items() if c}
@@ -0,0 +1,73 @@
+# tests/test_almacen_binario.py
+import pytest
+import csv
+import os
+from modelo.entidades import Estudiante, Curso, Matricula
+from controlador import estudiantes_ctrl, cursos_ctrl, matriculas_ctrl, common, repositorio, almacen_binario
+
+# --- Fixture ---
+@pytest.fixture
+def binario(setup_test_data, monkeypatch):
+    monkeypatch.setattr(common, "USAR_BINARIO", True)
+    repositorio.invalidar()
+
+
+# --- Pruebas de Instantáneas Binarias ---
+
+def test_ida_y_vuelta(setup_test_data):
+    matriculas = [Matricula("M002", "E100", "2025-T1", ["C100", "C200"]), Matricula("M001", "É101", "2025-T1", []),
+                  Matricula("M003", "E100", "2025-T2", ["C300"])]
+    common.guardar_datos_json(common.MATRICULAS_FILE, matriculas)
+    assert almacen_binario.guardar(common.MATRICULAS_FILE, matriculas, Matricula)
+
+    with almacen_binario.abrir(common.MATRICULAS_FILE, Matricula) as instantanea:
+        assert len(instantanea) == 3
+        assert list(instantanea) == matriculas
+        assert instantanea.registro(1) == matriculas[1]
+        assert instantanea.obtener("M003") == matriculas[2]
+        assert instantanea.obtener("M000") is None and instantanea.obtener("M999") is None
+    assert almacen_binario.abrir(common.CURSOS_FILE, Curso) is None
+
+def test_instantanea_vieja_o_de_otra_entidad_se_ignora(setup_test_data):
+    estudiantes = [Estudiante("E100", "Estudiante Prueba", "Carrera Prueba")]
+    assert almacen_binario.guardar(common.ESTUDIANTES_FILE, estudiantes, Estudiante)
+    assert almacen_binario.abrir(common.ESTUDIANTES_FILE, Curso) is None
+    with open(common.ESTUDIANTES_FILE, 'a', newline='') as f:
+        csv.writer(f).writerow(['E555', 'Escrito Afuera', 'Externa'])
+    assert almacen_binario.abrir(common.ESTUDIANTES_FILE, Estudiante) is None
+
+def test_repositorio_carga_y_regenera(binario):
+    ruta = almacen_binario.ruta_binaria(common.ESTUDIANTES_FILE)
+    assert repositorio.estudiantes().obtener("E100").nombre == "Estudiante Prueba"
+    assert os.path.exists(ruta)
+
+    # Un alta solo agrega al CSV: la instantánea queda vieja y la próxima carga la regenera
+    estudiantes_ctrl.crear_estudiante("E101", "Otro Estudiante", "Derecho")
+    assert almacen_binario.abrir(common.ESTUDIANTES_FILE, Estudiante) is None
+    repositorio.invalidar()
+    assert len(repositorio.estudiantes()) == 2
+    with almacen_binario.abrir(common.ESTUDIANTES_FILE, Estudiante) as instantanea:
+        assert len(instantanea) == 2
+
+    # Una modificación reescribe el CSV y regenera la instantánea al guardarlo
+    estudiantes_ctrl.actualizar_estudiante("E100", "Nombre Nuevo", "Medicina")
+    repositorio.invalidar()
+    with almacen_binario.abrir(common.ESTUDIANTES_FILE, Estudiante) as instantanea:
+        assert [e.id_estudiante for e in instantanea] == ["E100", "E101"]
+    assert [e.nombre for e in repositorio.estudiantes()] == ["Nombre Nuevo", "Otro Estudiante"]
+
+def test_obtener_por_id_sin_cargar_la_tabla(binario, monkeypatch):
+    cursos_ctrl.crear_curso("C200", "Curso Dos", 4)
+    matriculas_ctrl.matricular_estudiante("E100", ["C100", "C200"], "2025-T1")
+    # Las cargas en frío regeneran las instantáneas que dejaron viejas las altas
+    repositorio.invalidar()
+    repositorio.cursos()
+    repositorio.invalidar()
+
+    def sin_parsear(*args):
+        raise AssertionError("no debería leer el CSV")
+    monkeypatch.setattr(common, "cargar_datos_csv", sin_parsear)
+    assert estudiantes_ctrl.obtener_estudiante_por_id("E100").carrera == "Carrera Prueba"
+    assert estudiantes_ctrl.obtener_estudiante_por_id("E999") is None
+    assert cursos_ctrl.obtener_curso_por_id("C200").creditos == 4
+    assert matriculas_ctrl.calcular_creditos_estudiante("E100", "2025-T1") == 7
@@ -0,0 +1,93 @@
+# tests/test_almacen_sqlite.py
+import pytest
+import os
+from controlador import estudiantes_ctrl, cursos_ctrl, matriculas_ctrl, common, almacen_sqlite, repositorio
+from modelo.entidades import Estudiante, Matricula
+
+
+# --- Fixture ---
+@pytest.fixture
+def setup_test_data(setup_test_data):
+    """Los datos de prueba de conftest.py, migrados a una base SQLite temporal."""
+    original_sqlite_file = common.SQLITE_FILE
+    original_backend = common.BACKEND
+    common.SQLITE_FILE = os.path.join(os.path.dirname(common.ESTUDIANTES_FILE), "matriculas.db")
+    almacen_sqlite.migrar_desde_archivos()
+    common.BACKEND = "sqlite"
+    yield
+    almacen_sqlite.cerrar()
+    common.SQLITE_FILE = original_sqlite_file
+    common.BACKEND = original_backend
+
+
+# --- Pruebas del Backend SQLite ---
+
+def test_crud_estudiantes_sqlite(setup_test_data):
+    """Prueba el ciclo completo de un estudiante sobre SQLite."""
+    estudiantes_ctrl.crear_estudiante("E101", "Nuevo Estudiante", "Nueva Carrera")
+    with pytest.raises(ValueError, match="ya existe"):
+        estudiantes_ctrl.crear_estudiante("E101", "Otro", "Otra")
+
+    estudiantes_ctrl.actualizar_estudiante("E101", "Nombre Actualizado", "Carrera Actualizada")
+    assert estudiantes_ctrl.obtener_estudiante_por_id("E101").nombre == "Nombre Actualizado"
+
+    estudiantes_ctrl.eliminar_estudiante("E101")
+    assert [e.id_estudiante for e in estudiantes_ctrl.obtener_estudiantes()] == ["E100"]
+
+    # Como Tabla.actualizar, actualizar un registro que no existe es un error
+    with pytest.raises(KeyError):
+        repositorio.estudiantes().actualizar(Estudiante("E999", "Nadie", "Ninguna"))
+    assert "E999" not in repositorio.estudiantes()
+
+
+def test_matriculas_y_reportes_sqlite(setup_test_data):
+    """Prueba matrículas, filtros por índice y validaciones de integridad sobre SQLite."""
+    cursos_ctrl.crear_curso("C101", "Curso Avanzado", 5)
+    matriculas_ctrl.matricular_estudiante("E100", ["C100", "C101"], "2025-T1")
+    matriculas_ctrl.matricular_estudiante("E100", ["C101"], "2025-T2")
+
+    assert matriculas_ctrl.calcular_creditos_estudiante("E100", "2025-T1") == 8
+    assert [e.id_estudiante for e in matriculas_ctrl.obtener_estudiantes_por_curso("C101")] == ["E100"]
+    assert [m.id_cursos for m in matriculas_ctrl.obtener_matriculas_por_estudiante("E100")] == [["C100", "C101"], ["C101"]]
+
+    # El filtro por período lo resuelve la consulta
+    assert [m.periodo_academico for m in matriculas_ctrl.obtener_matriculas_por_estudiante("E100", "2025-T2")] == ["2025-T2"]
+    assert [e.id_estudiante for e in matriculas_ctrl.obtener_estudiantes_por_curso("C100", "2025-T2")] == []
+    assert [m.id_matricula for m in repositorio.matriculas().buscar('id_curso', "C101", "2025-T1")] == ["M001"]
+
+    with pytest.raises(ValueError, match="El curso está en la matrícula 'M001'"):
+        cursos_ctrl.eliminar_curso("C100")
+    with pytest.raises(ValueError, match="tiene 2 matrícula"):
+        estudiantes_ctrl.eliminar_estudiante("E100")
+
+
+def test_migracion_importa_archivos(setup_test_data):
+    """Prueba que la migración importe las matrículas con sus cursos."""
+    common.guardar_datos_json(common.MATRICULAS_FILE, [Matricula("M001", "E100", "2025-T1", ["C100"])])
+    importados = almacen_sqlite.migrar_desde_archivos()
+
+    assert importados == {"estudiantes": 1, "cursos": 1, "matriculas": 1}
+    assert almacen_sqlite.cargar_datos_sqlite(Matricula) == [Matricula("M001", "E100", "2025-T1", ["C100"])]
+    # Los datos del backend de archivos no se tocan
+    assert common.cargar_datos_json(common.MATRICULAS_FILE)[0].id_matricula == "M001"
+
+
+def test_iterar_datos_sqlite(setup_test_data):
+    """Prueba que el recorrido con cursor arme las mismas matrículas que la carga completa."""
+    cursos_ctrl.crear_curso("C101", "Curso Avanzado", 5)
+    matriculas_ctrl.matricular_estudiante("E100", ["C101", "C100"], "2025-T1")
+    matriculas_ctrl.matricular_estudiante("E100", [], "2025-T2")
+
+    assert list(almacen_sqlite.iterar_datos_sqlite(Matricula)) == almacen_sqlite.cargar_datos_sqlite(Matricula)
+    assert [m.id_cursos for m in almacen_sqlite.iterar_datos_sqlite(Matricula)] == [["C101", "C100"], []]
+
+
+def test_paginar_sqlite(setup_test_data):
+    """Prueba que la base de datos pagine y ordene igual que la tabla en memoria."""
+    for i, nombre in enumerate(["beta", "Alfa", "gamma"], start=1):
+        estudiantes_ctrl.crear_estudiante(f"E20{i}", nombre, "Carrera")
+    pagina = estudiantes_ctrl.obtener_pagina_estudiantes(2, 2)
+    assert [e.id_estudiante for e in pagina.registros] == ["E202", "E203"]
+    assert (pagina.total, pagina.total_paginas) == (4, 2)
+    ordenada = estudiantes_ctrl.obtener_pagina_estudiantes(1, 2, orden="nombre", descendente=True)
+    assert [e.nombre for e in ordenada.registros] == ["gamma", "Estudiante Prueba"]
@@ -0,0 +1,63 @@
+# tests/test_asincrono.py
+import pytest
+import asyncio
+import inspect
+import time
+from controlador import estudiantes_ctrl, cursos_ctrl, matriculas_ctrl, common, repositorio, asincrono
+
+
+# --- Pruebas de la API Async ---
+
+def test_todas_las_funciones_tienen_version_async():
+    for modulo in (estudiantes_ctrl, cursos_ctrl, matriculas_ctrl):
+        for nombre, funcion in inspect.getmembers(modulo, inspect.isfunction):
+            if nombre.startswith('_') or funcion.__module__ != modulo.__name__:
+                continue
+            assert inspect.iscoroutinefunction(getattr(asincrono, nombre, None)), nombre
+
+def test_operaciones_async(setup_test_data):
+    async def escenario():
+        await asincrono.crear_estudiante("E101", "Otro Estudiante", "Derecho")
+        matricula = await asincrono.matricular_estudiante("E101", ["C100"], "2025-T1")
+        creditos = await asincrono.calcular_creditos_estudiante("E101", "2025-T1")
+        en_curso = await asincrono.obtener_estudiantes_por_curso("C100")
+        return matricula, creditos, en_curso
+
+    matricula, creditos, en_curso = asyncio.run(escenario())
+    assert matricula.id_estudiante == "E101"
+    assert creditos == 3
+    assert [e.id_estudiante for e in en_curso] == ["E101"]
+
+def test_errores_se_propagan(setup_test_data):
+    with pytest.raises(ValueError):
+        asyncio.run(asincrono.crear_curso("C100", "Repetido", 3))
+
+def test_lecturas_concurrentes_cargan_una_vez(setup_test_data, monkeypatch):
+    """Varias lecturas simultáneas del mismo archivo lo parsean una sola vez."""
+    repositorio.invalidar()
+    cargas = []
+    original = common.cargar_datos_csv
+
+    def cargar_lento(archivo, modelo):
+        cargas.append(archivo)
+        time.sleep(0.05)
+        return original(archivo, modelo)
+
+    monkeypatch.setattr(common, "cargar_datos_csv", cargar_lento)
+
+    async def leer_todos():
+        return await asyncio.gather(*(asincrono.obtener_estudiantes() for _ in range(10)))
+
+    resultados = asyncio.run(leer_todos())
+    assert cargas == [common.ESTUDIANTES_FILE]
+    assert all(len(r) == 1 for r in resultados)
+
+def test_escrituras_concurrentes(setup_test_data):
+    async def matricular_varios():
+        return await asyncio.gather(*(asincrono.matricular_estudiante("E100", ["C100"], f"P{i}")
+                                      for i in range(20)))
+
+    matriculas = asyncio.run(matricular_varios())
+    assert len({m.id_matricula for m in matriculas}) == 20
+    repositorio.invalidar()
+    assert len(matriculas_ctrl.obtener_matriculas_por_estudiante("E100")) == 20
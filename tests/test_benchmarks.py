@@ -0,0 +1,37 @@
+# tests/test_benchmarks.py
+from controlador import common
+from modelo.entidades import Estudiante
+from benchmarks import generador, ejecutar, cierre
+
+
+# --- Pruebas del Generador y de los Casos de Benchmark ---
+
+def test_generador_es_determinista(tmp_path):
+    """Prueba que la misma semilla produzca los mismos archivos y que se puedan cargar."""
+    rutas_a = generador.generar(str(tmp_path / "a"), 200, semilla=7)
+    rutas_b = generador.generar(str(tmp_path / "b"), 200, semilla=7)
+    for nombre in rutas_a:
+        with open(rutas_a[nombre], 'rb') as a, open(rutas_b[nombre], 'rb') as b:
+            assert a.read() == b.read()
+    assert len(common.cargar_datos_csv(rutas_a["estudiantes"], Estudiante)) == 200
+    matriculas = common.cargar_datos_json(rutas_a["matriculas"])
+    assert 200 <= len(matriculas) <= 800
+    assert generador.escala("10k") == 10_000
+
+def test_todas_las_funciones_publicas_tienen_caso():
+    assert set(ejecutar.funciones_publicas()) <= set(ejecutar.CASOS)
+
+def test_casos_se_ejecutan(tmp_path):
+    """Ejecuta todos los casos sobre una escala mínima y verifica que se restauren las rutas."""
+    original = common.ESTUDIANTES_FILE
+    resultados = ejecutar.medir_escala(60, repeticiones=2)
+    assert {r["funcion"] for r in resultados} == set(ejecutar.CASOS)
+    assert all(r["frio_s"] >= 0 and r["mediana_s"] >= 0 for r in resultados)
+    assert common.ESTUDIANTES_FILE == original
+
+def test_cierre_se_mide(tmp_path):
+    original = common.ESTUDIANTES_FILE
+    resultados = cierre.medir(60, [1, 2], repeticiones=1)
+    assert [r["procesos"] for r in resultados] == [1, 2]
+    assert all(r["matriculas_por_s"] > 0 for r in resultados)
+    assert common.ESTUDIANTES_FILE == original
@@ -0,0 +1,157 @@
+# tests/test_bloqueo.py
+import pytest
+import os
+import subprocess
+import sys
+import threading
+from controlador import estudiantes_ctrl, common, repositorio
+from controlador import bloqueo
+from controlador.bloqueo import bloquear
+from modelo.entidades import Estudiante
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _proceso(codigo: str, *args: str) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-c", codigo, *args], cwd=RAIZ,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+
+TOMAR_BLOQUEO = """
+import sys
+from controlador.bloqueo import bloquear
+with bloquear(sys.argv[1], compartido=sys.argv[2] == "compartido"):
+    print("ok")
+"""
+
+ESCRIBIR_ESTUDIANTES = """
+import sys
+from controlador import common, estudiantes_ctrl, repositorio
+common.ESTUDIANTES_FILE, common.CURSOS_FILE, common.MATRICULAS_FILE, prefijo = sys.argv[1:5]
+
+def reintentar(funcion, *args):
+    while True:
+        try:
+            return funcion(*args)
+        except repositorio.ConflictoConcurrente:
+            pass
+
+for i in range(10):
+    reintentar(estudiantes_ctrl.crear_estudiante, f"{prefijo}{i}", "Nuevo", "Carrera")
+    reintentar(estudiantes_ctrl.actualizar_estudiante, f"{prefijo}{i}", "Actualizado", "Carrera")
+"""
+
+
+# --- Pruebas de Bloqueos entre Procesos ---
+
+def test_lectores_no_se_bloquean_entre_procesos(tmp_path):
+    ruta = str(tmp_path / "datos.csv")
+    with bloquear(ruta, compartido=True):
+        lector = _proceso(TOMAR_BLOQUEO, ruta, "compartido")
+        assert lector.communicate(timeout=10)[0].strip() == "ok"
+
+def test_escritor_espera_a_los_lectores(tmp_path):
+    ruta = str(tmp_path / "datos.csv")
+    with bloquear(ruta, compartido=True):
+        escritor = _proceso(TOMAR_BLOQUEO, ruta, "exclusivo")
+        with pytest.raises(subprocess.TimeoutExpired):
+            escritor.communicate(timeout=0.5)
+    assert escritor.communicate(timeout=10)[0].strip() == "ok"
+
+def test_bloqueo_anidado_en_el_mismo_hilo(tmp_path):
+    """Pedir el bloqueo exclusivo mientras el mismo hilo tiene el compartido no lo bloquea."""
+    ruta = str(tmp_path / "datos.csv")
+    terminado = threading.Event()
+
+    def anidar():
+        with bloquear(ruta, compartido=True):
+            with bloquear(ruta):
+                with bloquear(ruta, compartido=True):
+                    terminado.set()
+
+    hilo = threading.Thread(target=anidar, daemon=True)
+    hilo.start()
+    hilo.join(5)
+    assert terminado.is_set()
+
+
+@pytest.mark.skipif(bloqueo.fcntl is None, reason="la conversión de bloqueos solo existe con fcntl")
+def test_convertir_a_exclusivo_detecta_escritura_en_el_medio(tmp_path, monkeypatch):
+    """Si otro proceso escribe mientras se convierte el bloqueo compartido, no se escribe encima."""
+    ruta = str(tmp_path / "datos.csv")
+    with open(ruta, 'w') as f:
+        f.write("a\n")
+    flock = bloqueo.fcntl.flock
+
+    def flock_con_escritor(descriptor, operacion):
+        if operacion == bloqueo.fcntl.LOCK_EX:
+            with open(ruta, 'a') as f:
+                f.write("b\n")
+        flock(descriptor, operacion)
+
+    with bloquear(ruta, compartido=True):
+        monkeypatch.setattr(bloqueo.fcntl, "flock", flock_con_escritor)
+        with pytest.raises(repositorio.ConflictoConcurrente):
+            with bloquear(ruta):
+                pass
+        monkeypatch.setattr(bloqueo.fcntl, "flock", flock)
+
+
+def test_bloqueo_en_windows_tiene_limite_de_espera(tmp_path, monkeypatch):
+    """Un bloqueo que nunca se libera no deja el proceso esperando para siempre."""
+    class MsvcrtOcupado:
+        LK_NBLCK, LK_UNLCK = 2, 0
+
+        @staticmethod
+        def locking(descriptor, modo, cantidad):
+            raise OSError("bloqueado")
+
+    monkeypatch.setattr(bloqueo, "fcntl", None)
+    monkeypatch.setattr(bloqueo, "msvcrt", MsvcrtOcupado, raising=False)
+    monkeypatch.setattr(bloqueo, "ESPERA_MAXIMA", 0.05)
+    with pytest.raises(TimeoutError):
+        with bloquear(str(tmp_path / "datos.csv")):
+            pass
+
+
+# --- Pruebas de Escritura Atómica y Conflictos ---
+
+def test_guardar_csv_fallido_no_toca_el_archivo(setup_test_data):
+    def datos_con_error():
+        yield Estudiante("E200", "Nuevo", "Carrera")
+        raise OSError("disco lleno")
+
+    with open(common.ESTUDIANTES_FILE, 'rb') as f:
+        original = f.read()
+    assert not common.guardar_datos_csv(common.ESTUDIANTES_FILE, datos_con_error(), common.ENCABEZADOS_ESTUDIANTES)
+    with open(common.ESTUDIANTES_FILE, 'rb') as f:
+        assert f.read() == original
+    assert not os.path.exists(common.ESTUDIANTES_FILE + ".tmp")
+
+def test_conflicto_si_otro_proceso_escribio(setup_test_data):
+    tabla = repositorio.estudiantes()
+    # Otro proceso agrega un estudiante después de que esta tabla se cargó
+    common.agregar_datos_csv(common.ESTUDIANTES_FILE, [Estudiante("E300", "Externo", "Carrera")],
+                             common.ENCABEZADOS_ESTUDIANTES)
+    cambios = []
+    tabla.agregar_observador(lambda id_registro, registro: cambios.append(id_registro))
+    with pytest.raises(repositorio.ConflictoConcurrente):
+        repositorio.insertar_estudiante(tabla, Estudiante("E301", "Local", "Carrera"))
+    # La tabla que quedó vieja no se modificó ni avisó a sus observadores
+    assert "E301" not in tabla
+    assert cambios == []
+    # Repetir la operación la aplica sobre los datos nuevos
+    estudiantes_ctrl.crear_estudiante("E301", "Local", "Carrera")
+    ids = [e.id_estudiante for e in common.cargar_datos_csv(common.ESTUDIANTES_FILE, Estudiante)]
+    assert ids == ["E100", "E300", "E301"]
+
+def test_escrituras_desde_varios_procesos(setup_test_data):
+    """Altas y modificaciones desde cuatro procesos a la vez: no se pierde ninguna."""
+    rutas = (common.ESTUDIANTES_FILE, common.CURSOS_FILE, common.MATRICULAS_FILE)
+    procesos = [_proceso(ESCRIBIR_ESTUDIANTES, *rutas, f"P{n}-") for n in range(4)]
+    for proceso in procesos:
+        _, errores = proceso.communicate(timeout=60)
+        assert proceso.returncode == 0, errores
+    estudiantes = common.cargar_datos_csv(common.ESTUDIANTES_FILE, Estudiante)
+    assert len(estudiantes) == 41
+    assert all(e.nombre == "Actualizado" for e in estudiantes if e.id_estudiante != "E100")
@@ -0,0 +1,87 @@
+# tests/test_busqueda.py
+import pytest
+import csv
+import json
+from controlador import estudiantes_ctrl, cursos_ctrl, common, almacen_sqlite, busqueda
+
+
+# --- Fixture ---
+@pytest.fixture(params=["archivos", "sqlite"])
+def setup_test_data(tmp_path, request):
+    original_est_file = common.ESTUDIANTES_FILE
+    original_cur_file = common.CURSOS_FILE
+    original_mat_file = common.MATRICULAS_FILE
+    original_sqlite_file = common.SQLITE_FILE
+    original_backend = common.BACKEND
+    temp_data_dir = tmp_path / "data"
+    temp_data_dir.mkdir()
+    temp_est_file = temp_data_dir / "estudiantes.csv"
+    temp_cur_file = temp_data_dir / "cursos.csv"
+    temp_mat_file = temp_data_dir / "matriculas.json"
+    with open(temp_est_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id_estudiante', 'nombre', 'carrera'])
+        writer.writerow(['E100', 'José Pérez', 'Ingeniería de Sistemas'])
+        writer.writerow(['E101', 'Juliana García', 'Diseño Gráfico'])
+        writer.writerow(['E102', 'Ana Gómez', 'Ingeniería Civil'])
+    with open(temp_cur_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id_curso', 'nombre_curso', 'creditos'])
+        writer.writerow(['C100', 'Cálculo Diferencial', '4'])
+        writer.writerow(['C101', 'Física Mecánica', '3'])
+    with open(temp_mat_file, 'w') as f:
+        json.dump([], f)
+    common.ESTUDIANTES_FILE = str(temp_est_file)
+    common.CURSOS_FILE = str(temp_cur_file)
+    common.MATRICULAS_FILE = str(temp_mat_file)
+    common.SQLITE_FILE = str(temp_data_dir / "matriculas.db")
+    if request.param == "sqlite":
+        almacen_sqlite.migrar_desde_archivos()
+        common.BACKEND = "sqlite"
+    yield
+    almacen_sqlite.cerrar()
+    common.ESTUDIANTES_FILE = original_est_file
+    common.CURSOS_FILE = original_cur_file
+    common.MATRICULAS_FILE = original_mat_file
+    common.SQLITE_FILE = original_sqlite_file
+    common.BACKEND = original_backend
+
+
+def _ids(registros):
+    return [getattr(r, 'id_estudiante', None) or r.id_curso for r in registros]
+
+
+# --- Pruebas de Normalización ---
+
+def test_normalizar_y_coincide():
+    assert busqueda.normalizar("Pérez Ñandú") == "perez nandu"
+    assert busqueda.coincide(["Juliana García"], "ANA GAR")
+    assert not busqueda.coincide(["Juliana García"], "ana gar", solo_prefijo=True)
+    assert busqueda.coincide(["Ana Gómez"], "gom", solo_prefijo=True)
+
+
+# --- Pruebas de Búsqueda ---
+
+def test_buscar_sin_tildes_ni_mayusculas(setup_test_data):
+    assert _ids(estudiantes_ctrl.buscar_estudiantes("perez")) == ["E100"]
+    assert _ids(estudiantes_ctrl.buscar_estudiantes("INGENIERIA")) == ["E102", "E100"]  # Ordenados por nombre
+    assert _ids(cursos_ctrl.buscar_cursos("calculo dif")) == ["C100"]
+    assert estudiantes_ctrl.buscar_estudiantes("") == []
+
+def test_buscar_subcadena_y_prefijo(setup_test_data):
+    assert _ids(estudiantes_ctrl.buscar_estudiantes("ana")) == ["E102", "E101"]
+    assert _ids(estudiantes_ctrl.buscar_estudiantes("ana", solo_prefijo=True)) == ["E102"]
+    assert _ids(estudiantes_ctrl.buscar_estudiantes("j")) == ["E100", "E101"]
+    assert _ids(estudiantes_ctrl.buscar_estudiantes("ingenieria", campo="nombre")) == []
+    with pytest.raises(ValueError):
+        estudiantes_ctrl.buscar_estudiantes("ana", campo="id_estudiante")
+
+def test_indice_se_actualiza_con_los_cambios(setup_test_data):
+    assert _ids(estudiantes_ctrl.buscar_estudiantes("Zoe")) == []
+    estudiantes_ctrl.crear_estudiante("E103", "Zoé Ríos", "Música")
+    assert _ids(estudiantes_ctrl.buscar_estudiantes("zoe")) == ["E103"]
+    estudiantes_ctrl.actualizar_estudiante("E103", "Zoé Ramírez", "Música")
+    assert _ids(estudiantes_ctrl.buscar_estudiantes("rios")) == []
+    assert _ids(estudiantes_ctrl.buscar_estudiantes("ramirez")) == ["E103"]
+    estudiantes_ctrl.eliminar_estudiante("E103")
+    assert _ids(estudiantes_ctrl.buscar_estudiantes("zoe")) == []
@@ -0,0 +1,177 @@
+# tests/test_common.py
+import pytest
+import json
+import os
+from controlador import estudiantes_ctrl, cursos_ctrl, matriculas_ctrl, common
+from modelo.entidades import Estudiante, Matricula, a_dict
+
+
+# --- Pruebas de Altas por Adición ---
+
+def test_agregar_csv_sin_salto_final(tmp_path):
+    """Prueba que agregar una fila funcione aunque el archivo no termine en salto de línea."""
+    archivo = tmp_path / "estudiantes.csv"
+    archivo.write_text("id_estudiante,nombre,carrera\nE001,Ana,Software")
+
+    assert common.agregar_datos_csv(str(archivo), [Estudiante("E002", "Luis", "Diseno")],
+                                    common.ENCABEZADOS_ESTUDIANTES)
+    estudiantes = common.cargar_datos_csv(str(archivo), Estudiante)
+    assert [e.id_estudiante for e in estudiantes] == ["E001", "E002"]
+
+
+def test_agregar_csv_archivo_nuevo(tmp_path):
+    """Prueba que al agregar sobre un archivo inexistente se escriba el encabezado."""
+    archivo = tmp_path / "estudiantes.csv"
+    common.agregar_datos_csv(str(archivo), [Estudiante("E001", "Ana", "Software")],
+                             common.ENCABEZADOS_ESTUDIANTES)
+    assert archivo.read_text().splitlines()[0] == "id_estudiante,nombre,carrera"
+
+
+def test_agregar_json_conserva_formato(tmp_path):
+    """Prueba que agregar al arreglo deje el mismo contenido que reescribirlo completo."""
+    agregado = tmp_path / "agregado.json"
+    completo = tmp_path / "completo.json"
+    matriculas = [Matricula("M001", "E001", "2025-01", ["C001", "C002"]),
+                  Matricula("M002", "E002", "2025-01", ["C003"])]
+
+    agregado.write_text("[]")
+    assert common.agregar_datos_json(str(agregado), matriculas[:1])
+    assert common.agregar_datos_json(str(agregado), matriculas[1:])
+    common.guardar_datos_json(str(completo), matriculas)
+
+    assert agregado.read_text() == completo.read_text()
+
+
+def test_agregar_json_archivo_inexistente(tmp_path):
+    """Prueba que sin un arreglo previo se pida reescribir el archivo completo."""
+    assert not common.agregar_datos_json(str(tmp_path / "no_existe.json"), [Matricula("M001", "E001", "2025-01")])
+
+
+def test_altas_no_reescriben_archivos(setup_test_data, monkeypatch):
+    """Prueba que crear registros solo agregue al final de los archivos."""
+    def no_reescribir(*args):
+        raise AssertionError("No se debe reescribir el archivo en un alta")
+
+    monkeypatch.setattr(common, "guardar_datos_csv", no_reescribir)
+    monkeypatch.setattr(common, "guardar_datos_json", no_reescribir)
+
+    estudiantes_ctrl.crear_estudiante("E101", "Nuevo Estudiante", "Nueva Carrera")
+    cursos_ctrl.crear_curso("C101", "Curso Nuevo", 4)
+    matriculas_ctrl.matricular_estudiante("E101", ["C100", "C101"], "2025-T1")
+    matriculas_ctrl.matricular_estudiante("E100", ["C100"], "2025-T1")
+
+    assert [e.id_estudiante for e in common.cargar_datos_csv(common.ESTUDIANTES_FILE, Estudiante)] == ["E100", "E101"]
+    matriculas = common.cargar_datos_json(common.MATRICULAS_FILE)
+    assert [m.id_matricula for m in matriculas] == ["M001", "M002"]
+    assert matriculas[0].id_cursos == ["C100", "C101"]
+
+
+# --- Pruebas del Diario de Matrículas ---
+
+def test_modo_diario_no_toca_el_json(setup_test_data, monkeypatch):
+    """Prueba que en modo diario las matrículas se lean del diario sin reescribir el JSON."""
+    monkeypatch.setattr(common, "MODO_DIARIO_MATRICULAS", True)
+    matriculas_ctrl.matricular_estudiante("E100", ["C100"], "2025-T1")
+    matriculas_ctrl.matricular_estudiante("E100", ["C100"], "2025-T2")
+
+    with open(common.MATRICULAS_FILE) as f:
+        assert json.load(f) == []
+    matriculas = common.cargar_datos_json(common.MATRICULAS_FILE)
+    assert [m.id_matricula for m in matriculas] == ["M001", "M002"]
+
+
+def test_diario_que_no_se_puede_escribir_es_un_error(setup_test_data, monkeypatch):
+    """Si el diario no se puede escribir, la matrícula no se informa como guardada."""
+    monkeypatch.setattr(common, "MODO_DIARIO_MATRICULAS", True)
+    os.mkdir(common.ruta_diario(common.MATRICULAS_FILE))  # open(..., 'a') falla
+    with pytest.raises(OSError, match="diario"):
+        matriculas_ctrl.matricular_estudiante("E100", ["C100"], "2025-T1")
+    os.rmdir(common.ruta_diario(common.MATRICULAS_FILE))
+    assert matriculas_ctrl.obtener_matriculas_por_estudiante("E100") == []
+
+
+def test_diario_compacta_al_superar_umbral(setup_test_data, monkeypatch):
+    """Prueba que el diario se integre al JSON cuando supera el umbral."""
+    monkeypatch.setattr(common, "MODO_DIARIO_MATRICULAS", True)
+    monkeypatch.setattr(common, "UMBRAL_COMPACTACION_DIARIO", 1)
+    matriculas_ctrl.matricular_estudiante("E100", ["C100"], "2025-T1")
+
+    assert not os.path.exists(common.ruta_diario(common.MATRICULAS_FILE))
+    with open(common.MATRICULAS_FILE) as f:
+        assert [m["id_matricula"] for m in json.load(f)] == ["M001"]
+
+
+def test_diario_ignora_linea_incompleta_y_compacta(setup_test_data):
+    """Prueba que una escritura interrumpida no impida leer ni compactar el diario."""
+    archivo = common.MATRICULAS_FILE
+    common.registrar_en_diario(archivo, [
+        {"op": "alta", "matricula": a_dict(Matricula("M001", "E100", "2025-T1", ["C100"]))},
+        {"op": "alta", "matricula": a_dict(Matricula("M002", "E100", "2025-T2", ["C100"]))},
+    ])
+    common.registrar_en_diario(archivo, [{"op": "baja", "id_matricula": "M001"}])
+    with open(common.ruta_diario(archivo), 'a') as f:
+        f.write('{"op": "alta", "matri')
+
+    assert [m.id_matricula for m in common.cargar_datos_json(archivo)] == ["M002"]
+    assert common.compactar_diario(archivo)
+    assert [m.id_matricula for m in common.cargar_datos_json(archivo)] == ["M002"]
+    assert not common.compactar_diario(archivo)
+
+
+def test_diario_no_pega_una_escritura_a_la_linea_incompleta(setup_test_data):
+    """Prueba que una operación confirmada después de una línea cortada no se pierda."""
+    archivo = common.MATRICULAS_FILE
+    common.registrar_en_diario(archivo, [{"op": "alta", "matricula": a_dict(Matricula("M001", "E100", "2025-T1"))}])
+    with open(common.ruta_diario(archivo), 'a') as f:
+        f.write('{"op": "alta", "matri')
+    assert common.registrar_en_diario(archivo, [{"op": "alta",
+                                                 "matricula": a_dict(Matricula("M002", "E100", "2025-T2"))}])
+    assert [m.id_matricula for m in common.cargar_datos_json(archivo)] == ["M001", "M002"]
+
+
+def test_diario_con_linea_danada_en_el_medio(setup_test_data):
+    """Prueba que una línea dañada que no es la última sea un error y no se descarte en silencio."""
+    archivo = common.MATRICULAS_FILE
+    with open(common.ruta_diario(archivo), 'w') as f:
+        f.write('{"op": "baja", "id_matricula": "M001"}\n{"op": "al\n{"op": "baja", "id_matricula": "M002"}\n')
+    with pytest.raises(ValueError, match="línea 2"):
+        common.cargar_datos_json(archivo)
+
+
+# --- Pruebas de Lectura en Flujo y JSON Lines ---
+
+def test_iterar_json_en_bloques_pequenos(tmp_path):
+    """Prueba que el lector en flujo reconstruya elementos partidos entre bloques."""
+    archivo = str(tmp_path / "matriculas.json")
+    matriculas = [Matricula(f"M{i:03d}", "E001", "2025-01", ["C001", "C002"]) for i in range(1, 30)]
+    common.guardar_datos_json(archivo, matriculas)
+
+    assert list(common._iterar_archivo_json(archivo, tamano_bloque=7)) == matriculas
+    assert list(common.iterar_datos_json(archivo)) == common.cargar_datos_json(archivo)
+
+
+def test_iterar_json_aplica_diario(tmp_path):
+    """Prueba que el lector en flujo vea lo mismo que la carga completa cuando hay diario."""
+    archivo = str(tmp_path / "matriculas.json")
+    common.guardar_datos_json(archivo, [Matricula("M001", "E001", "2025-01"), Matricula("M002", "E002", "2025-01")])
+    common.registrar_en_diario(archivo, [
+        {"op": "modificacion", "matricula": a_dict(Matricula("M001", "E001", "2025-02"))},
+        {"op": "baja", "id_matricula": "M002"},
+        {"op": "alta", "matricula": a_dict(Matricula("M003", "E003", "2025-01"))},
+    ])
+    esperado = [Matricula("M001", "E001", "2025-02"), Matricula("M003", "E003", "2025-01")]
+    assert list(common.iterar_datos_json(archivo)) == esperado
+    assert common.cargar_datos_json(archivo) == esperado
+
+
+def test_convertir_a_jsonl(setup_test_data, tmp_path):
+    """Prueba la conversión a JSON Lines y el uso de ese formato por los controladores."""
+    matriculas_ctrl.matricular_estudiante("E100", ["C100"], "2025-T1")
+    destino = str(tmp_path / "matriculas.jsonl")
+    assert common.convertir_matriculas(common.MATRICULAS_FILE, destino)
+    with open(destino) as f:
+        assert len(f.readlines()) == 1
+
+    common.MATRICULAS_FILE = destino
+    matriculas_ctrl.matricular_estudiante("E100", ["C100"], "2025-T2")
+    assert [m.periodo_academico for m in common.cargar_datos_json(destino)] == ["2025-T1", "2025-T2"]
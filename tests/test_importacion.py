@@ -0,0 +1,84 @@
+# tests/test_importacion.py
+import csv
+from controlador import estudiantes_ctrl, cursos_ctrl, matriculas_ctrl, common, importacion_ctrl
+
+
+def escribir_csv(ruta, filas):
+    with open(ruta, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(filas)
+    return str(ruta)
+
+
+# --- Pruebas de Importación ---
+
+def test_importar_estudiantes_reporta_rechazos(setup_test_data, tmp_path, monkeypatch):
+    """Prueba que se guarden las filas válidas en una sola escritura y se reporten las demás."""
+    escrituras = []
+    agregar_original = common.agregar_datos_csv
+    monkeypatch.setattr(common, "agregar_datos_csv",
+                        lambda archivo, datos, enc: escrituras.append(len(datos)) or agregar_original(archivo, datos, enc))
+
+    ruta = escribir_csv(tmp_path / "nuevos.csv", [
+        ['id_estudiante', 'nombre', 'carrera'],
+        ['E101', 'Ana', 'Software'],
+        ['E100', 'Duplicado Existente', 'Software'],
+        ['E102', 'Luis', ''],
+        ['E103', 'Sofia', 'Contaduria'],
+        ['E101', 'Duplicado en Archivo', 'Software'],
+    ])
+    resultado = importacion_ctrl.importar_estudiantes(ruta)
+
+    assert [e.id_estudiante for e in resultado.aceptados] == ["E101", "E103"]
+    assert [linea for linea, _ in resultado.rechazados] == [3, 4, 6]
+    assert "ya existe" in resultado.rechazados[0][1]
+    assert escrituras == [2]
+    assert [e.id_estudiante for e in estudiantes_ctrl.obtener_estudiantes()] == ["E100", "E101", "E103"]
+
+
+def test_importar_cursos_valida_creditos(setup_test_data, tmp_path):
+    """Prueba que los créditos no numéricos se rechacen."""
+    ruta = escribir_csv(tmp_path / "cursos.csv", [
+        ['id_curso', 'nombre_curso', 'creditos'],
+        ['C101', 'Curso Nuevo', '4'],
+        ['C102', 'Curso Malo', 'cuatro'],
+    ])
+    resultado = importacion_ctrl.importar_cursos(ruta)
+    assert len(resultado.aceptados) == 1
+    assert "Crédito no válido" in resultado.rechazados[0][1]
+    assert cursos_ctrl.obtener_curso_por_id("C101").creditos == 4
+
+
+def test_importar_csv_con_bom(setup_test_data, tmp_path):
+    """Un CSV exportado desde Excel empieza con un BOM; el primer encabezado igual se reconoce."""
+    ruta = tmp_path / "excel.csv"
+    with open(ruta, 'w', newline='', encoding='utf-8-sig') as f:
+        csv.writer(f).writerows([['id_curso', 'nombre_curso', 'creditos'], ['C101', 'Curso Nuevo', '4']])
+    resultado = importacion_ctrl.importar_cursos(str(ruta))
+    assert [c.id_curso for c in resultado.aceptados] == ["C101"]
+    assert resultado.rechazados == []
+
+
+def test_importar_matriculas_valida_referencias(setup_test_data, tmp_path):
+    """Prueba que las matrículas con estudiantes o cursos inexistentes se rechacen."""
+    ruta = escribir_csv(tmp_path / "matriculas.csv", [
+        ['id_estudiante', 'periodo_academico', 'id_cursos'],
+        ['E100', '2025-T1', 'C100'],
+        ['E999', '2025-T1', 'C100'],
+        ['E100', '2025-T2', 'C100;C999'],
+    ])
+    resultado = importacion_ctrl.importar_matriculas(ruta)
+
+    assert [m.id_matricula for m in resultado.aceptados] == ["M001"]
+    assert [motivo for _, motivo in resultado.rechazados] == [
+        "El estudiante con ID 'E999' no existe.",
+        "El curso con ID 'C999' no existe.",
+    ]
+    assert matriculas_ctrl.calcular_creditos_estudiante("E100", "2025-T1") == 3
+
+
+def test_validar_no_guarda(setup_test_data, tmp_path):
+    """Prueba que el modo de solo validación no modifique los datos."""
+    ruta = escribir_csv(tmp_path / "nuevos.csv", [['id_estudiante', 'nombre', 'carrera'], ['E101', 'Ana', 'Software']])
+    resultado = importacion_ctrl.importar_estudiantes(ruta, guardar=False)
+    assert len(resultado.aceptados) == 1
+    assert estudiantes_ctrl.obtener_estudiante_por_id("E101") is None
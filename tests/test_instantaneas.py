@@ -0,0 +1,90 @@
+# tests/test_instantaneas.py
+import csv
+import threading
+from modelo.entidades import Matricula
+from controlador import estudiantes_ctrl, cursos_ctrl, matriculas_ctrl, common, repositorio, instantaneas
+from controlador.instantaneas import MapaPersistente
+
+
+# --- Pruebas de Instantáneas ---
+
+def test_mapa_persistente_copia_al_escribir():
+    mapa = MapaPersistente.desde((f"K{i}", i) for i in range(200))
+    otro = mapa.con("K5", -5).con("NUEVA", 1).sin("K7")
+    assert len(mapa) == 200 and mapa["K5"] == 5 and "K7" in mapa and "NUEVA" not in mapa
+    assert len(otro) == 200 and otro["K5"] == -5 and "K7" not in otro and otro["NUEVA"] == 1
+    assert otro.sin("NO-EXISTE") is otro
+    assert dict(otro) == {**{f"K{i}": i for i in range(200) if i != 7}, "K5": -5, "NUEVA": 1}
+
+def test_instantanea_no_cambia_con_las_escrituras(setup_test_data):
+    estudiantes_ctrl.crear_estudiante("E101", "Otro Estudiante", "Derecho")
+    matriculas_ctrl.matricular_estudiante("E100", ["C100"], "2025-T1")
+    anterior = instantaneas.actual()
+
+    matriculas_ctrl.matricular_estudiante("E101", ["C100"], "2025-T1")
+    cursos_ctrl.actualizar_curso("C100", "Curso Renombrado", 5)
+
+    nueva = instantaneas.actual()
+    assert nueva.version > anterior.version
+    assert [e.id_estudiante for e in anterior.estudiantes_por_curso("C100")] == ["E100"]
+    assert anterior.obtener_curso("C100").creditos == 3
+    assert anterior.creditos_estudiante("E100", "2025-T1") == 3
+    assert [e.id_estudiante for e in nueva.estudiantes_por_curso("C100")] == ["E100", "E101"]
+    assert nueva.obtener_curso("C100").nombre_curso == "Curso Renombrado"
+    assert matriculas_ctrl.calcular_creditos_estudiante("E101", "2025-T1") == 5
+
+def test_instantanea_sigue_actualizaciones_y_bajas(setup_test_data):
+    estudiantes_ctrl.crear_estudiante("E101", "Otro Estudiante", "Derecho")
+    cursos_ctrl.crear_curso("C200", "Curso Dos", 4)
+    matricula = matriculas_ctrl.matricular_estudiante("E101", ["C100", "C200"], "2025-T1")
+    estudiantes_ctrl.actualizar_estudiante("E101", "Nombre Nuevo", "Medicina")
+    assert matriculas_ctrl.obtener_estudiantes_por_curso("C200")[0].nombre == "Nombre Nuevo"
+    assert matriculas_ctrl.obtener_matriculas_por_estudiante("E101") == [matricula]
+
+    movida = Matricula(matricula.id_matricula, "E100", "2025-T2", ["C200"])
+    repositorio.actualizar_matricula(repositorio.matriculas(), movida)
+    instantanea = instantaneas.actual()
+    assert instantanea.matriculas_de_curso("C100") == ()
+    assert instantanea.matriculas_de_curso("C200", "2025-T2") == (movida,)
+    assert instantanea.matriculas_de_estudiante("E100") == (movida,)
+
+    repositorio.eliminar_matricula(repositorio.matriculas(), matricula.id_matricula)
+    cursos_ctrl.eliminar_curso("C200")
+    instantanea = instantaneas.actual()
+    assert instantanea.matriculas_de_curso("C200") == () and len(instantanea.matriculas) == 0
+    assert instantanea.obtener_curso("C200") is None
+
+def test_instantanea_se_arma_de_nuevo_si_cambia_el_archivo(setup_test_data):
+    assert instantaneas.actual().obtener_estudiante("E100") is not None
+    with open(common.ESTUDIANTES_FILE, 'a', newline='') as f:
+        csv.writer(f).writerow(['E555', 'Escrito Afuera', 'Externa'])
+    assert instantaneas.actual().obtener_estudiante("E555").nombre == "Escrito Afuera"
+
+def test_lectores_concurrentes_con_escritor(setup_test_data):
+    for i in range(20):
+        estudiantes_ctrl.crear_estudiante(f"E{200 + i}", f"Estudiante {i}", "Ingeniería")
+    errores = []
+    terminado = threading.Event()
+
+    def escritor():
+        try:
+            for i in range(20):
+                matriculas_ctrl.matricular_estudiante(f"E{200 + i}", ["C100"], "2025-T1")
+        finally:
+            terminado.set()
+
+    def lector():
+        while not terminado.is_set():
+            instantanea = instantaneas.actual()
+            en_curso = instantanea.estudiantes_por_curso("C100")
+            # Dentro de una instantánea, el índice por curso y las matrículas concuerdan
+            if len(en_curso) != len(instantanea.matriculas):
+                errores.append((len(en_curso), len(instantanea.matriculas)))
+
+    hilos = [threading.Thread(target=lector) for _ in range(4)] + [threading.Thread(target=escritor)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert not errores
+    assert len(matriculas_ctrl.obtener_estudiantes_por_curso("C100")) == 20
@@ -0,0 +1,69 @@
+# tests/test_instrumentacion.py
+import pytest
+import json
+from controlador import estudiantes_ctrl, cursos_ctrl, common, repositorio, instrumentacion
+
+
+# --- Fixture ---
+@pytest.fixture
+def instrumentado(setup_test_data):
+    instrumentacion.reiniciar()
+    instrumentacion.activar()
+    yield
+    instrumentacion.desactivar()
+    instrumentacion.reiniciar()
+
+
+# --- Pruebas de Instrumentación ---
+
+def test_activar_y_desactivar_restauran_las_funciones(setup_test_data):
+    original_crear = estudiantes_ctrl.crear_estudiante
+    original_cargar = common.cargar_datos_csv
+    instrumentacion.activar()
+    try:
+        assert instrumentacion.activa()
+        assert estudiantes_ctrl.crear_estudiante is not original_crear
+        assert common.cargar_datos_csv is not original_cargar
+    finally:
+        instrumentacion.desactivar()
+    assert not instrumentacion.activa()
+    assert estudiantes_ctrl.crear_estudiante is original_crear
+    assert common.cargar_datos_csv is original_cargar
+
+def test_mide_lecturas_y_escrituras(instrumentado):
+    repositorio.estudiantes()
+    estudiantes_ctrl.crear_estudiante("E101", "Otro Estudiante", "Otra Carrera")
+    datos = instrumentacion.instantanea()
+    lectura = datos["entrada_salida"]["cargar_datos_csv"]
+    assert lectura["operaciones"] >= 1
+    assert lectura["bytes"] > 0
+    assert datos["totales"]["cargas"] >= 1
+    assert datos["totales"]["guardados"] >= 1
+    assert datos["totales"]["bytes_escritos"] > 0
+
+def test_mide_latencia_de_controladores(instrumentado):
+    cursos_ctrl.crear_curso("C101", "Curso Nuevo", 4)
+    with pytest.raises(ValueError):
+        cursos_ctrl.crear_curso("C101", "Curso Repetido", 4)
+    latencia = instrumentacion.instantanea()["controladores"]["cursos_ctrl.crear_curso"]
+    assert latencia["llamadas"] == 2
+    assert latencia["errores"] == 1
+    assert sum(latencia["cubetas"].values()) == 2
+    assert latencia["p50_ms"] is None or latencia["p50_ms"] > 0
+
+def test_histograma_percentiles():
+    histograma = instrumentacion.Histograma()
+    for ms in (0.05, 0.3, 0.3, 2, 20000):
+        histograma.registrar(ms)
+    assert histograma.percentil(50) == 0.5
+    assert histograma.percentil(100) is None
+    assert histograma.maximo_ms == 20000
+
+def test_volcar_guarda_json(instrumentado, tmp_path):
+    repositorio.cursos()
+    ruta = tmp_path / "diagnostico.json"
+    instrumentacion.volcar(str(ruta))
+    with open(ruta, encoding='utf-8') as f:
+        datos = json.load(f)
+    assert datos["activa"] is True
+    assert "cargar_datos_csv" in datos["entrada_salida"]
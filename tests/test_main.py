@@ -0,0 +1,59 @@
+# tests/test_main.py
+import pytest
+import csv
+import io
+import json
+import os
+import main
+from controlador import common
+from benchmarks import arranque
+
+
+# --- Pruebas de los Subcomandos ---
+
+def test_subcomando_json(setup_test_data, capsys):
+    assert main.ejecutar_comando(["cursos", "--formato", "json"]) == 0
+    assert json.loads(capsys.readouterr().out) == [
+        {"id_curso": "C100", "nombre_curso": "Curso Prueba", "creditos": 3}]
+
+def test_matricular_y_creditos_csv(setup_test_data, capsys):
+    assert main.ejecutar_comando(["matricular", "E100", "2025-T1", "C100", "--formato", "json"]) == 0
+    matricula = json.loads(capsys.readouterr().out)[0]
+    assert matricula["id_cursos"] == ["C100"]
+    assert main.ejecutar_comando(["creditos", "E100", "--periodo", "2025-T1", "--formato", "csv"]) == 0
+    filas = list(csv.DictReader(io.StringIO(capsys.readouterr().out)))
+    assert filas == [{"id_estudiante": "E100", "periodo": "2025-T1", "creditos": "3"}]
+
+def test_subcomando_con_error(setup_test_data, capsys):
+    assert main.ejecutar_comando(["matricular", "E999", "2025-T1", "C100"]) == 1
+    salida = capsys.readouterr()
+    assert salida.out == ""
+    assert "Error:" in salida.err
+
+def test_cerrar_periodo_y_matriculas_por_periodo(setup_test_data, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(common, "MATRICULAS_DIR", str(tmp_path / "matriculas"))
+    monkeypatch.setattr(common, "MATRICULAS_POR_PERIODO", True)
+    assert main.ejecutar_comando(["matricular", "E100", "2025-T1", "C100"]) == 0
+    assert main.ejecutar_comando(["cerrar-periodo", "2025-T1", "--formato", "json"]) == 0
+    assert main.ejecutar_comando(["matriculas", "E100", "--periodo", "2025-T2", "--formato", "json"]) == 0
+    salida = capsys.readouterr().out
+    assert '"cerrado": true' in salida and salida.rstrip().endswith("[]")
+    assert main.ejecutar_comando(["matricular", "E100", "2025-T1", "C100"]) == 1
+    assert "cerrado" in capsys.readouterr().err
+
+def test_salida_tabla():
+    salida = io.StringIO()
+    main._escribir([{"id": "E1", "cursos": ["C1", "C2"]}], "tabla", salida)
+    assert salida.getvalue().splitlines() == ["id  cursos", "--  ------", "E1  C1;C2"]
+
+
+# --- Pruebas del Arranque ---
+
+def test_subcomando_no_carga_rich(setup_test_data):
+    # El proceso hijo lee los datos de prueba, no los de data/; el presupuesto
+    # de tiempo lo verifica benchmarks/arranque.py
+    datos = os.path.dirname(common.ESTUDIANTES_FILE)
+    assert arranque.pesados_cargados(["cursos", "--formato", "json"], datos) == []
+    assert arranque.medir(["cursos", "--formato", "json"], repeticiones=1, datos=datos)[0] > 0
+    # El bloqueo que tomó el proceso hijo quedó junto a los datos de prueba
+    assert os.path.exists(os.path.join(datos, "cursos.csv.lock"))
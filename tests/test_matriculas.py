@@ -83,4 +83,23 @@ def test_obtener_estudiantes_por_curso(setup_test_data):
 
     # Probar un curso sin estudiantes
     estudiantes_vacios = matriculas_ctrl.obtener_estudiantes_por_curso("C999")
-    assert len(estudiantes_vacios) == 0
\ No newline at end of file
+    assert len(estudiantes_vacios) == 0
+
+def test_matricular_estudiantes_lote(setup_test_data):
+    """Prueba que el lote reporte cada solicitud y guarde las válidas juntas."""
+    cursos_ctrl.crear_curso("C101", "Curso Avanzado", 5)
+    resultados = matriculas_ctrl.matricular_estudiantes_lote([
+        ("E100", ["C100"], "2025-T1"),
+        ("E999", ["C100"], "2025-T1"),
+        ("E100", ["C101", "C999"], "2025-T2"),
+        ("E100", ["C101"], "2025-T2"),
+    ])
+
+    assert [r["exito"] for r in resultados] == [True, False, False, True]
+    assert resultados[1]["error"] == "El estudiante con ID 'E999' no existe."
+    assert resultados[2]["error"] == "El curso con ID 'C999' no existe."
+    assert [r["matricula"].id_matricula for r in resultados if r["exito"]] == ["M001", "M002"]
+
+    matriculas = common.cargar_datos_json(common.MATRICULAS_FILE)
+    assert [m.id_matricula for m in matriculas] == ["M001", "M002"]
+    assert matriculas_ctrl.calcular_creditos_estudiante("E100", "2025-T2") == 5
@@ -0,0 +1,135 @@
+# tests/test_matriculas_por_periodo.py
+import pytest
+import json
+import os
+from modelo.entidades import Matricula
+from controlador import estudiantes_ctrl, cursos_ctrl, matriculas_ctrl, common, repositorio, reportes_ctrl
+
+# --- Fixture ---
+@pytest.fixture
+def por_periodo(setup_test_data, tmp_path, monkeypatch):
+    """Matrículas guardadas por período, con dos estudiantes y dos cursos."""
+    monkeypatch.setattr(common, "MATRICULAS_DIR", str(tmp_path / "data" / "matriculas"))
+    monkeypatch.setattr(common, "MATRICULAS_POR_PERIODO", True)
+    estudiantes_ctrl.crear_estudiante("E101", "Segundo Estudiante", "Otra Carrera")
+    cursos_ctrl.crear_curso("C101", "Curso Avanzado", 5)
+
+
+def _leer_periodo(periodo):
+    with open(common.ruta_periodo(periodo)) as f:
+        return [json.loads(linea)["id_matricula"] for linea in f if linea.strip()]
+
+
+# --- Pruebas de Matrículas por Período ---
+
+def test_matricular_escribe_solo_el_periodo(por_periodo):
+    m1 = matriculas_ctrl.matricular_estudiante("E100", ["C100", "C101"], "2025-01")
+    antes = os.stat(common.ruta_periodo("2025-01")).st_mtime_ns
+    m2 = matriculas_ctrl.matricular_estudiante("E101", ["C101"], "2025-02")
+
+    assert _leer_periodo("2025-01") == [m1.id_matricula]
+    assert _leer_periodo("2025-02") == [m2.id_matricula]
+    assert os.stat(common.ruta_periodo("2025-01")).st_mtime_ns == antes
+    assert not os.path.exists(common.MATRICULAS_FILE + ".log")
+    with open(common.MATRICULAS_FILE) as f:
+        assert json.load(f) == []
+    manifiesto = common.leer_manifiesto()
+    assert list(manifiesto) == ["2025-01", "2025-02"]
+    assert manifiesto["2025-01"] == {"archivo": "2025-01.jsonl", "matriculas": 1, "cerrado": False}
+
+    assert [m.id_matricula for m in repositorio.matriculas_de_periodo("2025-02")] == [m2.id_matricula]
+    assert len(repositorio.matriculas_de_periodo("2030-01")) == 0
+    assert [m.id_matricula for m in repositorio.iterar_matriculas(["2025-01"])] == [m1.id_matricula]
+    assert len(repositorio.matriculas()) == 2
+
+def test_escribir_periodo_crea_el_directorio(por_periodo):
+    """Sin reservar IDs antes (que también crea el directorio), el alta igual se escribe."""
+    assert not os.path.exists(common.MATRICULAS_DIR)
+    repositorio.insertar_matricula(repositorio.matriculas(), Matricula("M900", "E100", "2025-01", ["C100"]))
+    assert _leer_periodo("2025-01") == ["M900"]
+
+def test_consultas_por_periodo(por_periodo):
+    matriculas_ctrl.matricular_estudiante("E100", ["C100", "C101"], "2025-01")
+    matriculas_ctrl.matricular_estudiante("E101", ["C101"], "2025-02")
+    assert matriculas_ctrl.calcular_creditos_estudiante("E100", "2025-01") == 8
+    assert matriculas_ctrl.calcular_creditos_estudiante("E100", "2025-02") == 0
+    assert [e.id_estudiante for e in matriculas_ctrl.obtener_estudiantes_por_curso("C101", "2025-02")] == ["E101"]
+    assert [e.id_estudiante for e in matriculas_ctrl.obtener_estudiantes_por_curso("C101")] == ["E100", "E101"]
+    assert len(matriculas_ctrl.obtener_matriculas_por_estudiante("E100", "2025-02")) == 0
+    assert reportes_ctrl.creditos_por_estudiante("2025-02") == {"E101": 5}
+    assert list(reportes_ctrl.reportes_por_periodo(["2025-01"], procesos=1)) == ["2025-01"]
+
+def test_tablas_en_cache_se_mantienen_al_dia(por_periodo):
+    todas = repositorio.matriculas()
+    periodo = repositorio.matriculas_de_periodo("2025-01")
+    nueva = matriculas_ctrl.matricular_estudiante("E100", ["C100"], "2025-01")
+    # La escritura sobre la tabla del período se aplicó también sobre la de todos
+    assert repositorio.matriculas() is todas and nueva.id_matricula in todas
+
+    movida = Matricula(nueva.id_matricula, "E100", "2025-02", ["C101"])
+    repositorio.actualizar_matricula(todas, movida)
+    assert repositorio.matriculas_de_periodo("2025-01") is periodo and len(periodo) == 0
+    assert _leer_periodo("2025-01") == [] and _leer_periodo("2025-02") == [nueva.id_matricula]
+    assert common.leer_manifiesto()["2025-02"]["matriculas"] == 1
+
+    repositorio.eliminar_matricula(repositorio.matriculas_de_periodo("2025-02"), nueva.id_matricula)
+    assert nueva.id_matricula not in repositorio.matriculas()
+    assert _leer_periodo("2025-02") == []
+
+def test_tabla_de_un_periodo_no_admite_otro(por_periodo):
+    tabla = repositorio.matriculas_de_periodo("2025-01")
+    with pytest.raises(ValueError, match="período '2025-02'"):
+        repositorio.insertar_matricula(tabla, Matricula("M900", "E100", "2025-02", ["C100"]))
+    assert len(tabla) == 0
+
+def test_periodo_cerrado_es_de_solo_lectura(por_periodo):
+    m = matriculas_ctrl.matricular_estudiante("E100", ["C100"], "2025-01")
+    repositorio.cerrar_periodo("2025-01")
+    assert repositorio.periodos_cerrados() == {"2025-01"}
+
+    with pytest.raises(ValueError, match="cerrado"):
+        matriculas_ctrl.matricular_estudiante("E101", ["C100"], "2025-01")
+    resultados = matriculas_ctrl.matricular_estudiantes_lote([("E101", ["C100"], "2025-01"),
+                                                             ("E101", ["C100"], "2025-02")])
+    assert [r["exito"] for r in resultados] == [False, True]
+    with pytest.raises(ValueError, match="cerrado"):
+        repositorio.eliminar_matricula(repositorio.matriculas(), m.id_matricula)
+    assert m.id_matricula in repositorio.matriculas()
+    # Las lecturas siguen funcionando
+    assert matriculas_ctrl.calcular_creditos_estudiante("E100", "2025-01") == 3
+
+    with pytest.raises(ValueError, match="no tiene matrículas"):
+        repositorio.cerrar_periodo("2030-01")
+
+def test_lote_informa_los_grupos_que_no_se_guardaron(por_periodo, monkeypatch):
+    matriculas_ctrl.matricular_estudiante("E100", ["C100"], "2025-01")
+    repositorio.cerrar_periodo("2025-01")
+    # Otro proceso cerró el período después de que el lote lo validara
+    monkeypatch.setattr(repositorio, "periodos_cerrados", set)
+    resultados = matriculas_ctrl.matricular_estudiantes_lote([("E100", ["C100"], "2025-02"),
+                                                             ("E101", ["C100"], "2025-01")])
+    assert [r["exito"] for r in resultados] == [True, False]
+    assert "cerrado" in resultados[1]["error"] and resultados[1]["matricula"] is None
+    assert _leer_periodo("2025-02") == [resultados[0]["matricula"].id_matricula]
+    assert len(_leer_periodo("2025-01")) == 1
+
+def test_cerrar_periodo_requiere_modo_por_periodo(setup_test_data):
+    with pytest.raises(ValueError):
+        repositorio.cerrar_periodo("2025-01")
+    assert repositorio.periodos_cerrados() == set()
+
+def test_particionar_matriculas(setup_test_data, tmp_path, monkeypatch):
+    origen = [Matricula("M001", "E100", "2025-01", ["C100"]), Matricula("M002", "E100", "2025-02", ["C100"]),
+              Matricula("M003", "E101", "2025-01", ["C100"])]
+    common.guardar_datos_json(common.MATRICULAS_FILE, origen)
+    monkeypatch.setattr(common, "MATRICULAS_DIR", str(tmp_path / "particionado"))
+    assert common.particionar_matriculas(common.MATRICULAS_FILE)
+
+    assert _leer_periodo("2025-01") == ["M001", "M003"] and _leer_periodo("2025-02") == ["M002"]
+    assert {p: d["matriculas"] for p, d in common.leer_manifiesto().items()} == {"2025-01": 2, "2025-02": 1}
+    monkeypatch.setattr(common, "MATRICULAS_POR_PERIODO", True)
+    assert sorted(m.id_matricula for m in repositorio.iterar_matriculas()) == ["M001", "M002", "M003"]
+
+def test_periodo_invalido(por_periodo):
+    with pytest.raises(ValueError):
+        common.ruta_periodo("../otro")
@@ -0,0 +1,84 @@
+# tests/test_reportes.py
+import pytest
+from controlador import estudiantes_ctrl, cursos_ctrl, matriculas_ctrl, reportes_ctrl
+
+
+# --- Fixture ---
+@pytest.fixture
+def datos_reporte(setup_test_data):
+    """Dos estudiantes y dos cursos, con matrículas en dos períodos."""
+    estudiantes_ctrl.crear_estudiante("E101", "Segundo Estudiante", "Otra Carrera")
+    cursos_ctrl.crear_curso("C101", "Curso Avanzado", 5)
+    matriculas_ctrl.matricular_estudiante("E100", ["C100", "C101"], "2025-T1")
+    matriculas_ctrl.matricular_estudiante("E101", ["C101"], "2025-T1")
+    matriculas_ctrl.matricular_estudiante("E100", ["C100"], "2025-T2")
+
+
+# --- Pruebas de Reportes en Flujo ---
+
+def test_iterar_estudiantes_por_curso(datos_reporte):
+    """Prueba que el reporte en flujo coincida con el del controlador."""
+    for id_curso in ("C100", "C101", "C999"):
+        en_flujo = [e.id_estudiante for e in reportes_ctrl.iterar_estudiantes_por_curso(id_curso)]
+        cargado = [e.id_estudiante for e in matriculas_ctrl.obtener_estudiantes_por_curso(id_curso)]
+        assert sorted(en_flujo) == sorted(cargado)
+
+
+def test_creditos_por_estudiante(datos_reporte):
+    """Prueba los totales de créditos por período y de todos los períodos."""
+    assert reportes_ctrl.creditos_por_estudiante("2025-T1") == {"E100": 8, "E101": 5}
+    assert reportes_ctrl.creditos_por_estudiante("2025-T2") == {"E100": 3}
+    assert reportes_ctrl.creditos_por_estudiante() == {"E100": 11, "E101": 5}
+
+
+def test_reporte_carga_creditos(datos_reporte):
+    """Prueba totales, distribución y sobrecargas del reporte de toda la población."""
+    estudiantes_ctrl.crear_estudiante("E102", "Sin Matricula", "Otra Carrera")
+    reporte = reportes_ctrl.reporte_carga_creditos("2025-T1", limite=6)
+    assert reporte.totales == {"E100": 8, "E101": 5, "E102": 0}
+    assert reporte.distribucion == {0: 1, 5: 1, 8: 1}
+    assert reporte.sobrecargas == [("E100", "2025-T1", 8)]
+    assert reporte.maximo == 8
+
+    # Sin período, la sobrecarga se sigue evaluando período por período
+    todos = reportes_ctrl.reporte_carga_creditos(limite=6)
+    assert todos.totales == {"E100": 11, "E101": 5, "E102": 0}
+    assert todos.sobrecargas == [("E100", "2025-T1", 8)]
+    for id_est, total in reportes_ctrl.creditos_por_estudiante().items():
+        assert todos.totales[id_est] == total
+
+
+def test_carga_igual_al_limite_no_es_sobrecarga(datos_reporte):
+    """El límite es la carga máxima permitida: solo la supera lo que está por encima."""
+    assert reportes_ctrl.reporte_carga_creditos("2025-T1", limite=8).sobrecargas == []
+    assert reportes_ctrl.reporte_carga_creditos("2025-T1", limite=7).sobrecargas == [("E100", "2025-T1", 8)]
+    assert reportes_ctrl.reporte_carga_precalculado("2025-T1", limite=8).sobrecargas == []
+
+
+def test_reportes_por_periodo(datos_reporte):
+    """Prueba el cierre por período, calculado en este proceso y en un pool de procesos."""
+    reportes = reportes_ctrl.reportes_por_periodo(procesos=1)
+    assert list(reportes) == ["2025-T1", "2025-T2"]
+    t1 = reportes["2025-T1"]
+    assert t1.creditos == {"E100": 8, "E101": 5}
+    assert t1.planillas == {"C100": ["E100"], "C101": ["E100", "E101"]}
+    assert t1.carreras == {"Carrera Prueba": reportes_ctrl.ResumenCarrera(1, 8),
+                           "Otra Carrera": reportes_ctrl.ResumenCarrera(1, 5)}
+    for periodo, reporte in reportes.items():
+        assert reporte.creditos == reportes_ctrl.creditos_por_estudiante(periodo)
+
+    assert reportes_ctrl.reportes_por_periodo(procesos=3) == reportes
+    assert list(reportes_ctrl.reportes_por_periodo(["2025-T2"], procesos=2)) == ["2025-T2"]
+
+
+def test_reportes_por_periodo_divide_periodos_grandes(setup_test_data):
+    """Un período con más procesos que períodos se divide por estudiante y se combina."""
+    for i in range(30):
+        estudiantes_ctrl.crear_estudiante(f"E{200 + i}", f"Estudiante {i}", "Carrera Prueba")
+        matriculas_ctrl.matricular_estudiante(f"E{200 + i}", ["C100"], "2025-T1")
+    assert len(reportes_ctrl._partes({"2025-T1": [(f"E{i}", ("C100",)) for i in range(30)]}, 4)) > 1
+
+    reporte = reportes_ctrl.reportes_por_periodo(procesos=4)["2025-T1"]
+    assert reporte.planillas == {"C100": [f"E{200 + i}" for i in range(30)]}
+    assert reporte.carreras == {"Carrera Prueba": reportes_ctrl.ResumenCarrera(30, 90)}
+    assert reporte == reportes_ctrl.reportes_por_periodo(procesos=1)["2025-T1"]
@@ -0,0 +1,155 @@
+# tests/test_repositorio.py
+import pytest
+import csv
+import os
+from controlador import estudiantes_ctrl, cursos_ctrl, matriculas_ctrl, common, repositorio
+from modelo.entidades import Matricula
+
+
+# --- Fixture ---
+@pytest.fixture
+def contar_cargas(monkeypatch):
+    """Cuenta cuántas veces se parsea cada archivo CSV."""
+    contador = {}
+    cargar_original = common.cargar_datos_csv
+
+    def cargar_contando(archivo, modelo):
+        contador[archivo] = contador.get(archivo, 0) + 1
+        return cargar_original(archivo, modelo)
+
+    monkeypatch.setattr(common, "cargar_datos_csv", cargar_contando)
+    return contador
+
+
+# --- Pruebas del Repositorio ---
+
+def test_lecturas_repetidas_usan_cache(setup_test_data, contar_cargas):
+    """Prueba que varias lecturas seguidas parseen el archivo una sola vez."""
+    for _ in range(5):
+        estudiantes_ctrl.obtener_estudiantes()
+        estudiantes_ctrl.obtener_estudiante_por_id("E100")
+    assert contar_cargas[common.ESTUDIANTES_FILE] == 1
+
+
+def test_escritura_actualiza_cache(setup_test_data, contar_cargas):
+    """Prueba que crear un registro no obligue a volver a parsear el archivo."""
+    cursos_ctrl.crear_curso("C101", "Curso Nuevo", 4)
+    cursos = cursos_ctrl.obtener_cursos()
+    assert [c.id_curso for c in cursos] == ["C100", "C101"]
+    assert contar_cargas[common.CURSOS_FILE] == 1
+
+
+def test_cambio_externo_recarga(setup_test_data, contar_cargas):
+    """Prueba que un cambio hecho por fuera de la aplicación se detecte."""
+    assert len(estudiantes_ctrl.obtener_estudiantes()) == 1
+
+    with open(common.ESTUDIANTES_FILE, 'a', newline='') as f:
+        csv.writer(f).writerow(['E101', 'Externo', 'Otra Carrera'])
+    # Forzamos un mtime distinto por si el sistema de archivos tiene poca resolución
+    st = os.stat(common.ESTUDIANTES_FILE)
+    os.utime(common.ESTUDIANTES_FILE, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert estudiantes_ctrl.obtener_estudiante_por_id("E101") is not None
+    assert contar_cargas[common.ESTUDIANTES_FILE] == 2
+
+
+def test_obtener_retorna_copia(setup_test_data):
+    """Prueba que modificar la lista retornada no altere la caché."""
+    estudiantes = estudiantes_ctrl.obtener_estudiantes()
+    estudiantes.clear()
+    assert len(estudiantes_ctrl.obtener_estudiantes()) == 1
+    assert len(repositorio.estudiantes()) == 1
+
+
+def test_tabla_indexa_por_clave(setup_test_data):
+    """Prueba las búsquedas, altas y bajas por clave primaria de la tabla."""
+    cursos = repositorio.cursos()
+    assert "C100" in cursos
+    assert cursos.obtener("C100").nombre_curso == "Curso Prueba"
+    assert cursos.obtener("C999") is None
+
+    cursos_ctrl.crear_curso("C101", "Curso Nuevo", 4)
+    assert cursos_ctrl.obtener_curso_por_id("C101").creditos == 4
+
+    cursos_ctrl.eliminar_curso("C101")
+    assert cursos_ctrl.obtener_curso_por_id("C101") is None
+    assert [c.id_curso for c in cursos_ctrl.obtener_cursos()] == ["C100"]
+
+
+def test_indices_inversos_de_matriculas(setup_test_data):
+    """Prueba que los índices por curso y por estudiante sigan a las altas y bajas."""
+    cursos_ctrl.crear_curso("C101", "Curso Nuevo", 4)
+    matriculas_ctrl.matricular_estudiante("E100", ["C100", "C101"], "2025-T1")
+    matriculas_ctrl.matricular_estudiante("E100", ["C101"], "2025-T2")
+
+    matriculas = repositorio.matriculas()
+    assert [m.id_matricula for m in matriculas.buscar('id_curso', 'C101')] == ["M001", "M002"]
+    assert [m.id_matricula for m in matriculas.buscar('id_estudiante', 'E100')] == ["M001", "M002"]
+
+    matriculas.quitar("M001")
+    assert matriculas.buscar('id_curso', 'C100') == []
+    assert [m.id_matricula for m in matriculas.buscar('id_curso', 'C101')] == ["M002"]
+
+    # Un estudiante matriculado en varios períodos aparece una sola vez en el reporte
+    assert len(matriculas_ctrl.obtener_estudiantes_por_curso("C101")) == 1
+
+
+# --- Representación compacta de entidades ---
+def test_entidades_sin_dict_y_a_dict():
+    from modelo.entidades import Estudiante, a_dict
+    est = Estudiante("E1", "Ana", "Ingeniería")
+    assert not hasattr(est, "__dict__")
+    assert a_dict(est) == {"id_estudiante": "E1", "nombre": "Ana", "carrera": "Ingeniería"}
+    assert Estudiante(**a_dict(est)) == est
+
+def test_textos_repetidos_se_comparten():
+    periodo_a = "".join(["2024", "-01"])
+    periodo_b = "".join(["2024", "-01"])
+    assert periodo_a is not periodo_b
+    m1 = Matricula("M1", "E1", periodo_a, ["C1"])
+    m2 = Matricula("M2", "E1", periodo_b, ["C1"])
+    assert m1.periodo_academico is m2.periodo_academico
+
+
+# --- Paginación ---
+def test_paginar_en_orden_del_archivo_y_ordenado(setup_test_data):
+    """Prueba las páginas en el orden del archivo, ordenadas y el ajuste de números fuera de rango."""
+    for i, nombre in enumerate(["beta", "Alfa", "gamma", "Delta"], start=1):
+        estudiantes_ctrl.crear_estudiante(f"E20{i}", nombre, "Carrera")
+
+    pagina = estudiantes_ctrl.obtener_pagina_estudiantes(1, 2)
+    assert [e.id_estudiante for e in pagina.registros] == ["E100", "E201"]
+    assert (pagina.total, pagina.total_paginas) == (5, 3)
+
+    pagina = estudiantes_ctrl.obtener_pagina_estudiantes(99, 2)
+    assert pagina.numero == 3
+    assert [e.id_estudiante for e in pagina.registros] == ["E204"]
+
+    ordenada = estudiantes_ctrl.obtener_pagina_estudiantes(1, 3, orden="nombre")
+    assert [e.nombre for e in ordenada.registros] == ["Alfa", "beta", "Delta"]
+    descendente = estudiantes_ctrl.obtener_pagina_estudiantes(1, 1, orden="nombre", descendente=True)
+    assert descendente.registros[0].nombre == "gamma"
+
+    # El orden guardado se descarta cuando la tabla cambia
+    estudiantes_ctrl.crear_estudiante("E300", "Aaron", "Carrera")
+    assert estudiantes_ctrl.obtener_pagina_estudiantes(1, 1, orden="nombre").registros[0].nombre == "Aaron"
+
+    with pytest.raises(ValueError):
+        estudiantes_ctrl.obtener_pagina_estudiantes(1, 2, orden="no_existe")
+
+def test_paginar_estudiantes_por_curso(setup_test_data):
+    estudiantes_ctrl.crear_estudiante("E101", "Otro", "Carrera")
+    matriculas_ctrl.matricular_estudiante("E101", ["C100"], "2025-01")
+    matriculas_ctrl.matricular_estudiante("E100", ["C100"], "2025-01")
+    pagina = matriculas_ctrl.obtener_pagina_estudiantes_por_curso("C100", 1, 10, orden="nombre")
+    assert [e.id_estudiante for e in pagina.registros] == ["E100", "E101"]
+    assert pagina.total == 2
+
+    # La página siguiente de la misma instantánea reutiliza la lista ya ordenada
+    segunda = matriculas_ctrl.obtener_pagina_estudiantes_por_curso("C100", 2, 1, orden="nombre")
+    assert [e.id_estudiante for e in segunda.registros] == ["E101"]
+    # Una matrícula nueva publica otra instantánea y la lista se arma de nuevo
+    estudiantes_ctrl.crear_estudiante("E102", "Aaron", "Carrera")
+    matriculas_ctrl.matricular_estudiante("E102", ["C100"], "2025-01")
+    pagina = matriculas_ctrl.obtener_pagina_estudiantes_por_curso("C100", 1, 10, orden="nombre")
+    assert [e.id_estudiante for e in pagina.registros] == ["E102", "E100", "E101"]
@@ -0,0 +1,38 @@
+# tests/test_secuencias.py
+from concurrent.futures import ThreadPoolExecutor
+from controlador import matriculas_ctrl, common, repositorio, secuencias
+from modelo.entidades import Matricula
+
+
+# --- Pruebas de la Secuencia de IDs ---
+
+def test_secuencia_se_inicializa_con_el_mayor_id(setup_test_data):
+    """Prueba que la secuencia continúe después del mayor ID existente, no de la cantidad."""
+    common.guardar_datos_json(common.MATRICULAS_FILE, [Matricula("M007", "E100", "2025-T1", ["C100"])])
+    assert secuencias.siguiente_id_matricula() == "M008"
+    assert secuencias.reservar_ids_matricula(3) == ["M009", "M010", "M011"]
+
+
+def test_ids_no_se_repiten_despues_de_una_baja(setup_test_data):
+    """Prueba que eliminar una matrícula no haga que su ID (o el último) se vuelva a asignar."""
+    matriculas_ctrl.matricular_estudiante("E100", ["C100"], "2025-T1")
+    matriculas_ctrl.matricular_estudiante("E100", ["C100"], "2025-T2")
+    repositorio.eliminar_matricula(repositorio.matriculas(), "M001")
+
+    nueva = matriculas_ctrl.matricular_estudiante("E100", ["C100"], "2025-T3")
+    assert nueva.id_matricula == "M003"
+
+
+def test_reservas_concurrentes_no_se_repiten(setup_test_data):
+    """Prueba que reservas simultáneas reciban IDs distintos."""
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        bloques = list(pool.map(lambda _: secuencias.reservar_ids_matricula(5), range(40)))
+    ids = [id_m for bloque in bloques for id_m in bloque]
+    assert len(set(ids)) == 200
+
+
+def test_validar_lote_no_consume_ids(setup_test_data):
+    """Prueba que validar un lote sin guardarlo no avance la secuencia."""
+    resultados = matriculas_ctrl.matricular_estudiantes_lote([("E100", ["C100"], "2025-T1")], guardar=False)
+    assert resultados[0]["matricula"].id_matricula == "M001"
+    assert secuencias.siguiente_id_matricula() == "M001"
@@ -0,0 +1,133 @@
+# tests/test_servidor.py
+import pytest
+import http.client
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import servidor
+from controlador import common, repositorio
+from controlador.bloqueo import LectoresEscritor
+
+# --- Fixture ---
+@pytest.fixture
+def api(setup_test_data):
+    """Servidor en un puerto libre; retorna una función que hace solicitudes y devuelve (estado, datos)."""
+    repositorio.invalidar()
+    servidor.precargar()
+    srv = servidor.ServidorAPI(("127.0.0.1", 0), hilos=4, registrar_solicitudes=False)
+    hilo = threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    hilo.start()
+
+    def solicitar(metodo, ruta, cuerpo=None):
+        datos = json.dumps(cuerpo).encode() if cuerpo is not None else None
+        solicitud = urllib.request.Request(f"http://127.0.0.1:{srv.server_port}{ruta}", data=datos, method=metodo)
+        try:
+            with urllib.request.urlopen(solicitud, timeout=10) as respuesta:
+                contenido = respuesta.read()
+                return respuesta.status, json.loads(contenido) if contenido else None
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    solicitar.puerto = srv.server_port
+    yield solicitar
+    srv.shutdown()
+    srv.server_close()
+    repositorio.invalidar()
+
+
+# --- Pruebas de la API ---
+
+def test_crud_de_estudiantes(api):
+    assert api("POST", "/estudiantes", {"id_estudiante": "E101", "nombre": "Nuevo", "carrera": "Derecho"})[0] == 201
+    estado, pagina = api("GET", "/estudiantes?orden=nombre&tamano=1")
+    assert estado == 200
+    assert pagina["total"] == 2
+    assert pagina["registros"] == [{"id_estudiante": "E100", "nombre": "Estudiante Prueba",
+                                    "carrera": "Carrera Prueba"}]
+    assert api("PUT", "/estudiantes/E101", {"nombre": "Cambiado", "carrera": "Derecho"})[1]["nombre"] == "Cambiado"
+    assert api("DELETE", "/estudiantes/E101") == (204, None)
+    assert api("GET", "/estudiantes/E101")[0] == 404
+
+def test_matricula_y_creditos(api):
+    estado, matricula = api("POST", "/matriculas", {"id_estudiante": "E100", "id_cursos": ["C100"],
+                                                    "periodo": "2025-T1"})
+    assert estado == 201
+    assert matricula["id_cursos"] == ["C100"]
+    assert api("GET", "/estudiantes/E100/creditos?periodo=2025-T1")[1]["creditos"] == 3
+    assert api("GET", "/cursos/C100/estudiantes")[1]["total"] == 1
+    assert api("GET", "/reportes/carga?limite=2")[1]["sobrecargas"] == [
+        {"id_estudiante": "E100", "periodo": "2025-T1", "creditos": 3}]
+
+def test_reporte_de_carga_no_lee_los_archivos(api, monkeypatch):
+    api("POST", "/matriculas", {"id_estudiante": "E100", "id_cursos": ["C100"], "periodo": "2025-T1"})
+
+    def sin_leer(*args, **kwargs):
+        raise AssertionError("no debería leer los archivos")
+    monkeypatch.setattr(repositorio, "iterar_matriculas", sin_leer)
+    monkeypatch.setattr(repositorio, "iterar_estudiantes", sin_leer)
+    estado, reporte = api("GET", "/reportes/carga?periodo=2025-T1")
+    assert estado == 200 and reporte["estudiantes"] == 1 and reporte["maximo"] == 3
+
+def test_errores(api):
+    estado, datos = api("POST", "/matriculas", {"id_estudiante": "E999", "id_cursos": ["C100"], "periodo": "X"})
+    assert estado == 400 and "error" in datos
+    assert api("POST", "/cursos", {"id_curso": "C101", "nombre_curso": "Curso", "creditos": "tres"})[0] == 400
+    assert api("GET", "/no-existe")[0] == 404
+    assert api("DELETE", "/matriculas")[0] == 405
+
+def test_actualizar_inexistente_responde_404(api):
+    assert api("PUT", "/estudiantes/NOPE", {"nombre": "N", "carrera": "C"})[0] == 404
+    assert api("PUT", "/cursos/NOPE", {"nombre_curso": "Curso", "creditos": 3})[0] == 404
+
+def test_content_length_negativo(api):
+    """Un largo negativo se rechaza sin quedarse esperando el cuerpo."""
+    conexion = http.client.HTTPConnection("127.0.0.1", api.puerto, timeout=5)
+    conexion.putrequest("POST", "/estudiantes")
+    conexion.putheader("Content-Length", "-1")
+    conexion.endheaders()
+    respuesta = conexion.getresponse()
+    assert respuesta.status == 400
+    assert "Content-Length" in json.loads(respuesta.read())["error"]
+    conexion.close()
+
+def test_campos_de_texto_se_validan(api):
+    assert api("POST", "/estudiantes", {"id_estudiante": 5, "nombre": "N", "carrera": "C"})[0] == 400
+    assert api("POST", "/estudiantes", {"id_estudiante": "E5", "nombre": None, "carrera": "C"})[0] == 400
+    assert api("POST", "/estudiantes", {"id_estudiante": "E5", "nombre": "N", "carrera": ["a"]})[0] == 400
+    assert api("PUT", "/cursos/C100", {"nombre_curso": "", "creditos": 3})[0] == 400
+    assert api("POST", "/matriculas", {"id_estudiante": "E100", "id_cursos": [100], "periodo": "P"})[0] == 400
+    assert api("POST", "/matriculas", {"id_estudiante": "E100", "id_cursos": ["C100"], "periodo": 2025})[0] == 400
+    assert api("GET", "/estudiantes")[1]["total"] == 1
+
+def test_matriculas_concurrentes(api):
+    """Escrituras desde varios hilos: ninguna se pierde y los IDs no se repiten."""
+    def matricular(i):
+        return api("POST", "/matriculas", {"id_estudiante": "E100", "id_cursos": ["C100"], "periodo": f"P{i}"})
+
+    with ThreadPoolExecutor(max_workers=8) as hilos:
+        respuestas = list(hilos.map(matricular, range(40)))
+    assert all(estado == 201 for estado, _ in respuestas)
+    assert len({datos["id_matricula"] for _, datos in respuestas}) == 40
+    repositorio.invalidar()
+    assert len(common.cargar_datos_json(common.MATRICULAS_FILE)) == 40
+
+def test_lectores_escritor():
+    bloqueo = LectoresEscritor()
+    eventos = []
+    escribio = threading.Event()
+
+    def escribir():
+        with bloqueo.escribiendo():
+            eventos.append("escritor")
+            escribio.set()
+
+    with bloqueo.leyendo():
+        escritor = threading.Thread(target=escribir)
+        escritor.start()
+        # El escritor espera a que salga el lector
+        assert not escribio.wait(0.1)
+        eventos.append("lector")
+    escritor.join(5)
+    assert eventos == ["lector", "escritor"]
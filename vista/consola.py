@@ -2,13 +2,19 @@ from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Prompt, IntPrompt
-from typing import List, Optional
+from typing import Any, Callable, List, Optional, Sequence, Tuple
 # Importa las clases de tu archivo de modelos
 from modelo.entidades import Estudiante, Curso, Matricula
+from controlador.instrumentacion import LIMITES_MS
 
 # Inicializar la consola de rich
 consola = Console()
 
+# Registros por página en los listados
+TAMANO_PAGINA = 20
+# Resultados de búsqueda que se muestran como máximo
+LIMITE_RESULTADOS = 50
+
 
 def mostrar_error(mensaje: str):
     """Muestra un mensaje de error formateado."""
@@ -29,9 +35,10 @@ def mostrar_menu_principal() -> str:
     consola.print("2. Gestionar Cursos")
     consola.print("3. Gestionar Matrículas")
     consola.print("4. Ver Reportes")
-    consola.print("5. Salir")
+    consola.print("5. Diagnóstico")
+    consola.print("6. Salir")
 
-    opcion = Prompt.ask("[bold]Seleccione una opción[/bold]", choices=["1", "2", "3", "4", "5"], default="5")
+    opcion = Prompt.ask("[bold]Seleccione una opción[/bold]", choices=["1", "2", "3", "4", "5", "6"], default="6")
     return opcion
 
 
@@ -42,9 +49,10 @@ def mostrar_menu_gestion(tipo: str) -> str:
     consola.print(f"2. Listar {tipo}")
     consola.print(f"3. Actualizar {tipo}")
     consola.print(f"4. Eliminar {tipo}")
-    consola.print("5. Volver al menú principal")
+    consola.print(f"5. Buscar {tipo}")
+    consola.print("6. Volver al menú principal")
 
-    opcion = Prompt.ask("[bold]Seleccione una opción[/bold]", choices=["1", "2", "3", "4", "5"], default="5")
+    opcion = Prompt.ask("[bold]Seleccione una opción[/bold]", choices=["1", "2", "3", "4", "5", "6"], default="6")
     return opcion
 
 
@@ -64,12 +72,33 @@ def mostrar_menu_reportes() -> str:
     consola.print("\n--- Reportes ---")
     consola.print("1. Ver estudiantes por curso")
     consola.print("2. Calcular créditos de un estudiante (Reto Final)")
-    consola.print("3. Volver al menú principal")
+    consola.print("3. Carga de créditos de todos los estudiantes")
+    consola.print("4. Verificar agregados de matrículas")
+    consola.print("5. Volver al menú principal")
 
-    opcion = Prompt.ask("[bold]Seleccione una opción[/bold]", choices=["1", "2", "3"], default="3")
+    opcion = Prompt.ask("[bold]Seleccione una opción[/bold]", choices=["1", "2", "3", "4", "5"], default="5")
+    return opcion
+
+
+def mostrar_menu_diagnostico(activa: bool) -> str:
+    """Muestra el menú de diagnóstico."""
+    estado = "[green]activa[/green]" if activa else "[yellow]inactiva[/yellow]"
+    consola.print(f"\n--- Diagnóstico (instrumentación {estado}) ---")
+    consola.print("1. Ver estadísticas")
+    consola.print("2. Guardar estadísticas en JSON")
+    consola.print("3. Reiniciar estadísticas")
+    consola.print(f"4. {'Desactivar' if activa else 'Activar'} instrumentación")
+    consola.print("5. Volver al menú principal")
+
+    opcion = Prompt.ask("[bold]Seleccione una opción[/bold]", choices=["1", "2", "3", "4", "5"], default="5")
     return opcion
 
 
+def solicitar_ruta(descripcion: str, por_defecto: str) -> str:
+    """Solicita la ruta de un archivo."""
+    return Prompt.ask(descripcion, default=por_defecto)
+
+
 def solicitar_datos_estudiante(actualizando: bool = False) -> dict:
     """Solicita los datos para crear o actualizar un estudiante."""
     id_estudiante = ""
@@ -104,6 +133,11 @@ def solicitar_id(tipo: str) -> str:
     return Prompt.ask(f"Ingrese el ID del {tipo}")
 
 
+def solicitar_busqueda(tipo: str) -> str:
+    """Solicita el texto a buscar."""
+    return Prompt.ask(f"Buscar {tipo} (nombre o parte del nombre, sin importar tildes)")
+
+
 def solicitar_datos_matricula() -> dict:
     """Solicita los datos para una nueva matrícula."""
     id_estudiante = Prompt.ask("ID del Estudiante a matricular")
@@ -120,38 +154,111 @@ def solicitar_periodo() -> str:
     return Prompt.ask("Período académico (Ej. 2025-01)")
 
 
-def mostrar_estudiantes(estudiantes: List[Estudiante]):
-    """Muestra una lista de estudiantes en una tabla."""
-    if not estudiantes:
-        consola.print("[yellow]No hay estudiantes registrados.[/yellow]")
+def solicitar_periodo_opcional() -> Optional[str]:
+    """Solicita un período académico; vacío significa todos los períodos."""
+    periodo = Prompt.ask("Período académico (vacío para todos)", default="")
+    return periodo.strip() or None
+
+
+def _mostrar_paginado(titulo: str, columnas: List[Tuple[str, dict]], fila: Callable[[Any], Tuple[str, ...]],
+                      obtener_pagina: Callable, ordenes: Sequence[str], vacio: str):
+    """
+    Muestra un listado página por página. Cada página se pide al controlador con
+    obtener_pagina(numero, tamano, orden, descendente), así que solo se cargan y
+    dibujan las filas de la página visible.
+    """
+    numero, tamano, orden, descendente = 1, TAMANO_PAGINA, None, False
+    while True:
+        pagina = obtener_pagina(numero, tamano, orden, descendente)
+        if not pagina.total:
+            consola.print(f"[yellow]{vacio}[/yellow]")
+            return
+
+        tabla = Table(title=titulo,
+                      caption=f"Página {pagina.numero} de {pagina.total_paginas} ({pagina.total} registros)")
+        for nombre, opciones in columnas:
+            tabla.add_column(nombre, **opciones)
+        for registro in pagina.registros:
+            tabla.add_row(*fila(registro))
+        consola.print(tabla)
+
+        ultima = pagina.numero >= pagina.total_paginas
+        accion = Prompt.ask("s=siguiente, a=anterior, o=ordenar, t=tamaño de página, v=volver",
+                            choices=["s", "a", "o", "t", "v"], default="v" if ultima else "s")
+        if accion == "v":
+            return
+        if accion == "s":
+            numero = pagina.numero + 1
+        elif accion == "a":
+            numero = pagina.numero - 1
+        elif accion == "o":
+            orden = Prompt.ask("Ordenar por", choices=list(ordenes), default=orden or ordenes[0])
+            descendente = Prompt.ask("Sentido", choices=["asc", "desc"], default="asc") == "desc"
+            numero = 1
+        elif accion == "t":
+            tamano = max(1, IntPrompt.ask("Registros por página", default=tamano))
+            numero = 1
+
+
+_COLUMNAS_ESTUDIANTES = [
+    ("ID Estudiante", {"style": "cyan", "no_wrap": True}),
+    ("Nombre", {"style": "magenta"}),
+    ("Carrera", {"style": "green"}),
+]
+
+
+def _fila_estudiante(est: Estudiante) -> Tuple[str, ...]:
+    return est.id_estudiante, est.nombre, est.carrera
+
+
+def mostrar_estudiantes(obtener_pagina: Callable):
+    """Muestra los estudiantes en una tabla paginada."""
+    _mostrar_paginado("Lista de Estudiantes", _COLUMNAS_ESTUDIANTES, _fila_estudiante, obtener_pagina,
+                      ("id_estudiante", "nombre", "carrera"), "No hay estudiantes registrados.")
+
+
+_COLUMNAS_CURSOS = [
+    ("ID Curso", {"style": "cyan", "no_wrap": True}),
+    ("Nombre del Curso", {"style": "magenta"}),
+    ("Créditos", {"style": "green", "justify": "right"}),
+]
+
+
+def _fila_curso(c: Curso) -> Tuple[str, ...]:
+    return c.id_curso, c.nombre_curso, str(c.creditos)
+
+
+def mostrar_cursos(obtener_pagina: Callable):
+    """Muestra los cursos en una tabla paginada."""
+    _mostrar_paginado("Lista de Cursos", _COLUMNAS_CURSOS, _fila_curso, obtener_pagina,
+                      ("id_curso", "nombre_curso", "creditos"), "No hay cursos registrados.")
+
+
+def _mostrar_resultados(titulo: str, columnas: List[Tuple[str, dict]], fila: Callable[[Any], Tuple[str, ...]],
+                        resultados: List[Any]):
+    """Muestra los primeros resultados de una búsqueda."""
+    if not resultados:
+        consola.print("[yellow]No se encontraron coincidencias.[/yellow]")
         return
-
-    tabla = Table(title="Lista de Estudiantes")
-    tabla.add_column("ID Estudiante", style="cyan", no_wrap=True)
-    tabla.add_column("Nombre", style="magenta")
-    tabla.add_column("Carrera", style="green")
-
-    for est in estudiantes:
-        tabla.add_row(est.id_estudiante, est.nombre, est.carrera)
-
+    visibles = resultados[:LIMITE_RESULTADOS]
+    restantes = len(resultados) - len(visibles)
+    tabla = Table(title=titulo, caption=f"y {restantes} más; refine la búsqueda" if restantes else None)
+    for nombre, opciones in columnas:
+        tabla.add_column(nombre, **opciones)
+    for registro in visibles:
+        tabla.add_row(*fila(registro))
     consola.print(tabla)
 
 
-def mostrar_cursos(cursos: List[Curso]):
-    """Muestra una lista de cursos en una tabla."""
-    if not cursos:
-        consola.print("[yellow]No hay cursos registrados.[/yellow]")
-        return
-
-    tabla = Table(title="Lista de Cursos")
-    tabla.add_column("ID Curso", style="cyan", no_wrap=True)
-    tabla.add_column("Nombre del Curso", style="magenta")
-    tabla.add_column("Créditos", style="green", justify="right")
+def mostrar_busqueda_estudiantes(texto: str, estudiantes: List[Estudiante]):
+    """Muestra los estudiantes encontrados por una búsqueda."""
+    _mostrar_resultados(f"Estudiantes que coinciden con '{texto}'", _COLUMNAS_ESTUDIANTES, _fila_estudiante,
+                        estudiantes)
 
-    for c in cursos:
-        tabla.add_row(c.id_curso, c.nombre_curso, str(c.creditos))
 
-    consola.print(tabla)
+def mostrar_busqueda_cursos(texto: str, cursos: List[Curso]):
+    """Muestra los cursos encontrados por una búsqueda."""
+    _mostrar_resultados(f"Cursos que coinciden con '{texto}'", _COLUMNAS_CURSOS, _fila_curso, cursos)
 
 
 def mostrar_matricula_estudiante(estudiante: Estudiante, cursos: List[Curso], creditos_totales: int, periodo: str):
@@ -176,25 +283,82 @@ def mostrar_matricula_estudiante(estudiante: Estudiante, cursos: List[Curso], cr
     consola.print(f"[bold green]Total Créditos Matriculados: {creditos_totales}[/bold green]")
 
 
-def mostrar_estudiantes_por_curso(curso: Curso, estudiantes: List[Estudiante]):
-    """Muestra los estudiantes inscritos en un curso."""
+def mostrar_estudiantes_por_curso(curso: Curso, obtener_pagina: Callable):
+    """Muestra los estudiantes inscritos en un curso, en una tabla paginada."""
+    _mostrar_paginado(f"Estudiantes en {curso.nombre_curso} ({curso.id_curso})", _COLUMNAS_ESTUDIANTES,
+                      _fila_estudiante, obtener_pagina, ("id_estudiante", "nombre", "carrera"),
+                      "No hay estudiantes matriculados en este curso.")
+
 
-    panel_titulo = f"Estudiantes en [bold]{curso.nombre_curso}[/bold] ({curso.id_curso})"
+def mostrar_carga_creditos(reporte):
+    """Muestra el resumen, la distribución y las sobrecargas del reporte de carga de créditos."""
+    alcance = f"período {reporte.periodo}" if reporte.periodo else "todos los períodos"
+    consola.print(Panel(
+        f"Estudiantes: {len(reporte.totales)}   Promedio: {reporte.promedio:.1f}   Máximo: {reporte.maximo}",
+        title=f"Carga de créditos - {alcance}", border_style="blue"))
+
+    tabla = Table(title="Distribución")
+    tabla.add_column("Créditos", style="green", justify="right")
+    tabla.add_column("Estudiantes", style="cyan", justify="right")
+    for creditos, cantidad in reporte.distribucion.items():
+        tabla.add_row(str(creditos), str(cantidad))
+    consola.print(tabla)
 
-    if not estudiantes:
-        consola.print(
-            Panel("No hay estudiantes matriculados en este curso.", title=panel_titulo, border_style="yellow"))
+    if not reporte.sobrecargas:
+        consola.print("[green]Ningún estudiante supera el límite de créditos.[/green]")
         return
 
-    tabla = Table(title="Lista de Estudiantes")
+    tabla = Table(title="Sobrecargas")
     tabla.add_column("ID Estudiante", style="cyan")
-    tabla.add_column("Nombre", style="magenta")
-    tabla.add_column("Carrera", style="green")
+    tabla.add_column("Período", style="magenta")
+    tabla.add_column("Créditos", style="red", justify="right")
+    for id_estudiante, periodo, creditos in reporte.sobrecargas:
+        tabla.add_row(id_estudiante, periodo, str(creditos))
+    consola.print(tabla)
+
+
+def mostrar_diferencias_agregados(diferencias: List[str]):
+    """Muestra las diferencias entre los agregados y un recálculo completo."""
+    if not diferencias:
+        mostrar_exito("Los agregados coinciden con un recálculo completo.")
+        return
+    consola.print(Panel("\n".join(diferencias[:LIMITE_RESULTADOS]),
+                        title=f"[bold yellow]{len(diferencias)} diferencia(s)[/bold yellow]", border_style="yellow"))
 
-    for est in estudiantes:
-        tabla.add_row(est.id_estudiante, est.nombre, est.carrera)
 
-    consola.print(Panel(tabla, title=panel_titulo, border_style="blue"))
+def mostrar_diagnostico(datos: dict):
+    """Muestra las estadísticas de instrumentacion.instantanea()."""
+    if not datos["activa"] and not datos["controladores"] and not datos["entrada_salida"]:
+        consola.print("[yellow]La instrumentación está inactiva y no hay estadísticas. Actívela en este menú "
+                      "o inicie con MATRICULAS_INSTRUMENTACION=1.[/yellow]")
+        return
+
+    t = datos["totales"]
+    consola.print(Panel(
+        f"Cargas: {t['cargas']}   Guardados: {t['guardados']}   "
+        f"Leídos: {t['bytes_leidos']:,} bytes   Escritos: {t['bytes_escritos']:,} bytes   "
+        f"Lectura y parseo: {t['ms_lectura']:.1f} ms",
+        title="Entrada/Salida", border_style="blue"))
+
+    tabla = Table(title="Archivos")
+    tabla.add_column("Función", style="cyan")
+    tabla.add_column("Tipo", style="magenta")
+    for columna in ("Operaciones", "Fallidas", "Bytes", "Tiempo (ms)"):
+        tabla.add_column(columna, justify="right")
+    for nombre, e in datos["entrada_salida"].items():
+        tabla.add_row(nombre, e["tipo"], str(e["operaciones"]), str(e["fallidas"]), f"{e['bytes']:,}",
+                      f"{e['total_ms']:.1f}")
+    consola.print(tabla)
+
+    tabla = Table(title="Controladores")
+    tabla.add_column("Función", style="cyan")
+    for columna in ("Llamadas", "Errores", "Promedio (ms)", "p50 (ms)", "p95 (ms)", "Máximo (ms)"):
+        tabla.add_column(columna, justify="right")
+    for nombre, h in sorted(datos["controladores"].items(), key=lambda x: -x[1]["total_ms"]):
+        percentiles = [f"≤{p}" if p is not None else f"> {LIMITES_MS[-1]}" for p in (h["p50_ms"], h["p95_ms"])]
+        tabla.add_row(nombre, str(h["llamadas"]), str(h["errores"]), f"{h['promedio_ms']:.2f}", *percentiles,
+                      f"{h['maximo_ms']:.2f}")
+    consola.print(tabla)
 
 
 def pausar_pantalla():